@@ -0,0 +1,97 @@
+"""
+Purpose: Measure login latency for each password hashing cost setting.
+
+Usage (from the project root):
+    python benchmarks/bench_login.py
+    python benchmarks/bench_login.py --kdf scrypt --costs 13 14 15 --rounds 5
+
+For every cost setting a temporary user file with a hashed password is
+created, and user_login() is timed end to end (registry lookup, key
+derivation and comparison). Pick the highest cost whose latency still fits
+the login budget of the slowest machine, and set it with the
+TASK_MANAGER_KDF / TASK_MANAGER_KDF_COST environment variables.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from authentication import UserRegistry, user_login  # noqa: E402
+from passwords import (  # noqa: E402
+    COST_ENV_VAR,
+    DEFAULT_COSTS,
+    KDF_ENV_VAR,
+    hash_password,
+)
+from table_renderer import render_table  # noqa: E402
+
+DEFAULT_BENCHMARK_COSTS = {
+    "pbkdf2_sha256": [100_000, 300_000, 600_000, 1_000_000],
+    "scrypt": [13, 14, 15, 16],
+}
+USERNAME = "BenchUser"
+PASSWORD = "Bench1ng!"
+
+
+def time_logins(kdf, cost, rounds):
+    """
+    Times `rounds` successful logins against a user hashed with the given
+    KDF and cost, and returns the latencies in milliseconds.
+    """
+    os.environ[KDF_ENV_VAR] = kdf
+    os.environ[COST_ENV_VAR] = str(cost)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        registry = UserRegistry(os.path.join(temp_dir, "user.txt"))
+        registry.add_user(USERNAME, hash_password(PASSWORD, kdf, cost))
+        latencies = []
+        # One warm-up login, so the first timed round does not include
+        # reading the user file.
+        for round_number in range(rounds + 1):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                logged_in = user_login(USERNAME, PASSWORD, registry)
+            elapsed = (time.perf_counter() - start) * 1000
+            if not logged_in:
+                raise RuntimeError("Benchmark login failed.")
+            if round_number:
+                latencies.append(elapsed)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--kdf", choices=sorted(DEFAULT_COSTS), default="pbkdf2_sha256"
+    )
+    parser.add_argument("--costs", type=int, nargs="+")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for cost in args.costs or DEFAULT_BENCHMARK_COSTS[args.kdf]:
+        latencies = time_logins(args.kdf, cost, args.rounds)
+        rows.append(
+            [
+                args.kdf,
+                cost,
+                f"{min(latencies):.1f}",
+                f"{statistics.median(latencies):.1f}",
+                f"{max(latencies):.1f}",
+            ]
+        )
+    render_table(
+        rows, ["KDF", "Cost", "Min (ms)", "Median (ms)", "Max (ms)"]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Purpose: Measure how long the task manager takes to start.
+
+Usage (from the project root):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --modules main cli --runs 20 --top 15
+
+Every run starts a fresh interpreter, so nothing is cached in memory
+between runs (the operating system's file cache still is). Two numbers are
+reported per entry module:
+  - the import time of the module and everything it imports, as reported
+    by "python -X importtime";
+  - the wall-clock time of "python -c 'import <module>'" minus that of an
+    empty interpreter, i.e. what the module adds to the start of the
+    process.
+The slowest imports of the first module are listed as well, which shows
+what to defer next. tests/test_startup.py fails if main.py's import time
+exceeds its budget or if it imports a module that should be deferred.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, SRC_DIR)
+
+from table_renderer import render_table  # noqa: E402
+
+
+def _run_python(*args):
+    """
+    Runs a fresh interpreter in the src directory.
+
+    Returns:
+        subprocess.CompletedProcess: The finished process.
+    """
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_times(module):
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        dict: Every imported module mapped to its (self, cumulative) import
+        time in microseconds.
+    """
+    result = _run_python("-X", "importtime", "-c", f"import {module}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def wall_clock_ms(code):
+    """
+    Returns the wall-clock time in milliseconds of a fresh interpreter
+    running the given code.
+    """
+    start = time.perf_counter()
+    _run_python("-c", code)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_startup(module, runs=10):
+    """
+    Measures the start-up cost of a module over several fresh interpreters.
+
+    Returns:
+        dict: The median "import_ms" and "wall_ms" (wall-clock time above
+        an empty interpreter), and "times" with the import times of the
+        last run.
+    """
+    import_ms, wall_ms = [], []
+    for _ in range(runs):
+        times = import_times(module)
+        import_ms.append(times[module][1] / 1000)
+        wall_ms.append(wall_clock_ms(f"import {module}") - wall_clock_ms(""))
+    return {
+        "import_ms": statistics.median(import_ms),
+        "wall_ms": statistics.median(wall_ms),
+        "times": times,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=["main", "cli"])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    results = {
+        module: measure_startup(module, args.runs) for module in args.modules
+    }
+    render_table(
+        [
+            [
+                module,
+                f"{result['import_ms']:.1f}",
+                f"{result['wall_ms']:.1f}",
+                len(result["times"]),
+            ]
+            for module, result in results.items()
+        ],
+        ["Module", "Import (ms)", "Wall clock (ms)", "Modules imported"],
+    )
+
+    first = args.modules[0]
+    slowest = sorted(
+        results[first]["times"].items(),
+        key=lambda item: item[1][1],
+        reverse=True,
+    )
+    print(f"\nSlowest imports of {first} (last run):")
+    render_table(
+        [
+            [name, f"{self_us / 1000:.2f}", f"{cumulative_us / 1000:.2f}"]
+            for name, (self_us, cumulative_us) in slowest[:args.top]
+        ],
+        ["Module", "Self (ms)", "Cumulative (ms)"],
+    )
+
+
+if __name__ == "__main__":
+    main()
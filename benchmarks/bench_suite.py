@@ -0,0 +1,333 @@
+"""
+Purpose: Time the main task operations at several task list sizes.
+
+Usage (from the project root):
+    python benchmarks/bench_suite.py --output before.json
+    python benchmarks/bench_suite.py --scales 1k 100k --compare before.json
+    python benchmarks/bench_suite.py --benchmarks load_tasks save_tasks
+
+For every scale (1k, 100k and 1M tasks by default) a synthetic dataset is
+generated with generate_dataset.py in a temporary directory, and each
+benchmark runs there with its output discarded: a number of warm-up rounds
+followed by the timed rounds. The benchmarks run in the order listed in
+BENCHMARKS on the same task list, so e.g. delete_task removes one task per
+round from the list that load_tasks loaded.
+
+The results are printed as a table and can be written to a JSON file with
+--output. Passing an earlier JSON file with --compare adds its medians and
+the change to the table, which gives a before / after view of a storage or
+algorithm change. The login benchmark uses the configured password hashing
+cost; set TASK_MANAGER_KDF_COST to a low value to time everything else.
+"""
+
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "src"))
+
+from authentication import user_login  # noqa: E402
+from data_access import load_tasks, save_tasks  # noqa: E402
+from generate_dataset import (  # noqa: E402
+    ADMIN_USERNAME,
+    DEFAULT_PASSWORD,
+    generate_dataset,
+)
+from reports import display_statistics, generate_reports  # noqa: E402
+from repository import TaskRepository  # noqa: E402
+from services import (  # noqa: E402
+    capture_task,
+    delete_task,
+    modify_task,
+    view_all_tasks,
+)
+from table_renderer import render_table  # noqa: E402
+
+DEFAULT_SCALES = ["1k", "100k", "1m"]
+SCALE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+# Each generated user gets this many tasks on average.
+TASKS_PER_USER = 100
+# The tasks added by the benchmarks are assigned to this user.
+BENCH_USERNAME = "BenchUser"
+
+
+@contextlib.contextmanager
+def answering(*answers):
+    """
+    Answers the input() prompts of the code run inside it, in order.
+    """
+    remaining = iter(answers)
+    original_input = builtins.input
+    builtins.input = lambda prompt="": next(remaining)
+    try:
+        yield
+    finally:
+        builtins.input = original_input
+
+
+# ===================== Benchmarks ===================== #
+# Every benchmark is called with the state of the current scale: a dict
+# with the loaded task list ("tasks") and the round number ("round").
+def bench_load_tasks(state):
+    state["tasks"] = TaskRepository(load_tasks())
+
+
+def bench_save_tasks(state):
+    save_tasks(state["tasks"])
+
+
+def bench_append_task(state):
+    with answering(
+        BENCH_USERNAME,
+        f"Benchmark task {state['round']}",
+        "Added by the benchmark suite",
+        "31 Dec 2030",
+    ):
+        capture_task(state["tasks"])
+
+
+def bench_modify_task(state):
+    # Edit the first task added by bench_append_task. Its due date is moved
+    # every round, so every round saves a change.
+    with answering("1", "e", "", f"{1 + state['round'] % 28:02d} Jan 2031"):
+        modify_task(state["tasks"], BENCH_USERNAME)
+
+
+def bench_delete_task(state):
+    with answering(str(len(state["tasks"]))):
+        delete_task(state["tasks"])
+
+
+def bench_view_all_tasks(state):
+    # Show the first page, then return to the menu.
+    with answering(""):
+        view_all_tasks(state["tasks"])
+
+
+def bench_generate_reports(state):
+    generate_reports(state["tasks"])
+
+
+def bench_display_statistics(state):
+    display_statistics(state["tasks"])
+
+
+def bench_user_login(state):
+    if not user_login(ADMIN_USERNAME, DEFAULT_PASSWORD):
+        raise RuntimeError("Benchmark login failed.")
+
+
+BENCHMARKS = {
+    "load_tasks": bench_load_tasks,
+    "save_tasks": bench_save_tasks,
+    "append_task": bench_append_task,
+    "modify_task": bench_modify_task,
+    "delete_task": bench_delete_task,
+    "view_all_tasks": bench_view_all_tasks,
+    "generate_reports": bench_generate_reports,
+    "display_statistics": bench_display_statistics,
+    "user_login": bench_user_login,
+}
+
+
+# ===================== Running the Suite ===================== #
+def parse_scale(text):
+    """
+    Parses a number of tasks such as "500", "100k" or "1m".
+    """
+    text = text.strip().lower()
+    multiplier = SCALE_SUFFIXES.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    return int(float(text) * multiplier)
+
+
+def time_benchmark(benchmark, state, rounds, warmup):
+    """
+    Runs a benchmark warmup + rounds times with its output discarded.
+
+    Returns:
+        list: The latencies of the timed rounds in milliseconds.
+    """
+    latencies = []
+    with open(os.devnull, "w") as devnull:
+        for round_number in range(warmup + rounds):
+            state["round"] = round_number
+            with contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                benchmark(state)
+                elapsed = (time.perf_counter() - start) * 1000
+            if round_number >= warmup:
+                latencies.append(elapsed)
+    return latencies
+
+
+def run_suite(scales, rounds=3, warmup=1, names=None, seed=0):
+    """
+    Runs the benchmarks (all of them, or those named) at every scale.
+
+    Args:
+        scales (list): The numbers of tasks to run the benchmarks with.
+        rounds (int): The number of timed rounds of each benchmark.
+        warmup (int): The number of untimed rounds before them.
+        names (list, optional): The names of the benchmarks to run.
+        seed (int): The seed of the generated datasets.
+
+    Returns:
+        list: One dict per benchmark and scale, with the "benchmark" name,
+        the number of "tasks", the "min_ms", "median_ms", "mean_ms" and
+        "max_ms" latencies and the latencies of all "rounds_ms".
+    """
+    names = names or list(BENCHMARKS)
+    results = []
+    original_dir = os.getcwd()
+    for tasks in scales:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generate_dataset(
+                temp_dir,
+                users=max(1, tasks // TASKS_PER_USER),
+                tasks_per_user=min(tasks, TASKS_PER_USER),
+                seed=seed,
+            )
+            os.chdir(temp_dir)
+            try:
+                # The other benchmarks need a loaded task list.
+                state = {"tasks": TaskRepository(load_tasks())}
+                for name in names:
+                    latencies = time_benchmark(
+                        BENCHMARKS[name], state, rounds, warmup
+                    )
+                    results.append(
+                        {
+                            "benchmark": name,
+                            "tasks": tasks,
+                            "min_ms": min(latencies),
+                            "median_ms": statistics.median(latencies),
+                            "mean_ms": statistics.mean(latencies),
+                            "max_ms": max(latencies),
+                            "rounds_ms": latencies,
+                        }
+                    )
+            finally:
+                os.chdir(original_dir)
+    return results
+
+
+def _git_commit():
+    """
+    Returns the current git commit of the project, or None outside a git
+    checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCHMARKS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    """
+    Prints the results as a table. If the results of an earlier run are
+    given, their medians and the change are shown as well.
+    """
+    baseline_medians = {
+        (result["benchmark"], result["tasks"]): result["median_ms"]
+        for result in (baseline or {}).get("results", [])
+    }
+    headers = ["Benchmark", "Tasks", "Min (ms)", "Median (ms)", "Max (ms)"]
+    if baseline:
+        headers += ["Baseline (ms)", "Change"]
+    rows = []
+    for result in results:
+        row = [
+            result["benchmark"],
+            result["tasks"],
+            f"{result['min_ms']:.2f}",
+            f"{result['median_ms']:.2f}",
+            f"{result['max_ms']:.2f}",
+        ]
+        if baseline:
+            before = baseline_medians.get(
+                (result["benchmark"], result["tasks"])
+            )
+            if before:
+                change = (result["median_ms"] - before) / before * 100
+                row += [f"{before:.2f}", f"{change:+.1f}%"]
+            else:
+                row += ["-", "-"]
+        rows.append(row)
+    render_table(rows, headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        default=DEFAULT_SCALES,
+        help="numbers of tasks, e.g. 1k 100k 1m",
+    )
+    parser.add_argument(
+        "--benchmarks", nargs="+", choices=list(BENCHMARKS), metavar="NAME"
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to a JSON file")
+    parser.add_argument(
+        "--compare", help="compare with the results in a JSON file"
+    )
+    args = parser.parse_args()
+    if args.rounds < 1:
+        parser.error("--rounds must be at least 1")
+    try:
+        scales = [parse_scale(scale) for scale in args.scales]
+    except ValueError:
+        parser.error("use numbers such as 500, 100k or 1m for --scales")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+
+    results = run_suite(
+        scales, args.rounds, args.warmup, args.benchmarks, args.seed
+    )
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "commit": _git_commit(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "rounds": args.rounds,
+                    "warmup": args.warmup,
+                    "seed": args.seed,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+        print(f"Results written to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
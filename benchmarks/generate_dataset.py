@@ -0,0 +1,253 @@
+"""
+Purpose: Generate large, realistic task and user files for benchmarks.
+
+Usage (from the project root):
+    python benchmarks/generate_dataset.py --output-dir /tmp/data
+    python benchmarks/generate_dataset.py --output-dir /tmp/data \\
+        --users 10000 --tasks-per-user 100 --skew 1.2 --seed 7
+
+The output is deterministic: the same options (including --seed and
+--today) always produce the same files. The knobs are:
+  - the number of users, and the average number of tasks per user, spread
+    over the users with a Zipf-like skew (0 gives every user the same
+    number of tasks, higher values give a few users most of the tasks);
+  - the share of completed tasks, and the share of open tasks that are
+    overdue;
+  - the average description length;
+  - the share of malformed task records (a missing line or an unexpected
+    line), which load_tasks() reports and skips.
+Tasks are written in the current tasks.txt format (header, Task ID and
+Task Version lines) or, with --format legacy, in the original six-line
+format without a header. Users get the same plaintext password, which is
+hashed on their first login like any legacy password. A million tasks take
+a few seconds.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from data_access import HEADER_FORMAT  # noqa: E402
+from utilities import parse_date  # noqa: E402
+
+ADMIN_USERNAME = "Administrator"
+DEFAULT_PASSWORD = "Passw0rd!"
+FORMATS = ("current", "legacy")
+# Due dates are spread over this many days before and after "today".
+DATE_SPREAD_DAYS = 365
+# Records are written in chunks of this many tasks.
+CHUNK_SIZE = 10_000
+
+WORDS = (
+    "update review prepare client report budget meeting draft design "
+    "invoice schedule release backlog migrate server test document plan "
+    "quarterly audit contract onboarding training feedback roadmap"
+).split()
+
+
+def user_task_counts(users, tasks_per_user, skew):
+    """
+    Spreads users * tasks_per_user tasks over the users, so that user i gets
+    a share proportional to 1 / (i + 1) ** skew.
+
+    Returns:
+        list: The number of tasks of each user.
+    """
+    total = users * tasks_per_user
+    weights = [1 / (i + 1) ** skew for i in range(users)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    # Hand out the tasks lost to rounding down, one per user from the top.
+    for i in range(total - sum(counts)):
+        counts[i % users] += 1
+    return counts
+
+
+def _descriptions(rng, description_length, count=1024):
+    """
+    Returns a pool of random descriptions about description_length long.
+    """
+    pool = []
+    for _ in range(count):
+        target = max(1, int(rng.uniform(0.5, 1.5) * description_length))
+        words = []
+        length = 0
+        while length < target:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        pool.append(" ".join(words).capitalize()[:target])
+    return pool
+
+
+def generate_dataset(
+    output_dir,
+    users=100,
+    tasks_per_user=100,
+    skew=1.0,
+    completion_ratio=0.3,
+    overdue_ratio=0.2,
+    description_length=60,
+    malformed_rate=0.0,
+    seed=0,
+    today=None,
+    file_format="current",
+    password=DEFAULT_PASSWORD,
+):
+    """
+    Writes tasks.txt and user.txt to output_dir.
+
+    Returns:
+        dict: The number of "users", "tasks", "completed", "overdue" and
+        "malformed" records written.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format '{file_format}'.")
+    rng = random.Random(seed)
+    today = today or date.today()
+    # Formatting dates is slow, so every possible date is formatted once.
+    dates = [
+        (today + timedelta(days=offset)).strftime("%d %b %Y")
+        for offset in range(-2 * DATE_SPREAD_DAYS, DATE_SPREAD_DAYS + 1)
+    ]
+    day_zero = 2 * DATE_SPREAD_DAYS  # The index of today in dates.
+    descriptions = _descriptions(rng, description_length)
+
+    usernames = [ADMIN_USERNAME] + [f"User{i:06d}" for i in range(1, users)]
+    with open(os.path.join(output_dir, "user.txt"), "w") as file:
+        file.writelines(f"{name}, {password}\n" for name in usernames)
+
+    counts = user_task_counts(len(usernames), tasks_per_user, skew)
+    owners = [
+        name for name, count in zip(usernames, counts) for _ in range(count)
+    ]
+    # Shuffle, so one user's tasks are spread over the file.
+    rng.shuffle(owners)
+
+    summary = {
+        "users": len(usernames),
+        "tasks": len(owners),
+        "completed": 0,
+        "overdue": 0,
+        "malformed": 0,
+    }
+    random_number = rng.random
+    with open(os.path.join(output_dir, "tasks.txt"), "w") as file:
+        if file_format == "current":
+            file.write(HEADER_FORMAT.format(1, len(owners) + 1))
+        for start in range(0, len(owners), CHUNK_SIZE):
+            records = []
+            for task_id in range(start + 1, start + 1 + CHUNK_SIZE):
+                if task_id > len(owners):
+                    break
+                if random_number() < completion_ratio:
+                    completion = "Yes"
+                    due = day_zero + int(
+                        (random_number() * 2 - 1) * DATE_SPREAD_DAYS
+                    )
+                    summary["completed"] += 1
+                elif random_number() < overdue_ratio:
+                    completion = "No"
+                    due = day_zero - 1 - int(
+                        random_number() * (DATE_SPREAD_DAYS - 1)
+                    )
+                    summary["overdue"] += 1
+                else:
+                    completion = "No"
+                    due = day_zero + int(random_number() * DATE_SPREAD_DAYS)
+                added = min(due, day_zero) - int(random_number() * 60)
+                lines = [
+                    f"Assigned to: {owners[task_id - 1]},\n",
+                    f"Task Title: {rng.choice(WORDS).capitalize()} "
+                    f"{rng.choice(WORDS)} {task_id},\n",
+                    f"Description: "
+                    f"{descriptions[int(random_number() * 1024)]},\n",
+                    f"Date of Assignment: {dates[added]},\n",
+                    f"Task Due Date: {dates[due]},\n",
+                    f"Task Completion: {completion},\n",
+                ]
+                if file_format == "current":
+                    lines.append(f"Task ID: {task_id},\n")
+                    lines.append("Task Version: 1\n")
+                if malformed_rate and random_number() < malformed_rate:
+                    summary["malformed"] += 1
+                    if random_number() < 0.5:
+                        # A record with a missing line.
+                        del lines[1 + int(random_number() * 5)]
+                    else:
+                        lines.insert(3, "Priority: high,\n")
+                records.append("".join(lines))
+            file.write("".join(records))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks-per-user", type=int, default=100)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--completion-ratio", type=float, default=0.3)
+    parser.add_argument("--overdue-ratio", type=float, default=0.2)
+    parser.add_argument("--description-length", type=int, default=60)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--today",
+        help="the date overdue tasks are relative to (default: today), "
+        "e.g. '01 Jan 2026'",
+    )
+    parser.add_argument("--format", choices=FORMATS, default="current")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="overwrite existing tasks.txt and user.txt files",
+    )
+    args = parser.parse_args()
+
+    for name in ("tasks.txt", "user.txt"):
+        if os.path.exists(os.path.join(args.output_dir, name)) and not (
+            args.force
+        ):
+            parser.error(
+                f"{name} already exists in {args.output_dir}; "
+                "use --force to overwrite it"
+            )
+    today = parse_date(args.today) if args.today else None
+    if args.today and today is None:
+        parser.error("use the format 01 Jan 2026 for --today")
+
+    started = time.perf_counter()
+    summary = generate_dataset(
+        args.output_dir,
+        users=args.users,
+        tasks_per_user=args.tasks_per_user,
+        skew=args.skew,
+        completion_ratio=args.completion_ratio,
+        overdue_ratio=args.overdue_ratio,
+        description_length=args.description_length,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+        today=today,
+        file_format=args.format,
+        password=args.password,
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"Wrote {summary['tasks']} tasks ({summary['completed']} completed, "
+        f"{summary['overdue']} overdue, {summary['malformed']} malformed) "
+        f"for {summary['users']} users to {args.output_dir} "
+        f"in {elapsed:.2f}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
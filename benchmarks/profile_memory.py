@@ -0,0 +1,264 @@
+"""
+Purpose: Measure the memory used by loading, reporting and viewing tasks.
+
+Usage (from the project root):
+    python benchmarks/profile_memory.py
+    python benchmarks/profile_memory.py --tasks 100k --top 5 --output mem.json
+    python benchmarks/profile_memory.py --data-dir /path/to/task/files
+
+Each operation runs under tracemalloc, which reports:
+  - the peak: the most memory the operation had allocated at one time on
+    top of what was allocated before it (e.g. the file contents being
+    parsed while the task list is built);
+  - the net allocation: what is still allocated when it returns (e.g. the
+    loaded task list);
+  - the source lines that allocated most of the net allocation.
+The footprint of the in-memory Task representation is measured on its own
+by parsing the tasks file (already read into memory) into Task objects;
+divided by the number of tasks this gives the bytes per task. The net
+allocation of load_tasks per task is higher, as the task store also keeps
+the fields of every task as loaded, to merge with other sessions' changes.
+
+The tasks come from a synthetic dataset (see generate_dataset.py) of
+--tasks tasks, or from copies of the tasks.txt and user.txt files in
+--data-dir, so the reports and task history written while profiling do
+not change that directory. The numbers are
+printed as tables and can be written to a JSON file with --output, to
+compare the footprint between commits. The bytes per task hardly depend on
+the number of tasks, and tracemalloc slows everything down (20k tasks take
+about half a minute), so the default dataset is small.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import linecache
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+BENCHMARKS_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "src"))
+
+from authentication import USER_FILE  # noqa: E402
+from bench_suite import TASKS_PER_USER, answering, parse_scale  # noqa: E402
+from data_access import TASKS_FILE, load_tasks, parse_tasks  # noqa: E402
+from generate_dataset import ADMIN_USERNAME, generate_dataset  # noqa: E402
+from reports import compute_statistics, generate_reports  # noqa: E402
+from repository import TaskRepository  # noqa: E402
+from services import (  # noqa: E402
+    view_all_tasks,
+    view_completed_tasks,
+    view_my_tasks,
+)
+from table_renderer import render_table  # noqa: E402
+
+# Allocation sites in these files (tracemalloc itself, imports and this
+# script) are left out of the top sites. They are skipped in the results
+# rather than filtered out of the snapshots, which is much slower.
+IGNORED_FILES = {
+    tracemalloc.__file__,
+    os.path.abspath(__file__),
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+}
+
+
+def measure(function, top=10):
+    """
+    Runs a function under tracemalloc (which must be tracing already),
+    with its output discarded.
+
+    Returns:
+        tuple: (result of the function, dict with the "peak_bytes" and
+        "net_bytes" of the call and the "top_sites": the source lines with
+        the largest net allocation, as dicts with the "site", "bytes" and
+        "blocks").
+    """
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    # Garbage that is only freed by the cycle collector does not count.
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+
+    top_sites = []
+    for stat in after.compare_to(before, "lineno"):
+        frame = stat.traceback[0]
+        if stat.size_diff <= 0 or len(top_sites) == top:
+            break
+        if frame.filename in IGNORED_FILES:
+            continue
+        top_sites.append(
+            {
+                "site": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                "code": linecache.getline(
+                    frame.filename, frame.lineno
+                ).strip(),
+                "bytes": stat.size_diff,
+                "blocks": stat.count_diff,
+            }
+        )
+    return result, {
+        "peak_bytes": peak - start,
+        "net_bytes": current - start,
+        "top_sites": top_sites,
+    }
+
+
+def profile_memory(top=10):
+    """
+    Profiles the memory of the operations on the task files in the current
+    directory.
+
+    Returns:
+        dict: The number of "tasks", the "bytes_per_task" of Task objects,
+        the "load_bytes_per_task" (the net allocation of load_tasks per
+        task) and the "operations": one dict per operation with its name
+        ("operation") and the numbers returned by measure().
+    """
+    with open(TASKS_FILE, "r") as file:
+        lines = file.readlines()
+
+    operations = []
+
+    def run(name, function):
+        result, numbers = measure(function, top)
+        operations.append({"operation": name, **numbers})
+        return result, numbers
+
+    tracemalloc.start()
+    try:
+        # Only the Task objects (and their attributes) stay allocated.
+        parsed, task_numbers = run(
+            "Task objects", lambda: parse_tasks(lines)[2]
+        )
+        task_count = len(parsed)
+        lines = parsed = None
+
+        task_list, load_numbers = run(
+            "load_tasks", lambda: TaskRepository(load_tasks())
+        )
+        run("generate_reports", lambda: generate_reports(task_list))
+        run("compute_statistics", lambda: compute_statistics(task_list))
+
+        def view_first_page():
+            with answering(""):
+                view_all_tasks(task_list)
+
+        run("view_all_tasks", view_first_page)
+        run("view_my_tasks", lambda: view_my_tasks(ADMIN_USERNAME, task_list))
+        run("view_completed_tasks", lambda: view_completed_tasks(task_list))
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "tasks": task_count,
+        "bytes_per_task": task_numbers["net_bytes"] / max(task_count, 1),
+        "load_bytes_per_task": (
+            load_numbers["net_bytes"] / max(len(task_list), 1)
+        ),
+        "operations": operations,
+    }
+
+
+def _megabytes(size):
+    """
+    Formats a number of bytes in megabytes.
+    """
+    return f"{size / 1024 / 1024:.2f}"
+
+
+def print_profile(profile):
+    """
+    Prints the memory per operation, the bytes per task and the top
+    allocation sites of every operation.
+    """
+    render_table(
+        [
+            [
+                entry["operation"],
+                _megabytes(entry["peak_bytes"]),
+                _megabytes(entry["net_bytes"]),
+            ]
+            for entry in profile["operations"]
+        ],
+        ["Operation", "Peak (MB)", "Net (MB)"],
+    )
+    print(
+        f"\n{profile['tasks']} tasks: "
+        f"{profile['bytes_per_task']:.0f} bytes per Task object, "
+        f"{profile['load_bytes_per_task']:.0f} bytes per task loaded."
+    )
+    for entry in profile["operations"]:
+        if not entry["top_sites"]:
+            continue
+        print(f"\nTop allocation sites of {entry['operation']} (net):")
+        render_table(
+            [
+                [site["site"], site["code"], _megabytes(site["bytes"]),
+                 site["blocks"]]
+                for site in entry["top_sites"]
+            ],
+            ["Site", "Code", "Size (MB)", "Blocks"],
+            max_widths={1: 50},
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--tasks",
+        default="20k",
+        help="the number of tasks to generate, e.g. 20k or 100k",
+    )
+    source.add_argument(
+        "--data-dir", help="profile the task files in this directory instead"
+    )
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to a JSON file")
+    args = parser.parse_args()
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.data_dir:
+            for name in (TASKS_FILE, USER_FILE):
+                path = os.path.join(args.data_dir, name)
+                if os.path.exists(path):
+                    shutil.copy(path, temp_dir)
+        else:
+            try:
+                tasks = parse_scale(args.tasks)
+            except ValueError:
+                parser.error("use a number such as 500 or 20k for --tasks")
+            generate_dataset(
+                temp_dir,
+                users=max(1, tasks // TASKS_PER_USER),
+                tasks_per_user=min(tasks, TASKS_PER_USER),
+                seed=args.seed,
+            )
+        os.chdir(temp_dir)
+        try:
+            profile = profile_memory(args.top)
+        finally:
+            os.chdir(original_dir)
+
+    print_profile(profile)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(profile, file, indent=2)
+        print(f"\nResults written to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
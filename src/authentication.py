@@ -1,8 +1,259 @@
+import os
 import re
 import getpass
+import hashlib
+import hmac
+import secrets
+import stat
+import threading
+from contextlib import contextmanager
+
+from metrics import record_login
+from passwords import hash_password, needs_rehash, verify_password
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl, so files are not locked there.
+    fcntl = None
 
 """Purpose: Manage user authentication, registration and authorization."""
 
+USER_FILE = "user.txt"
+# Access tokens for scripts (see cli.py), one "username, token hash" line
+# per token.
+TOKEN_FILE = "cli_tokens.txt"
+TOKEN_BYTES = 32
+
+
+# ===================== User Registry ===================== #
+class UserRegistry:
+    """
+    This class keeps the usernames and passwords from the user file in a
+    dictionary, so logins and duplicate checks are dictionary lookups
+    instead of a scan of the file.
+
+    The file is only read again when its modification time or size has
+    changed (e.g. another session registered a user), which is checked
+    with a single os.stat() call.
+
+    Changes to the file are made one at a time, by the threads of this
+    session (e.g. the task server checks logins in a thread pool) and by
+    other sessions, under a lock (see _locked()). The file is re-read under
+    the lock before it is changed, so no session overwrites a change made
+    by another one, and it is rewritten through a temporary file that
+    replaces it, so a crash never leaves a half-written user file.
+    """
+    def __init__(self, path=USER_FILE):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.file_found = False
+        self._users = {}
+        self._signature = None
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        """
+        Holds the lock of the registry and an exclusive advisory lock on
+        the lock file, for changing the user file.
+        """
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _file_signature(self):
+        """
+        Returns the (modification time, size) of the user file, or None if
+        it cannot be read.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def refresh(self):
+        """
+        Reloads the user file if it changed since it was last read.
+        """
+        signature = self._file_signature()
+        if signature is not None and signature == self._signature:
+            return
+        users = {}
+        try:
+            with open(self.path, "r") as file:
+                for line in file:
+                    line = line.strip()
+                    if not line or ", " not in line:
+                        continue
+                    stored_username, stored_password = line.split(", ", 1)
+                    users.setdefault(stored_username, stored_password)
+            self.file_found = True
+        except FileNotFoundError:
+            self.file_found = False
+        self._users = users
+        self._signature = signature
+
+    def __contains__(self, username):
+        self.refresh()
+        return username in self._users
+
+    def get_password(self, username):
+        """
+        Returns the stored password of a user, or None for unknown users.
+        """
+        self.refresh()
+        return self._users.get(username)
+
+    def usernames(self):
+        """
+        Returns the registered usernames in the order of the user file.
+        """
+        self.refresh()
+        return list(self._users)
+
+    def _write_file(self, users):
+        """
+        Rewrites the user file with the given users, through a temporary
+        file that replaces it. Call it holding the lock (see _locked()).
+        """
+        # Imported here since only writes need it, and it is slow to import
+        # (see benchmarks/bench_startup.py).
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temp_path = tempfile.mkstemp(
+            prefix=".user-", dir=directory
+        )
+        try:
+            # Keep the permissions of the file being replaced.
+            try:
+                mode = stat.S_IMODE(os.stat(self.path).st_mode)
+            except FileNotFoundError:
+                mode = 0o600
+            os.chmod(temp_path, mode)
+            with os.fdopen(descriptor, "w") as file:
+                for username, password in users.items():
+                    file.write(f"{username}, {password}\n")
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self._users = users
+        self.file_found = True
+        self._signature = self._file_signature()
+
+    def set_password(self, username, password):
+        """
+        Replaces the stored password of an existing user in the registry
+        and the user file together.
+
+        Returns:
+            bool: False if the user does not exist, otherwise True.
+        """
+        with self._locked():
+            self.refresh()
+            if username not in self._users:
+                return False
+            self._write_file({**self._users, username: password})
+        return True
+
+    def add_user(self, username, password):
+        """
+        Adds a new user to the user file and the registry together.
+
+        Returns:
+            bool: False if the username already exists, otherwise True.
+        """
+        with self._locked():
+            self.refresh()
+            if username in self._users:
+                return False
+            with open(self.path, "a") as file:
+                file.write(f"{username}, {password}\n")
+            self._users = {**self._users, username: password}
+            self.file_found = True
+            self._signature = self._file_signature()
+        return True
+
+
+_user_registry = None
+
+
+def get_user_registry():
+    """
+    Returns the shared registry of the user file, creating it on first use.
+    """
+    global _user_registry
+    if _user_registry is None:
+        _user_registry = UserRegistry()
+    return _user_registry
+
+
+# ===================== Access Tokens ===================== #
+# A password check costs a full key derivation on purpose (see passwords.py),
+# which is too slow for scripts that run a command every few minutes. They
+# can log in with a random access token instead: being long and random, a
+# token is safe to store as a plain SHA-256 hash, which is cheap to check.
+def _hash_token(token):
+    """
+    Returns the hash of an access token, as stored in the token file.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def create_token(username, path=TOKEN_FILE):
+    """
+    Creates a new access token for a user and stores its hash in the token
+    file, which is only readable by its owner. The token itself is not
+    stored, so it can only be shown once.
+
+    Returns:
+        str: The new token.
+    """
+    token = secrets.token_urlsafe(TOKEN_BYTES)
+    descriptor = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    with os.fdopen(descriptor, "a") as file:
+        file.write(f"{username}, {_hash_token(token)}\n")
+    return token
+
+
+def check_token(username, token, path=TOKEN_FILE, registry=None):
+    """
+    Checks an access token of a registered user against the token file,
+    without printing anything. A token can be revoked by removing its line
+    from the file.
+
+    Returns:
+        bool: True if the token is valid, otherwise False.
+    """
+    registry = registry or get_user_registry()
+    token_hash = _hash_token(token)
+    valid = False
+    if username in registry:
+        try:
+            with open(path, "r") as file:
+                for line in file:
+                    stored_username, _, stored_hash = (
+                        line.strip().partition(", ")
+                    )
+                    # Compare every hash, in constant time.
+                    if stored_username == username and hmac.compare_digest(
+                        stored_hash, token_hash
+                    ):
+                        valid = True
+        except FileNotFoundError:
+            pass
+    record_login(valid)
+    return valid
+
 
 # ===================== User Authentication Functions ===================== #
 def is_valid_username(username):
@@ -41,7 +292,35 @@ def is_valid_password(password):
     )
 
 
-def user_login(username, password):
+def check_credentials(username, password, registry=None):
+    """
+    Checks a username and password against the user registry, without
+    printing anything.
+
+    Passwords are stored as salted hashes (see the passwords module). A
+    legacy plaintext password, or a hash made with an outdated cost, is
+    replaced by a new hash after a successful check.
+
+    Returns:
+        bool: True if the credentials are correct, otherwise False.
+    """
+    registry = registry or get_user_registry()
+    stored_password = registry.get_password(username)
+    if stored_password is None or not verify_password(
+        password, stored_password
+    ):
+        record_login(False)
+        return False
+    record_login(True)
+    if needs_rehash(stored_password):
+        try:
+            registry.set_password(username, hash_password(password))
+        except Exception as e:
+            print(f"An error occurred while updating the password: {e}")
+    return True
+
+
+def user_login(username, password, registry=None):
     """
     This function will allow the user login and check if the username
     and password are correct by reading the user.txt file and checking
@@ -62,31 +341,30 @@ def user_login(username, password):
 
     The login section loops until a correct username/password combination is
     entered.
+
+    The user file is looked up through the shared UserRegistry (or the
+    given registry), so it is only read again when it has changed since the
+    last login attempt. The password itself is checked (and migrated to a
+    new hash if needed) by check_credentials().
     """
-    try:
-        with open("user.txt", "r") as file:
-            for line in file:
-                line = line.strip()
-                if not line:
-                    continue
-                stored_username, stored_password = line.split(", ")
-                if stored_username == username and stored_password == password:
-                    print("Username and password are accepted.\n")
-                    print("You have successfully logged in.")
-                    return True
-        print("Invalid username or password. Please try again.\n")
-        print(
-            "Username must contain both uppercase and lowercase letters,"
-            "and be between 5 and 20 characters long."
-        )
-        print(
-            "Password must contain both uppercase and lowercase letters,"
-            "a digit and a special character."
-        )
-        return False
-    except FileNotFoundError:
+    registry = registry or get_user_registry()
+    if check_credentials(username, password, registry):
+        print("Username and password are accepted.\n")
+        print("You have successfully logged in.")
+        return True
+    if not registry.file_found:
         print("Error: User file not found. Please register first.")
         return False
+    print("Invalid username or password. Please try again.\n")
+    print(
+        "Username must contain both uppercase and lowercase letters,"
+        "and be between 5 and 20 characters long."
+    )
+    print(
+        "Password must contain both uppercase and lowercase letters,"
+        "a digit and a special character."
+    )
+    return False
 
 
 def register_user():
@@ -104,34 +382,21 @@ def register_user():
 
     ===== User Registration: =====
     Summary:: The file output format now simply writes the username and
-    password separated by a comma (to match the login code). It also validates
-    the new username and password using the provided validation functions,
-    and ensures no duplicate username(s) exists in user.txt.
+    salted password hash separated by a comma (to match the login code).
+    It also validates the new username and password using the provided
+    validation functions, and ensures no duplicate username(s) exists in
+    user.txt.
 
     Key points::  • Registration can only happen by the Administrator.
                   • Validation of username without any duplicate entries.
     """
 
+    registry = get_user_registry()
     while True:
         new_username = input("Enter your username: ")
-        username_duplicate_found = False
 
         # Check if the username already exists in the user.txt file.
-        try:
-            with open("user.txt", "r") as file:
-                for line in file:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    stored_username, _ = line.split(", ")
-                    if stored_username == new_username:
-                        username_duplicate_found = True
-                        break
-        except FileNotFoundError:
-            # If the file does not exist, there are no duplicate usernames.
-            pass
-
-        if username_duplicate_found:
+        if new_username in registry:
             print(
                 "Error: Username already exists. Please try again with a "
                 "different username."
@@ -161,10 +426,17 @@ def register_user():
                 )
                 return False
             try:
-                with open("user.txt", "a") as file:
-                    file.write(f"{new_username}, {new_password}\n")
-                    print("You have successfully registered a new user.")
-                    return True
+                # Write the new user to user.txt and the registry together.
+                if not registry.add_user(
+                    new_username, hash_password(new_password)
+                ):
+                    print(
+                        "Error: Username already exists. Please try again "
+                        "with a different username."
+                    )
+                    return False
+                print("You have successfully registered a new user.")
+                return True
             except Exception as e:
                 print(f"An error occurred while writing to file: {e}")
                 return False
@@ -0,0 +1,251 @@
+from datetime import timedelta
+
+from authentication import get_user_registry
+from queries import query_tasks
+from repository import reading, writing
+from services import persist_tasks, print_task_page, remove_tasks, update_task
+from utilities import format_date, parse_date
+
+"""Purpose: Change or delete many tasks at once, saving them only once."""
+
+ADMIN_USERNAME = "Administrator"
+# The number of selected tasks shown before a bulk change is confirmed.
+PREVIEW_SIZE = 20
+
+
+def _is_completed(task):
+    """
+    Checks if a task is marked as completed.
+    """
+    return task.task_completion.lower() == "yes"
+
+
+# ===================== Task Selection ===================== #
+def select_tasks(task_list, task_ids=None, **filters):
+    """
+    Selects the tasks for a bulk change by Task ID and / or by filter.
+
+    Args:
+        task_list (list): A list of Task objects.
+        task_ids (iterable, optional): Only the tasks with these Task IDs.
+        **filters: Any of the query_tasks() filters (assignee, completed,
+            due_from, due_to, title_contains).
+
+    Returns:
+        list: The selected Task objects, sorted by due date.
+    """
+    tasks = query_tasks(task_list, **filters)
+    if task_ids is not None:
+        task_ids = set(task_ids)
+        tasks = [task for task in tasks if task.task_id in task_ids]
+    return tasks
+
+
+# ===================== Bulk Changes ===================== #
+def _apply_to_tasks(task_list, tasks, change):
+    """
+    Applies a change to each of the tasks in memory, then saves the task
+    list once if any task was changed (after releasing the write lock, see
+    persist_tasks()).
+
+    Args:
+        change (callable): Called with each task; returns True if it
+            changed the task.
+
+    Returns:
+        int: The number of tasks changed.
+
+    Raises:
+        OSError, ValueError: If the changes could not all be saved (see
+        persist_tasks()).
+    """
+    with writing(task_list):
+        changed = sum(1 for task in tasks if change(task))
+    if changed:
+        persist_tasks(task_list)
+    return changed
+
+
+def bulk_complete(task_list, tasks):
+    """
+    Marks the tasks as complete. Tasks that are already complete are left
+    alone.
+
+    Returns:
+        int: The number of tasks marked as complete.
+    """
+    return _apply_to_tasks(
+        task_list,
+        tasks,
+        lambda task: bool(
+            update_task(task_list, task, task_completion="Yes")
+        ),
+    )
+
+
+def bulk_reassign(task_list, tasks, username):
+    """
+    Assigns the tasks to another user. Completed tasks cannot be edited,
+    so they are skipped.
+
+    Returns:
+        int: The number of tasks reassigned.
+
+    Raises:
+        ValueError: If there is no such user (nothing is changed).
+    """
+    if username not in get_user_registry():
+        raise ValueError(f"There is no user {username}.")
+    return _apply_to_tasks(
+        task_list,
+        tasks,
+        lambda task: not _is_completed(task)
+        and bool(update_task(task_list, task, username=username)),
+    )
+
+
+def bulk_shift_due_dates(task_list, tasks, days):
+    """
+    Moves the due dates of the tasks by a number of days (earlier if days
+    is negative). Completed tasks and tasks whose due date cannot be read
+    are skipped.
+
+    Returns:
+        int: The number of tasks whose due date was moved.
+    """
+    def shift(task):
+        due_date = parse_date(task.task_due_date)
+        if _is_completed(task) or due_date is None:
+            return False
+        new_due_date = format_date(due_date + timedelta(days=days))
+        return bool(update_task(task_list, task, task_due_date=new_due_date))
+
+    return _apply_to_tasks(task_list, tasks, shift)
+
+
+def bulk_delete(task_list, tasks):
+    """
+    Deletes the tasks.
+
+    Returns:
+        int: The number of tasks deleted.
+    """
+    with writing(task_list):
+        removed = remove_tasks(task_list, tasks)
+    if removed:
+        persist_tasks(task_list)
+    return len(removed)
+
+
+# ===================== Bulk Change Menu ===================== #
+def _run_bulk_change(change, *args):
+    """
+    Runs one of the bulk changes for the menu, printing the reason if the
+    change or saving it failed.
+
+    Returns:
+        int: The number of tasks affected, or None if it failed.
+    """
+    try:
+        return change(*args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return None
+
+
+def bulk_tasks_menu(task_list, current_user):
+    """
+    Prompts the user to select tasks (by Task ID or by filter) and to
+    choose one change to apply to all of them.
+
+    The Administrator can change any task and delete tasks; other users can
+    only complete, reassign and move the due dates of their own tasks.
+    """
+    is_admin = current_user == ADMIN_USERNAME
+    ids_text = input(
+        "Enter Task IDs separated by commas, or press Enter to select "
+        "tasks by filter: "
+    ).strip()
+    filters = {}
+    try:
+        task_ids = (
+            [int(task_id) for task_id in ids_text.split(",")]
+            if ids_text
+            else None
+        )
+    except ValueError:
+        print("Invalid input. Task IDs must be whole numbers.")
+        return
+    if task_ids is None:
+        if is_admin:
+            assignee = input("Assigned to (or press Enter for anyone): ")
+            filters["assignee"] = assignee.strip() or None
+        status = input(
+            "Completed? Enter 'y', 'n' or press Enter for both: "
+        ).strip().lower()
+        filters["completed"] = {"y": True, "n": False}.get(status)
+        for field, prompt in [
+            ("due_from", "Due on or after (e.g. 01 Jan 2025): "),
+            ("due_to", "Due on or before (e.g. 31 Dec 2025): "),
+        ]:
+            text = input(prompt).strip()
+            filters[field] = parse_date(text) if text else None
+            if text and filters[field] is None:
+                print("Invalid date. Please use the format 01 Jan 2025.")
+                return
+        filters["title_contains"] = input("Title contains: ").strip() or None
+    if not is_admin:
+        filters["assignee"] = current_user
+
+    tasks = select_tasks(task_list, task_ids, **filters)
+    if not tasks:
+        print("No tasks match the selection.")
+        return
+    print(f"{len(tasks)} tasks selected.")
+    with reading(task_list):
+        print_task_page(tasks[:PREVIEW_SIZE])
+        print(
+            "Task IDs: "
+            + ", ".join(str(task.task_id) for task in tasks[:PREVIEW_SIZE])
+        )
+    if len(tasks) > PREVIEW_SIZE:
+        print(f"... and {len(tasks) - PREVIEW_SIZE} more.")
+
+    action = input(
+        "Enter 'c' to mark them complete, 'r' to reassign them, 's' to "
+        "move their due dates"
+        + (", 'd' to delete them" if is_admin else "")
+        + ", or any other key to cancel: "
+    ).strip().lower()
+    if action == "c":
+        count = _run_bulk_change(bulk_complete, task_list, tasks)
+        if count is not None:
+            print(f"{count} tasks marked as complete.")
+    elif action == "r":
+        username = input("Enter the username to assign them to: ").strip()
+        if not username:
+            print("No changes made.")
+            return
+        count = _run_bulk_change(bulk_reassign, task_list, tasks, username)
+        if count is not None:
+            print(f"{count} tasks reassigned to {username}.")
+    elif action == "s":
+        try:
+            days = int(input("Enter the number of days to move them by: "))
+        except ValueError:
+            print("Invalid input. Please enter a whole number.")
+            return
+        count = _run_bulk_change(
+            bulk_shift_due_dates, task_list, tasks, days
+        )
+        if count is not None:
+            print(f"{count} due dates moved by {days} days.")
+    elif action == "d" and is_admin:
+        if input(f"Delete {len(tasks)} tasks? (y/n): ").lower() != "y":
+            print("No changes made.")
+            return
+        count = _run_bulk_change(bulk_delete, task_list, tasks)
+        if count is not None:
+            print(f"{count} tasks deleted.")
+    else:
+        print("No changes made.")
@@ -0,0 +1,199 @@
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+
+from data_access import add_commit_listener, remove_commit_listener
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl, so files are not locked there.
+    fcntl = None
+
+"""Purpose: Publish task changes as an append-only feed of JSON events."""
+
+# The feed is only written when this environment variable names its file.
+FEED_ENV_VAR = "TASK_MANAGER_CHANGE_FEED"
+# The event types, by the task change (see data_access.py) they describe.
+EVENT_TYPES = {"add": "created", "update": "updated", "delete": "deleted"}
+# How much of the end of the feed is read at a time to find the last event.
+TAIL_BLOCK_SIZE = 4096
+
+
+class ChangeFeed:
+    """
+    This class writes and reads a change feed: a JSON Lines file with one
+    event per task created, updated or deleted, for other tools to follow
+    instead of comparing copies of tasks.txt. Every event has:
+      - "sequence": a number one higher than the previous event's, also
+        across sessions and processes writing the same feed;
+      - "time": when the change was saved (ISO 8601);
+      - "event": "created", "updated" or "deleted";
+      - "task_id": the Task ID of the task;
+      - "old" and "new": the changed fields before and after the change
+        (all fields of a created or deleted task, and null for the side
+        that does not exist).
+    Events are only ever appended. A reader remembers the byte position
+    after the last event it handled (see read()) and resumes from there,
+    so catching up only reads the new events.
+
+    Events are written by the session that saves the change, while it
+    holds the lock of the tasks file (see data_access.add_commit_listener()),
+    so the feed only holds changes other sessions can load, in the order
+    they were saved. Changes that are not saved (e.g. rejected as
+    conflicts) are not published, and several changes to a task between
+    two saves are published as one event. A deleted task that is restored
+    (see undo.py) after the deletion was saved is published as created
+    again, with the Task ID it had.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self._listening = False
+
+    @contextmanager
+    def _locked(self):
+        """
+        Holds an exclusive advisory lock on the lock file, so events from
+        different processes get distinct sequence numbers.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ===================== Writing Events ===================== #
+    @staticmethod
+    def _find_last_event(file):
+        """
+        Finds the last complete event of an open feed file, reading only
+        the end of the file.
+
+        Returns:
+            tuple: (its sequence number, the position after it), or (0, 0)
+            if there is no event.
+        """
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            position = max(0, position - TAIL_BLOCK_SIZE)
+            file.seek(position)
+            tail = file.read(end - position)
+            # The first line of the block may be cut off, and the last one
+            # unfinished (if a writer crashed), so look for a line that
+            # ends with a newline and starts after one.
+            lines = tail.split(b"\n")[:-1]
+            if len(lines) > 1 or (lines and position == 0):
+                last_end = position + tail.rindex(b"\n") + 1
+                return json.loads(lines[-1])["sequence"], last_end
+        return 0, 0
+
+    def append(self, events):
+        """
+        Numbers the given events (dicts without a "sequence") and appends
+        them to the feed.
+
+        Returns:
+            int: The sequence number of the last event.
+        """
+        with self._locked():
+            with open(self.path, "ab+") as file:
+                sequence, last_end = self._find_last_event(file)
+                # Drop what a crashed writer left of an unfinished event.
+                file.truncate(last_end)
+                lines = []
+                for event in events:
+                    sequence += 1
+                    line = json.dumps({"sequence": sequence, **event})
+                    lines.append(line.encode("utf-8") + b"\n")
+                file.write(b"".join(lines))
+        return sequence
+
+    def publish(self, changes):
+        """
+        Appends the events of the task changes of one save (see
+        data_access.add_commit_listener()).
+        """
+        time = datetime.now().isoformat(timespec="seconds")
+        self.append(
+            [
+                {
+                    "time": time,
+                    "event": EVENT_TYPES[action],
+                    "task_id": task_id,
+                    "old": old,
+                    "new": new,
+                }
+                for action, task_id, old, new in changes
+            ]
+        )
+
+    def _on_commit(self, changes):
+        """
+        Commit listener that publishes every saved task change.
+        """
+        try:
+            self.publish(changes)
+        except OSError as e:
+            print(f"Error writing the change feed: {e}")
+
+    def start(self):
+        """
+        Starts publishing the task changes saved by this session.
+        """
+        add_commit_listener(self._on_commit)
+        self._listening = True
+
+    def stop(self):
+        """
+        Stops publishing task changes.
+        """
+        if self._listening:
+            remove_commit_listener(self._on_commit)
+            self._listening = False
+
+    # ===================== Reading Events ===================== #
+    def read(self, position=0):
+        """
+        Reads the events after a byte position of the feed: 0 for all
+        events, or the position returned with the last event read before.
+        An event that is still being written is left for the next read.
+
+        Yields:
+            tuple: (event dict, position after the event).
+        """
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            file.seek(position)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    return
+                position += len(line)
+                yield json.loads(line), position
+
+
+_change_feed = None
+
+
+def start_change_feed_if_enabled():
+    """
+    Starts publishing task changes to the feed named by the environment
+    variable, if it is set. Calling it again does nothing.
+
+    Returns:
+        ChangeFeed: The feed, or None.
+    """
+    global _change_feed
+    path = os.environ.get(FEED_ENV_VAR)
+    if path and _change_feed is None:
+        _change_feed = ChangeFeed(path)
+        _change_feed.start()
+    return _change_feed
@@ -0,0 +1,463 @@
+import argparse
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from datetime import date
+
+from authentication import (
+    check_credentials,
+    check_token,
+    create_token,
+    get_user_registry,
+)
+from change_feed import start_change_feed_if_enabled
+from data_access import (
+    REQUIRED_FIELDS,
+    append_task,
+    load_tasks,
+    reserve_task_ids,
+)
+from models import Task
+from utilities import parse_date, validate_single_line
+
+"""Purpose: Non-interactive command line interface for scripts and cron."""
+
+# Credentials come from a file holding one "username, password" line (the
+# user.txt format), given with --credentials or this environment variable,
+# or else from the username and password environment variables.
+CREDENTIALS_ENV_VAR = "TASK_MANAGER_CREDENTIALS"
+USERNAME_ENV_VAR = "TASK_MANAGER_USERNAME"
+PASSWORD_ENV_VAR = "TASK_MANAGER_PASSWORD"
+# Checking a password costs a full key derivation (see passwords.py), which
+# is most of the run time of a command. Frequent jobs (e.g. cron) can log in
+# with an access token instead (see the "token" command), kept in a file
+# holding one "username, token" line, given with --token-file or this
+# environment variable.
+TOKEN_FILE_ENV_VAR = "TASK_MANAGER_TOKEN_FILE"
+ADMIN_USERNAME = "Administrator"
+
+# Exit codes: 0 on success, 1 if the command failed (argparse uses 2 for
+# usage errors).
+EXIT_FAILURE = 1
+
+
+# ===================== Authentication ===================== #
+def _read_login_file(path, secret_name):
+    """
+    Reads the (username, secret) from a file holding one "username, secret"
+    line, e.g. a credentials or token file.
+
+    Raises:
+        ValueError: If the file is not in the expected format.
+    """
+    with open(path, "r") as file:
+        line = file.readline().strip()
+    if ", " not in line:
+        raise ValueError(
+            f"The file {path} must contain one 'username, {secret_name}' "
+            "line."
+        )
+    username, secret = line.split(", ", 1)
+    return username, secret
+
+
+def load_credentials(path=None):
+    """
+    Reads the (username, password) to run the command as.
+
+    Raises:
+        PermissionError: If no credentials were provided.
+        ValueError: If the credentials file is not in the expected format.
+    """
+    path = path or os.environ.get(CREDENTIALS_ENV_VAR)
+    if path:
+        return _read_login_file(path, "password")
+    username = os.environ.get(USERNAME_ENV_VAR)
+    password = os.environ.get(PASSWORD_ENV_VAR)
+    if not username or password is None:
+        raise PermissionError(
+            f"No credentials: use --credentials, or set {CREDENTIALS_ENV_VAR}"
+            f" or {USERNAME_ENV_VAR} and {PASSWORD_ENV_VAR}."
+        )
+    return username, password
+
+
+def authenticate(args):
+    """
+    Checks the token or credentials given for the command.
+
+    Returns:
+        tuple: (the username, True if a token was used).
+
+    Raises:
+        PermissionError: If no credentials were provided or they are wrong.
+        ValueError: If a credentials or token file is not in the expected
+            format.
+    """
+    token_path = args.token_file or os.environ.get(TOKEN_FILE_ENV_VAR)
+    if token_path:
+        username, token = _read_login_file(token_path, "token")
+        if not check_token(username, token):
+            raise PermissionError("Invalid username or token.")
+        return username, True
+    username, password = load_credentials(args.credentials)
+    if not check_credentials(username, password):
+        raise PermissionError("Invalid username or password.")
+    return username, False
+
+
+def _require_admin(username):
+    """
+    Rejects the command unless it runs as the Administrator.
+    """
+    if username != ADMIN_USERNAME:
+        raise PermissionError("Only the Administrator can do this.")
+
+
+def _parse_due_date(due_date):
+    """
+    Checks that a due date is in the format used by the task file.
+    """
+    validate_single_line(due_date, "due date")
+    if parse_date(due_date) is None:
+        raise ValueError(
+            f"Invalid due date '{due_date}'. Use the format 01 Jan 2025."
+        )
+    return due_date
+
+
+def _find_task(task_list, task_id):
+    """
+    Returns the index of the task with the given Task ID.
+    """
+    for index, task in enumerate(task_list):
+        if task.task_id == task_id:
+            return index
+    raise ValueError(f"There is no task {task_id}.")
+
+
+def _open_task_of(task_list, task_id, username):
+    """
+    Looks up a task the user may change: one of their own tasks (or any
+    task for the Administrator) that is not completed yet.
+    """
+    task = task_list[_find_task(task_list, task_id)]
+    if username not in (task.username, ADMIN_USERNAME):
+        raise PermissionError("Task does not belong to you.")
+    if task.task_completion.lower() == "yes":
+        raise ValueError("Task is already marked as complete.")
+    return task
+
+
+# ===================== Commands ===================== #
+# Each command takes the parsed arguments and the authenticated username,
+# loads only the data it needs, and returns the result fields of its JSON
+# output. The services, queries and reports modules are imported by the
+# commands that use them, so e.g. "add" only appends to the task file.
+def cmd_add(args, username):
+    # Each field is stored on a line of its own in the tasks file.
+    task = Task(
+        validate_single_line(args.assigned_to, "assignee"),
+        validate_single_line(args.title, "title"),
+        validate_single_line(args.description, "description"),
+        date.today().strftime("%d %b %Y"),
+        _parse_due_date(args.due_date),
+        "No",
+    )
+    append_task(task)
+    return {"task": task.to_dict()}
+
+
+def cmd_list(args, username):
+    from queries import query_tasks
+
+    tasks = query_tasks(
+        load_tasks(),
+        assignee=username if args.mine else args.assignee,
+        completed=args.completed,
+        due_from=args.due_from and parse_date(_parse_due_date(args.due_from)),
+        due_to=args.due_to and parse_date(_parse_due_date(args.due_to)),
+        title_contains=args.title,
+        sort_by=args.sort,
+        descending=args.descending,
+        limit=args.limit,
+        offset=args.offset,
+    )
+    return {"count": len(tasks), "tasks": [task.to_dict() for task in tasks]}
+
+
+def cmd_complete(args, username):
+    from services import persist_tasks, update_task
+
+    task_list = load_tasks()
+    task = _open_task_of(task_list, args.task_id, username)
+    update_task(task_list, task, task_completion="Yes")
+    persist_tasks(task_list)
+    return {"task": task.to_dict()}
+
+
+def cmd_reassign(args, username):
+    from services import persist_tasks, update_task
+
+    if args.assigned_to not in get_user_registry():
+        raise ValueError(f"There is no user {args.assigned_to}.")
+    changes = {"username": args.assigned_to}
+    if args.due_date:
+        changes["task_due_date"] = _parse_due_date(args.due_date)
+    task_list = load_tasks()
+    task = _open_task_of(task_list, args.task_id, username)
+    update_task(task_list, task, **changes)
+    persist_tasks(task_list)
+    return {"task": task.to_dict()}
+
+
+def cmd_delete(args, username):
+    from services import persist_tasks, remove_task
+
+    _require_admin(username)
+    task_list = load_tasks()
+    task = remove_task(task_list, _find_task(task_list, args.task_id))
+    persist_tasks(task_list)
+    return {"task": task.to_dict()}
+
+
+def cmd_report(args, username):
+    from reports import compute_statistics, generate_reports
+
+    _require_admin(username)
+    task_list = load_tasks()
+    if not generate_reports(task_list):
+        raise ValueError("The reports could not be written.")
+    task_overview, user_overview = compute_statistics(task_list)
+    return {"task_overview": task_overview, "user_overview": user_overview}
+
+
+def cmd_bulk(args, username):
+    import bulk
+
+    if username != ADMIN_USERNAME:
+        # Other users can only change their own tasks, and not delete them.
+        if args.action == "delete":
+            _require_admin(username)
+        args.assignee = username
+    if args.action == "reassign" and not args.to:
+        raise ValueError("Use --to to choose the user to assign tasks to.")
+    if args.action == "shift" and args.days is None:
+        raise ValueError("Use --days to choose how far to move due dates.")
+
+    task_list = load_tasks()
+    tasks = bulk.select_tasks(
+        task_list,
+        args.ids,
+        assignee=args.assignee,
+        completed=args.completed,
+        due_from=args.due_from and parse_date(_parse_due_date(args.due_from)),
+        due_to=args.due_to and parse_date(_parse_due_date(args.due_to)),
+        title_contains=args.title,
+    )
+    if args.action == "complete":
+        count = bulk.bulk_complete(task_list, tasks)
+    elif args.action == "reassign":
+        count = bulk.bulk_reassign(task_list, tasks, args.to)
+    elif args.action == "shift":
+        count = bulk.bulk_shift_due_dates(task_list, tasks, args.days)
+    else:
+        count = bulk.bulk_delete(task_list, tasks)
+    return {"selected": len(tasks), "affected": count}
+
+
+def cmd_export(args, username):
+    tasks = [task.to_dict() for task in load_tasks()]
+    if not args.output:
+        return {"count": len(tasks), "tasks": tasks}
+    with open(args.output, "w") as file:
+        json.dump(tasks, file, indent=2)
+    return {"count": len(tasks), "path": args.output}
+
+
+def cmd_import(args, username):
+    from services import add_task, persist_tasks
+
+    _require_admin(username)
+    with open(args.path, "r") as file:
+        data = json.load(file)
+    # Accept both an exported file and the output of "export" itself.
+    if isinstance(data, dict):
+        data = data.get("tasks", [])
+    tasks, old_ids, old_parent_ids = [], [], []
+    for item in data:
+        if not isinstance(item, dict):
+            raise ValueError("Every imported task must be a JSON object.")
+        for field in REQUIRED_FIELDS:
+            validate_single_line(item[field], field)
+        task = Task.from_dict(item)
+        old_ids.append(task.task_id)
+        old_parent_ids.append(task.parent_id)
+        tasks.append(task)
+
+    # Imported tasks are new to this task file, so they get new Task IDs.
+    # These are reserved first, so subtasks are linked to the new Task ID
+    # of their parent and all tasks are saved together. A parent that was
+    # not imported is not in this task file, so its subtasks become
+    # top-level tasks.
+    task_list = load_tasks()
+    first_id = reserve_task_ids(len(tasks))
+    new_ids = {
+        old_id: first_id + offset
+        for offset, old_id in enumerate(old_ids)
+        if old_id is not None
+    }
+    for offset, (task, old_parent_id) in enumerate(zip(tasks, old_parent_ids)):
+        task.task_id, task.version = first_id + offset, 0
+        task.parent_id = new_ids.get(old_parent_id)
+        add_task(task_list, task)
+    persist_tasks(task_list)
+    return {"count": len(tasks), "task_ids": [t.task_id for t in tasks]}
+
+
+def cmd_token(args, username):
+    if args.used_token:
+        raise PermissionError(
+            "Log in with your password to create an access token."
+        )
+    return {"username": username, "token": create_token(username)}
+
+
+# ===================== Argument Parsing ===================== #
+def _add_filter_arguments(parser, assignee_group=None):
+    """
+    Adds the task filter options shared by "list" and "bulk". The
+    --assignee option goes in assignee_group if given (e.g. a group of
+    options that cannot be used together), otherwise in the parser.
+    """
+    (assignee_group or parser).add_argument("--assignee")
+    status = parser.add_mutually_exclusive_group()
+    status.add_argument(
+        "--completed", dest="completed", action="store_const", const=True
+    )
+    status.add_argument(
+        "--open", dest="completed", action="store_const", const=False
+    )
+    parser.add_argument("--due-from")
+    parser.add_argument("--due-to")
+    parser.add_argument("--title", help="title contains this text")
+
+
+def build_parser():
+    """
+    Builds the argument parser with one sub-command per operation.
+    """
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Run one task manager command and print the result "
+        "as JSON.",
+        epilog="Checking a password takes a full key derivation, which is "
+        "slow on purpose (tunable with $TASK_MANAGER_KDF_COST, for new "
+        "password hashes). For jobs that run often, create an access token "
+        "once with the 'token' command and log in with --token-file, which "
+        "is checked with a cheap hash instead.",
+    )
+    parser.add_argument(
+        "--credentials",
+        help="file with one 'username, password' line "
+        f"(default: ${CREDENTIALS_ENV_VAR}, or ${USERNAME_ENV_VAR} and "
+        f"${PASSWORD_ENV_VAR})",
+    )
+    parser.add_argument(
+        "--token-file",
+        help="file with one 'username, token' line, used instead of the "
+        f"credentials (default: ${TOKEN_FILE_ENV_VAR})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a task")
+    add.add_argument("assigned_to")
+    add.add_argument("title")
+    add.add_argument("due_date", help="e.g. '31 Dec 2025'")
+    add.add_argument("--description", default="")
+    add.set_defaults(handler=cmd_add)
+
+    list_ = commands.add_parser("list", help="list tasks")
+    who = list_.add_mutually_exclusive_group()
+    _add_filter_arguments(list_, who)
+    who.add_argument("--mine", action="store_true")
+    list_.add_argument(
+        "--sort", choices=["due_date", "date_added"], default="due_date"
+    )
+    list_.add_argument("--descending", action="store_true")
+    list_.add_argument("--limit", type=int)
+    list_.add_argument("--offset", type=int, default=0)
+    list_.set_defaults(handler=cmd_list)
+
+    complete = commands.add_parser("complete", help="mark a task complete")
+    complete.add_argument("task_id", type=int)
+    complete.set_defaults(handler=cmd_complete)
+
+    reassign = commands.add_parser("reassign", help="reassign a task")
+    reassign.add_argument("task_id", type=int)
+    reassign.add_argument("assigned_to")
+    reassign.add_argument("--due-date")
+    reassign.set_defaults(handler=cmd_reassign)
+
+    delete = commands.add_parser("delete", help="delete a task")
+    delete.add_argument("task_id", type=int)
+    delete.set_defaults(handler=cmd_delete)
+
+    bulk = commands.add_parser(
+        "bulk", help="change or delete many tasks, saving once"
+    )
+    bulk.add_argument(
+        "action", choices=["complete", "reassign", "shift", "delete"]
+    )
+    bulk.add_argument("--ids", type=int, nargs="+", help="Task IDs")
+    bulk.add_argument("--to", help="username to reassign the tasks to")
+    bulk.add_argument(
+        "--days", type=int, help="days to move the due dates by"
+    )
+    _add_filter_arguments(bulk)
+    bulk.set_defaults(handler=cmd_bulk)
+
+    report = commands.add_parser("report", help="generate the reports")
+    report.set_defaults(handler=cmd_report)
+
+    export = commands.add_parser("export", help="export all tasks as JSON")
+    export.add_argument("--output", help="write the tasks to this file")
+    export.set_defaults(handler=cmd_export)
+
+    import_ = commands.add_parser("import", help="import tasks from JSON")
+    import_.add_argument("path")
+    import_.set_defaults(handler=cmd_import)
+
+    token = commands.add_parser(
+        "token", help="create an access token for --token-file"
+    )
+    token.set_defaults(handler=cmd_token)
+    return parser
+
+
+def run(argv=None):
+    """
+    Runs one command and prints its JSON result to stdout. Messages printed
+    by the task functions while it runs go to stderr instead, so the output
+    can always be parsed.
+
+    Returns:
+        int: The exit code (0 on success).
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        with redirect_stdout(sys.stderr):
+            username, args.used_token = authenticate(args)
+            start_change_feed_if_enabled()
+            result = {"ok": True, **args.handler(args, username)}
+    except KeyError as e:
+        result = {"ok": False, "error": f"Missing field: {e}"}
+    except (OSError, ValueError, PermissionError) as e:
+        result = {"ok": False, "error": str(e)}
+    print(json.dumps(result))
+    return 0 if result["ok"] else EXIT_FAILURE
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,223 @@
+import getpass
+import json
+import socket
+
+from models import Task
+from reports import USER_OVERVIEW_HEADERS
+from server import ADMIN_USERNAME, DEFAULT_HOST, DEFAULT_PORT
+from services import TASKS_PER_PAGE, print_task_page
+from table_renderer import render_table
+
+"""Purpose: Thin CLI client that talks to the shared task server."""
+
+
+class TaskClient:
+    """
+    This class sends requests to a running task server (see server.py) and
+    returns its responses. Nothing is loaded from the task files locally.
+    """
+    def __init__(
+        self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None
+    ):
+        if socket_path:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(socket_path)
+        else:
+            self._socket = socket.create_connection((host, port))
+        self._file = self._socket.makefile("rwb")
+
+    def request(self, op, **params):
+        """
+        Sends one request and waits for its response.
+
+        Returns:
+            dict: The response; "ok" is False and "error" holds the reason
+            if the request failed.
+
+        Raises:
+            ConnectionError: If the server closed the connection.
+        """
+        self._file.write(json.dumps({"op": op, **params}).encode("utf-8"))
+        self._file.write(b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("The task server closed the connection.")
+        return json.loads(line)
+
+    def close(self):
+        """
+        Closes the connection to the server.
+        """
+        self._file.close()
+        self._socket.close()
+
+
+def _show_tasks(client, first_task_number=1, **filters):
+    """
+    Requests one page of tasks and displays it.
+
+    Returns:
+        int: The number of tasks shown, or -1 if the request failed.
+    """
+    response = client.request("list", **filters)
+    if not response["ok"]:
+        print(f"Error: {response['error']}")
+        return -1
+    tasks = [Task.from_dict(data) for data in response["tasks"]]
+    if tasks:
+        print_task_page(tasks, first_task_number)
+        print("Task IDs: " + ", ".join(str(task.task_id) for task in tasks))
+    return len(tasks)
+
+
+def _browse_tasks(client, **filters):
+    """
+    Pages through the tasks matching the filters, one request per page.
+    """
+    offset = 0
+    while True:
+        shown = _show_tasks(
+            client, offset + 1, offset=offset, limit=TASKS_PER_PAGE, **filters
+        )
+        if shown == 0 and offset == 0:
+            print("There are no tasks to display in the list.")
+        if shown <= 0:
+            return
+        choice = input(
+            "Enter 'n' for the next page, 'p' for the previous page, "
+            "or any other key to return: "
+        ).strip().lower()
+        if choice == "n" and shown == TASKS_PER_PAGE:
+            offset += TASKS_PER_PAGE
+        elif choice == "p" and offset:
+            offset -= TASKS_PER_PAGE
+        elif choice not in ("n", "p"):
+            return
+
+
+def _print_result(response, success_message):
+    """
+    Prints the success message or the error of a response.
+    """
+    if response["ok"]:
+        print(success_message)
+    else:
+        print(f"Error: {response['error']}")
+
+
+def run_client(host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+    """
+    Runs the interactive menu against a task server instead of loading the
+    task and user files in this process.
+    """
+    try:
+        client = TaskClient(host, port, socket_path)
+    except OSError as e:
+        print(f"Error: Could not connect to the task server: {e}")
+        return
+
+    print("========== User Login ==========")
+    while True:
+        username = input("Enter your username: ")
+        password = getpass.getpass("Enter your password: ")
+        response = client.request(
+            "login", username=username, password=password
+        )
+        if response["ok"]:
+            print("You have successfully logged in.")
+            break
+        print(f"Error: {response['error']}")
+
+    is_admin = username == ADMIN_USERNAME
+    options = [
+        "a - add task",
+        "va - view all tasks",
+        "vm - view my tasks",
+        "mt - modify a task",
+    ]
+    if is_admin:
+        options += [
+            "del - delete a task",
+            "gr - generate reports",
+            "ds - display statistics",
+        ]
+    options.append("e - exit application")
+    menu_text = (
+        "\nSelect one of the following options:\n"
+        + "".join(f"    • {option}\n" for option in options)
+        + "Enter selection: "
+    )
+
+    try:
+        while True:
+            menu = input(menu_text).strip().lower()
+            if menu == "a":
+                response = client.request(
+                    "add",
+                    assigned_to=input(
+                        "Enter the username of the person the task is "
+                        "assigned to: "
+                    ),
+                    title=input("Enter the title of the task: "),
+                    description=input("Enter the description of the task: "),
+                    due_date=input("Enter the due date of the task: "),
+                )
+                _print_result(response, "Task has been successfully added.")
+            elif menu == "va":
+                _browse_tasks(client)
+            elif menu == "vm":
+                _browse_tasks(client, assignee=username)
+            elif menu == "mt":
+                task_id = input("Enter the Task ID of the task to modify: ")
+                choice = input(
+                    "Enter 'c' to mark the task as complete, 'e' to edit the "
+                    "task, or any other key to cancel: "
+                ).strip().lower()
+                if choice == "c":
+                    response = client.request("complete", task_id=task_id)
+                    _print_result(response, "Task marked as complete.")
+                elif choice == "e":
+                    response = client.request(
+                        "edit",
+                        task_id=task_id,
+                        username=input(
+                            "Enter new assigned username (or press Enter "
+                            "to keep it): "
+                        ),
+                        due_date=input(
+                            "Enter new due date (or press Enter to keep it): "
+                        ),
+                    )
+                    _print_result(response, "Task updated successfully.")
+                else:
+                    print("No changes made.")
+            elif menu == "del" and is_admin:
+                task_id = input("Enter the Task ID of the task to delete: ")
+                response = client.request("delete", task_id=task_id)
+                _print_result(response, "Task deleted successfully.")
+            elif menu == "gr" and is_admin:
+                response = client.request("report")
+                _print_result(response, "Reports generated successfully.")
+            elif menu == "ds" and is_admin:
+                response = client.request("statistics")
+                if response["ok"]:
+                    print("\nTASK OVERVIEW REPORT:")
+                    render_table(
+                        response["task_overview"], ["Metric", "Value"]
+                    )
+                    print("\nUSER OVERVIEW REPORT:")
+                    render_table(
+                        response["user_overview"], USER_OVERVIEW_HEADERS
+                    )
+                else:
+                    print(f"Error: {response['error']}")
+            elif menu == "e":
+                print("Goodbye!!!")
+                return
+            else:
+                print("You have entered an invalid input. Please try again")
+    except ConnectionError as e:
+        print(f"Error: {e}")
+    finally:
+        client.close()
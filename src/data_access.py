@@ -10,94 +10,694 @@ File I/O: functions to load and save tasks.
 # This tells Python to import Task from the models
 # module within the same package.
 
+import os
+import stat
+import threading
+from contextlib import contextmanager
+
+from instrumentation import timed
+from metrics import measured, set_gauge
 from models import Task     # Absolute import of Task class from models
+from repository import (
+    before_list_change,
+    before_task_change,
+    take_snapshot,
+    writing,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl, so files are not locked there.
+    fcntl = None
+
+TASKS_FILE = "tasks.txt"
+
+# The first line of the tasks file is a fixed-width header, so it can be
+# updated in place when a task is appended:
+# "File Version: 0000000007, Next Task ID: 0000000012"
+HEADER_FORMAT = "File Version: {:010d}, Next Task ID: {:010d}\n"
+HEADER_SIZE = len(HEADER_FORMAT.format(0, 0))
+
+# The line prefixes of a task record and the Task attributes they hold.
+# "Task ID" and "Task Version" are optional, so files written before they
+# were added (six lines per task, no header) can still be loaded. "Parent
+# Task ID" is only written for subtasks.
+TASK_FIELDS = [
+    ("Assigned to: ", "username"),
+    ("Task Title: ", "task_title"),
+    ("Description: ", "task_description"),
+    ("Date of Assignment: ", "task_date_added"),
+    ("Task Due Date: ", "task_due_date"),
+    ("Task Completion: ", "task_completion"),
+    ("Task ID: ", "task_id"),
+    ("Task Version: ", "version"),
+    ("Parent Task ID: ", "parent_id"),
+]
+REQUIRED_FIELDS = [attribute for _, attribute in TASK_FIELDS[:6]]
+# The fields compared to detect changes and merged from other sessions.
+TRACKED_FIELDS = REQUIRED_FIELDS + ["parent_id"]
+
+
+# ===================== Commit Listeners ===================== #
+# Functions told about the task changes this session writes to the tasks
+# file (e.g. to publish them, see change_feed.py). Every listener is called
+# as listener(changes) after a write, with one (action, task_id, old, new)
+# tuple per task added ("add"), changed ("update") or removed ("delete"):
+# old and new hold the fields of the task (as in Task.to_dict()) before and
+# after the change, only the changed fields for updates, and None for the
+# side that does not exist. Changes merged in from other sessions are not
+# included. Listeners run while the tasks file is locked, so the changes
+# written by different sessions are told in the order they were written.
+_commit_listeners = []
+
+
+def add_commit_listener(listener):
+    """
+    Registers a function to be called after every write of task changes.
+    """
+    if listener not in _commit_listeners:
+        _commit_listeners.append(listener)
+
+
+def remove_commit_listener(listener):
+    """
+    Unregisters a function added with add_commit_listener().
+    """
+    if listener in _commit_listeners:
+        _commit_listeners.remove(listener)
+
+
+def _notify_commit_listeners(changes):
+    """
+    Calls every registered listener with the changes of one write.
+    """
+    if not changes:
+        return
+    for listener in list(_commit_listeners):
+        listener(changes)
+
+
+# ===================== Task File Format ===================== #
+def format_task(task):
+    """
+    Returns the lines of the tasks file that store one task.
+    """
+    record = (
+        f"Assigned to: {task.username},\n"
+        f"Task Title: {task.task_title},\n"
+        f"Description: {task.task_description},\n"
+        f"Date of Assignment: {task.task_date_added},\n"
+        f"Task Due Date: {task.task_due_date},\n"
+        f"Task Completion: {task.task_completion},\n"
+        f"Task ID: {task.task_id},\n"
+        f"Task Version: {task.version}\n"
+    )
+    if task.parent_id is not None:
+        record += f"Parent Task ID: {task.parent_id}\n"
+    return record
+
+
+def task_fields(task):
+    """
+    Returns the user visible fields of a task, used to detect changes.
+    """
+    return tuple(getattr(task, attribute) for attribute in TRACKED_FIELDS)
+
+
+def _fields_dict(task_id, version, fields):
+    """
+    Returns the saved state of a task (see TaskStore._base) as a dictionary
+    shaped like Task.to_dict().
+    """
+    return {
+        "task_id": task_id,
+        "version": version,
+        **dict(zip(TRACKED_FIELDS, fields)),
+    }
+
+
+def _changes_between(before, after):
+    """
+    Returns the changes (see add_commit_listener()) that turn the tasks
+    saved before a write into the tasks saved by it, both given as
+    task_id -> (version, fields).
+    """
+    changes = []
+    for task_id, (version, fields) in after.items():
+        old = before.get(task_id)
+        if old is None:
+            new = _fields_dict(task_id, version, fields)
+            changes.append(("add", task_id, None, new))
+        elif old[1] != fields:
+            changed = [
+                (name, old_value, new_value)
+                for name, old_value, new_value in zip(
+                    TRACKED_FIELDS, old[1], fields
+                )
+                if old_value != new_value
+            ]
+            changes.append((
+                "update",
+                task_id,
+                {name: old_value for name, old_value, _ in changed},
+                {name: new_value for name, _, new_value in changed},
+            ))
+    for task_id, (version, fields) in before.items():
+        if task_id not in after:
+            old = _fields_dict(task_id, version, fields)
+            changes.append(("delete", task_id, old, None))
+    return changes
+
+
+def _parse_header(line):
+    """
+    Returns (file version, next task ID) from a header line, or None if the
+    line is not a header.
+    """
+    if not line.startswith("File Version: "):
+        return None
+    version_part, next_id_part = line.split(",", 1)
+    return (
+        int(version_part.split(":", 1)[1]),
+        int(next_id_part.split(":", 1)[1]),
+    )
+
+
+def _build_task(values, first_line, last_line, next_id):
+    """
+    Creates a Task object from the parsed fields of one task record.
+
+    Returns:
+        Task or None: None (after printing the error) if the record is
+        incomplete or invalid.
+    """
+    try:
+        missing = [a for a in REQUIRED_FIELDS if a not in values]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+        task_id = int(values["task_id"]) if "task_id" in values else next_id
+        parent_id = values.get("parent_id")
+        return Task(
+            *(values[attribute] for attribute in REQUIRED_FIELDS),
+            task_id=task_id,
+            version=int(values.get("version", 0)),
+            parent_id=int(parent_id) if parent_id else None,
+        )
+    except Exception as e:
+        print(
+            f"Error loading task from lines {first_line} to {last_line}: "
+            f"{e}"
+        )
+        return None
+
+
+@timed
+def parse_tasks(lines):
+    """
+    Parses the lines of a tasks file.
+
+    A task record starts at an "Assigned to: " line and continues until the
+    next one. Records that are incomplete or contain unexpected lines are
+    reported and skipped, and loading continues with the next record.
+    Tasks without a stored Task ID (files written by older versions) are
+    numbered in file order.
+
+    Args:
+        lines (iterable): The lines of the file.
+
+    Returns:
+        tuple: (file version, next task ID, list of Task objects). The file
+        version is 0 for files without a header.
+    """
+    file_version, next_id = 0, 1
+    tasks = []
+    values, first_line, valid = None, 0, True
+    last_line = 0
+
+    def finish_record():
+        nonlocal next_id
+        if values is None:
+            return
+        if not valid:
+            print(
+                f"Error loading task from lines {first_line} to "
+                f"{last_line}: unexpected line"
+            )
+            return
+        task = _build_task(values, first_line, last_line, next_id)
+        if task is not None:
+            tasks.append(task)
+            next_id = max(next_id, task.task_id + 1)
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line_number == 1:
+            header = _parse_header(line)
+            if header is not None:
+                file_version, next_id = header
+                continue
+        if line.startswith("Assigned to: "):
+            finish_record()
+            values, first_line, valid = {}, line_number, True
+        elif values is None:
+            print(f"Error loading task from line {line_number}: {line}")
+            continue
+        for prefix, attribute in TASK_FIELDS:
+            if line.startswith(prefix):
+                values[attribute] = line[len(prefix):].rstrip(",")
+                break
+        else:
+            valid = False
+        last_line = line_number
+    finish_record()
+    return file_version, next_id, tasks
+
+
+# ===================== Task Store ===================== #
+class TaskStore:
+    """
+    This class loads and saves the tasks file so that several sessions can
+    share it without losing each other's changes.
+
+    Every task carries a Task ID and a version counter, and the file header
+    carries a file version. Writes take a short advisory lock (fcntl) on a
+    separate lock file, only for the duration of the write itself:
+      - Appending a new task writes the record at the end of the file and
+        updates the fixed-width header in place.
+      - Saving the task list first checks the file version. If no other
+        session wrote the file since it was loaded, the list is written
+        as it is. Otherwise the changes are merged: tasks changed only here
+        or only elsewhere keep that change, while a task changed in both
+        sessions keeps the saved version and the local edit is rejected.
+        New tasks get their Task IDs, while a deleted task that is restored
+        (see undo.py), or a new task given a reserved Task ID (see
+        reserve_ids()), keeps its own.
+    Whole-file writes go to a temporary file that replaces the tasks file,
+    so readers (which do not lock) always see a complete file. The threads
+    of one session also write one at a time. After every write, the commit
+    listeners are told what this session changed (see
+    add_commit_listener()).
+
+    Saving changes the tasks in place (their IDs, versions and merged
+    fields) under the write lock of the task list, so the task list's
+    snapshots are told first (see repository.py). The file itself is
+    written from a snapshot after the write lock is released, so readers
+    of the task list are not held up by the disk.
+    """
+    def __init__(self, path=TASKS_FILE):
+        self.path = path
+        self.lock_path = path + ".lock"
+        # The file version this session's task list is based on (None if
+        # unknown, which makes the next save merge).
+        self.file_version = 0
+        self.next_id = 1
+        # task_id -> (version, fields) of every task as last loaded / saved.
+        self._base = {}
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        """
+        Holds the lock of the store and an exclusive advisory lock on the
+        lock file.
+        """
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _remember(self, tasks):
+        """
+        Records the tasks as the base for detecting local changes.
+        """
+        self._base = {
+            task.task_id: (task.version, task_fields(task)) for task in tasks
+        }
+
+    def _read_header(self):
+        """
+        Returns (file version, next task ID) from the tasks file header, or
+        None if the file is missing or has no header.
+        """
+        try:
+            with open(self.path, "r") as file:
+                return _parse_header(file.readline().strip())
+        except FileNotFoundError:
+            return None
+
+    def _read_tasks(self):
+        """
+        Parses the tasks file, returning (file version, next ID, tasks).
+        """
+        try:
+            with open(self.path, "r") as file:
+                return parse_tasks(file)
+        except FileNotFoundError:
+            return 0, 1, []
+
+    def _write_file(self, tasks, file_version, next_id):
+        """
+        Writes the whole tasks file through a temporary file, from Task
+        objects or TaskViews (e.g. a snapshot, which is iterated once).
+        """
+        # Imported here since only writes need it, and it is slow to import
+        # (see benchmarks/bench_startup.py).
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temp_path = tempfile.mkstemp(
+            prefix=".tasks-", dir=directory
+        )
+        try:
+            # Keep the permissions of the file being replaced.
+            try:
+                mode = stat.S_IMODE(os.stat(self.path).st_mode)
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(temp_path, mode)
+            base = {}
+            with os.fdopen(descriptor, "w") as file:
+                file.write(HEADER_FORMAT.format(file_version, next_id))
+                for task in tasks:
+                    file.write(format_task(task))
+                    base[task.task_id] = (task.version, task_fields(task))
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self.file_version = file_version
+        self.next_id = next_id
+        self._base = base
+
+    def load(self):
+        """
+        Loads all tasks from the tasks file.
+
+        Returns:
+            list: The Task objects, or an empty list if there is no file.
+        """
+        try:
+            with open(self.path, "r") as file:
+                self.file_version, self.next_id, tasks = parse_tasks(file)
+        except FileNotFoundError:
+            print(
+                "tasks.txt file not found. Starting with an empty task list."
+            )
+            self.file_version, self.next_id, tasks = 0, 1, []
+        self._remember(tasks)
+        return tasks
+
+    def append(self, task):
+        """
+        Assigns a Task ID to a new task and appends it to the tasks file.
+        """
+        with self._locked():
+            header = self._read_header()
+            if header is None:
+                # A missing or old-format file gets rewritten with a header.
+                known_version, known_base = self.file_version, self._base
+                file_version, next_id, tasks = self._read_tasks()
+                task.task_id, task.version = next_id, 1
+                tasks.append(task)
+                self._write_file(tasks, file_version + 1, next_id + 1)
+                if file_version != known_version:
+                    # Another session wrote first: keep our older view, so
+                    # the next save merges its changes.
+                    self.file_version = None
+                    self._base = known_base
+                    self._base[task.task_id] = (1, task_fields(task))
+                _notify_commit_listeners(
+                    [("add", task.task_id, None, task.to_dict())]
+                )
+                return
+            file_version, next_id = header
+            task.task_id, task.version = next_id, 1
+            with open(self.path, "r+b") as file:
+                end = file.seek(0, os.SEEK_END)
+                if end > HEADER_SIZE:
+                    file.seek(end - 1)
+                    if file.read(1) != b"\n":
+                        file.write(b"\n")
+                file.write(format_task(task).encode("utf-8"))
+                file.seek(0)
+                file.write(
+                    HEADER_FORMAT.format(file_version + 1, next_id + 1).encode(
+                        "utf-8"
+                    )
+                )
+            _notify_commit_listeners(
+                [("add", task.task_id, None, task.to_dict())]
+            )
+        # The new version only covers our view if nobody else wrote first.
+        if file_version == self.file_version:
+            self.file_version = file_version + 1
+        self.next_id = next_id + 1
+        self._base[task.task_id] = (1, task_fields(task))
+
+    def reserve_ids(self, count):
+        """
+        Reserves Task IDs for new tasks, which keep them when they are saved
+        (see _number_task()), e.g. so imported subtasks can be linked to the
+        Task IDs of their imported parents before anything is saved.
+
+        Only the next Task ID in the header changes, so other sessions do
+        not see the file as changed.
+
+        Returns:
+            int: The first of the count reserved Task IDs.
+        """
+        with self._locked():
+            header = self._read_header()
+            if header is None:
+                # A missing or old-format file gets rewritten with a header.
+                known_version, known_base = self.file_version, self._base
+                file_version, next_id, tasks = self._read_tasks()
+                self._write_file(tasks, file_version + 1, next_id + count)
+                if file_version != known_version:
+                    # Another session wrote first: keep our older view, so
+                    # the next save merges its changes.
+                    self.file_version = None
+                    self._base = known_base
+                return next_id
+            file_version, next_id = header
+            with open(self.path, "r+b") as file:
+                file.write(
+                    HEADER_FORMAT.format(file_version, next_id + count).encode(
+                        "utf-8"
+                    )
+                )
+        self.next_id = max(self.next_id, next_id + count)
+        return next_id
+
+    def save(self, task_list):
+        """
+        Saves the task list, merging in changes saved by other sessions.
+
+        The task list is updated in place with the merged result. Do not
+        call it while holding the write lock of the task list, which it
+        takes itself only while it changes the tasks.
+
+        Returns:
+            tuple: (reload, conflicts) where reload is True if saving made
+            changes to the task list that the task listeners (see
+            services.py) are not told about: changes from other sessions
+            were merged in, or new tasks got their Task IDs. conflicts lists
+            the tasks whose local changes were rejected.
+        """
+        with self._locked():
+            # A file without a header (old format or missing) is version 0.
+            header = self._read_header() or (0, 1)
+            if header[0] == self.file_version:
+                conflicts = []
+                file_version, before = self.file_version, self._base
+                with writing(task_list):
+                    first_new_id = next_id = max(self.next_id, header[1])
+                    for task in task_list:
+                        base = self._base.get(task.task_id)
+                        if task.task_id is None or base is None:
+                            next_id = self._number_task(
+                                task_list, task, next_id
+                            )
+                        elif task_fields(task) != base[1]:
+                            before_task_change(task_list, task)
+                            task.version = base[0] + 1
+                    snapshot = take_snapshot(task_list)
+                reload = next_id != first_new_id
+            else:
+                reload = True
+                file_version, next_id, saved_tasks = self._read_tasks()
+                # Only the changes made here are this session's to tell.
+                before = {
+                    task.task_id: (task.version, task_fields(task))
+                    for task in saved_tasks
+                }
+                with writing(task_list):
+                    tasks, conflicts, next_id = self._merge(
+                        task_list, saved_tasks, next_id
+                    )
+                    before_list_change(task_list)
+                    task_list[:] = tasks
+                    snapshot = take_snapshot(task_list)
+            with snapshot:
+                self._write_file(snapshot, file_version + 1, next_id)
+            if _commit_listeners:
+                _notify_commit_listeners(_changes_between(before, self._base))
+        return reload, conflicts
+
+    def _number_task(self, task_list, task, next_id):
+        """
+        Gives a task that is not in the saved tasks its Task ID and first
+        version. A task that had a Task ID from this file before (a deleted
+        task that was restored) keeps it, so it is the same task to other
+        sessions, and its version goes on from where it was. So does a new
+        task with a reserved Task ID (see reserve_ids()).
+
+        Returns:
+            int: The next free Task ID.
+        """
+        before_task_change(task_list, task)
+        if task.task_id is not None and task.task_id < next_id:
+            task.version += 1
+            return next_id
+        task.task_id, task.version = next_id, 1
+        return next_id + 1
+
+    def _merge(self, task_list, saved_tasks, next_id):
+        """
+        Three-way merge of the local task list, the tasks saved by other
+        sessions and the base the local list was loaded from.
+
+        Returns:
+            tuple: (merged tasks, rejected local tasks, next task ID).
+        """
+        local = {t.task_id: t for t in task_list if t.task_id is not None}
+        saved_ids = set()
+        merged, conflicts = [], []
+        for saved in saved_tasks:
+            saved_ids.add(saved.task_id)
+            task = local.get(saved.task_id)
+            base = self._base.get(saved.task_id)
+            if task is None:
+                if base is None or saved.version != base[0]:
+                    # Added, or changed after our delete, in another session.
+                    merged.append(saved)
+                    if base is not None:
+                        conflicts.append(saved)
+                continue
+            changed_here = base is None or task_fields(task) != base[1]
+            if changed_here and (base is None or saved.version == base[0]):
+                before_task_change(task_list, task)
+                task.version = saved.version + 1
+            else:
+                differs = task_fields(task) != task_fields(saved)
+                if changed_here and differs:
+                    conflicts.append(task)
+                if differs or task.version != saved.version:
+                    before_task_change(task_list, task)
+                # Keep the local object, with the saved fields.
+                for attribute in TRACKED_FIELDS:
+                    setattr(task, attribute, getattr(saved, attribute))
+                task.version = saved.version
+            merged.append(task)
+
+        for task in task_list:
+            if task.task_id is None or task.task_id not in self._base:
+                if task.task_id in saved_ids:
+                    continue
+                next_id = self._number_task(task_list, task, next_id)
+                merged.append(task)
+            elif task.task_id not in saved_ids:
+                # Deleted in another session; a local edit is rejected.
+                if task_fields(task) != self._base[task.task_id][1]:
+                    conflicts.append(task)
+        return merged, conflicts, next_id
+
+
+_task_store = TaskStore()
 
 
 # ===================== Task / User Persistence ===================== #
+@timed
+@measured("load")
 def load_tasks():
     """
     Loads existing tasks from the 'task.txt' file into the in-memory task
     list and creates Task objects.
 
-    Assumes each task is stored in 6 consecutive lines.
-
     The list called tasks will be used to store a list of objects of the Task
     class.
 
     Loads tasks from a file and returns them as a list of Task objects.
-    This function reads the 'tasks.txt' file, where each task is stored in six
-    consecutive lines with specific formatting. It parses the file content,
-    creates Task objects, and appends them to a list. If the file is not found,
-    an empty list is returned. Errors encountered while parsing individual
-    tasks are logged, and the function continues processing the remaining
-    tasks.
+    This function reads the 'tasks.txt' file, where each task is stored in
+    consecutive lines with specific formatting (see parse_tasks()). It parses
+    the file content, creates Task objects, and appends them to a list. If
+    the file is not found, an empty list is returned. Errors encountered
+    while parsing individual tasks are logged, and the function continues
+    processing the remaining tasks.
 
     Returns:
         list: A list of Task objects representing the tasks loaded
         from the file.
+    """
+    tasks = _task_store.load()
+    set_gauge("tasks_loaded", len(tasks))
+    return tasks
 
-    Raises:
-        FileNotFoundError: If the 'tasks.txt' file is not found.
-        Exception: If there is an error parsing a specific task's data.
+
+@timed
+def load_user_tasks(username):
     """
-    # ===================== Task list ===================== #
-    tasks = []  # This list to store the tasks (Task objects) that are
-    # created by the user.
-    # ===================== Task list ===================== #
+    Loads only the tasks assigned to one user, e.g. to show a user their
+    own tasks without keeping the whole task list in memory. Unlike
+    load_tasks(), this does not change what the next save is based on.
 
+    Returns:
+        list: The user's Task objects, or an empty list if there is no file.
+    """
     try:
-        with open("tasks.txt", "r") as file:
-            lines = file.readlines()
-            # Remove blank lines and strip each line.
-            lines = [line.strip() for line in lines if line.strip()]
-            # Each task is 6 lines long.
-            for i in range(0, len(lines), 6):
-                try:
-                    assigned_line = lines[i]
-                    title_line = lines[i + 1]
-                    desc_line = lines[i + 2]
-                    date_assigned_line = lines[i + 3]
-                    due_date_line = lines[i + 4]
-                    completion_line = lines[i + 5]
-
-                    username = assigned_line.split("Assigned to: ")[1].rstrip(
-                        ","
-                    )
-                    task_title = title_line.split("Task Title: ")[1].rstrip(
-                        ","
-                    )
-                    task_description = desc_line.split("Description: ")[
-                        1
-                    ].rstrip(",")
-                    task_date_added = date_assigned_line.split(
-                        "Date of Assignment: "
-                    )[1].rstrip(",")
-                    task_due_date = due_date_line.split("Task Due Date: ")[
-                        1
-                    ].rstrip(",")
-                    task_completion = completion_line.split(
-                        "Task Completion: "
-                    )[1]
-                    task = Task(
-                        username,
-                        task_title,
-                        task_description,
-                        task_date_added,
-                        task_due_date,
-                        task_completion,
-                    )
-                    tasks.append(task)
-                except Exception as e:
-                    print(
-                        f"Error loading task from lines {i + 1} to {i + 6}: "
-                        f"{e}"
-                    )
-                    continue
+        with open(_task_store.path, "r") as file:
+            _, _, tasks = parse_tasks(file)
     except FileNotFoundError:
-        print("tasks.txt file not found. Starting with an empty task list.")
-    return tasks
+        return []
+    return [task for task in tasks if task.username == username]
+
 
+@timed
+@measured("append")
+def append_task(task):
+    """
+    Appends a new task to the 'tasks.txt' file, assigning its Task ID.
+
+    Raises:
+        Exception: If the file cannot be written.
+    """
+    _task_store.append(task)
 
+
+def reserve_task_ids(count):
+    """
+    Reserves count Task IDs in the 'tasks.txt' file for new tasks, which
+    keep them when the task list is saved (see TaskStore.reserve_ids()).
+
+    Returns:
+        int: The first of the reserved Task IDs.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    return _task_store.reserve_ids(count)
+
+
+@timed
+@measured("save")
 def save_tasks(task_list):
     """
     This function writes the current (in-memory) task list to the 'tasks.txt'
@@ -110,26 +710,24 @@ def save_tasks(task_list):
     a structured format with fields such as username, task title,
     description, date of assignment, due date, and completion status.
 
+    If another session saved the file since it was loaded, its changes are
+    merged into the task list (see TaskStore.save()), and any local change
+    that conflicts with them is discarded.
+
     Args:
         task_list (list): A list of task objects, where each object contains
                           attributes like username, task_title,
                           task_description,
                           task_date_added, task_due_date, and task_completion.
 
+    Returns:
+        tuple: (reload, conflicts) where reload is True if changes from
+        other sessions were merged into the task list or new tasks got
+        their Task IDs, and conflicts lists the tasks whose local changes
+        were discarded.
+
     Raises:
-        Exception: If an error occurs during the file writing process,
-        an exception is caught and an error message is printed to the console.
+        OSError: If the file cannot be written. The changes stay in the
+        task list, so they are saved by the next successful save.
     """
-    try:
-        with open("tasks.txt", "w") as file:
-            for task in task_list:
-                file.write(
-                    f"Assigned to: {task.username},\n"
-                    f"Task Title: {task.task_title},\n"
-                    f"Description: {task.task_description},\n"
-                    f"Date of Assignment: {task.task_date_added},\n"
-                    f"Task Due Date: {task.task_due_date},\n"
-                    f"Task Completion: {task.task_completion}\n"
-                )
-    except Exception as e:
-        print(f"Error saving tasks: {e}")
+    return _task_store.save(task_list)
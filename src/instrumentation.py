@@ -0,0 +1,187 @@
+import atexit
+import os
+import sys
+import threading
+import time
+
+"""Purpose: Time the hot paths of the application when asked to."""
+
+# Timing is switched on by setting this environment variable, or by
+# starting main.py with --timings (which is the same as setting it to "1").
+# With "1" the summary is printed to stderr when the program exits; any
+# other value is the path of a JSON file the summary is written to instead.
+TIMINGS_ENV_VAR = "TASK_MANAGER_TIMINGS"
+TIMINGS_FLAG = "--timings"
+# The setting is read once, when this module is first imported (before any
+# timed function is defined), so the functions decorated with timed() are
+# only wrapped when timing is on and cost nothing otherwise.
+TIMINGS = os.environ.get(TIMINGS_ENV_VAR, "")
+if not TIMINGS and TIMINGS_FLAG in sys.argv[1:]:
+    TIMINGS = "1"
+ENABLED = TIMINGS not in ("", "0")
+PERCENTILES = (50, 90, 99)
+
+_lock = threading.Lock()
+# name -> [count, total seconds, max seconds, {bucket: count}]. Latencies
+# are counted in buckets of powers of two microseconds: bucket b holds the
+# calls that took less than 2 ** b and at least 2 ** (b - 1) microseconds.
+_stats = {}
+
+
+def record(name, elapsed):
+    """
+    Adds one call of an operation that took elapsed seconds.
+    """
+    bucket = int(elapsed * 1_000_000).bit_length()
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = [0, 0.0, 0.0, {}]
+        stats[0] += 1
+        stats[1] += elapsed
+        if elapsed > stats[2]:
+            stats[2] = elapsed
+        stats[3][bucket] = stats[3].get(bucket, 0) + 1
+
+
+def timed(function):
+    """
+    Decorator that records the latency of every call of a function under
+    the name "module.function", if timing is on. If timing is off the
+    function is returned as it is.
+    """
+    if not ENABLED:
+        return function
+    name = (
+        f"{function.__module__.rsplit('.', 1)[-1]}.{function.__qualname__}"
+    )
+    perf_counter = time.perf_counter
+
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(name, perf_counter() - start)
+
+    wrapper.__name__ = function.__name__
+    wrapper.__qualname__ = function.__qualname__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__wrapped__ = function
+    return wrapper
+
+
+def _bucket_percentile(buckets, count, percent):
+    """
+    Returns the upper bound (in seconds) of the bucket that holds the given
+    percentile of the calls.
+    """
+    rank = max(percent * count / 100, 1)
+    seen = 0
+    for bucket in sorted(buckets):
+        seen += buckets[bucket]
+        if seen >= rank:
+            return 2 ** bucket / 1_000_000
+    return 0.0
+
+
+def get_summary():
+    """
+    Returns the recorded timings.
+
+    Returns:
+        dict: Per operation name, the "count", "total_ms", "mean_ms" and
+        "max_ms", the approximate "p50_ms", "p90_ms" and "p99_ms" (the
+        upper bound of their histogram bucket) and the "histogram", which
+        maps the upper bound of each bucket in microseconds to its count.
+    """
+    with _lock:
+        stats = {
+            name: (count, total, maximum, dict(buckets))
+            for name, (count, total, maximum, buckets) in _stats.items()
+        }
+    summary = {}
+    for name, (count, total, maximum, buckets) in sorted(stats.items()):
+        entry = {
+            "count": count,
+            "total_ms": total * 1000,
+            "mean_ms": total / count * 1000,
+            "max_ms": maximum * 1000,
+        }
+        for percent in PERCENTILES:
+            entry[f"p{percent}_ms"] = min(
+                _bucket_percentile(buckets, count, percent), maximum
+            ) * 1000
+        entry["histogram"] = {
+            2 ** bucket: buckets[bucket] for bucket in sorted(buckets)
+        }
+        summary[name] = entry
+    return summary
+
+
+def reset():
+    """
+    Forgets all recorded timings.
+    """
+    with _lock:
+        _stats.clear()
+
+
+def print_summary(out=None):
+    """
+    Prints the recorded timings as a table, slowest total first.
+    """
+    from table_renderer import render_table
+
+    out = out or sys.stderr
+    summary = get_summary()
+    if not summary:
+        print("No timings were recorded.", file=out)
+        return
+    print("\nTIMINGS:", file=out)
+    render_table(
+        [
+            [
+                name,
+                entry["count"],
+                f"{entry['total_ms']:.2f}",
+                f"{entry['mean_ms']:.3f}",
+                *(f"{entry[f'p{p}_ms']:.3f}" for p in PERCENTILES),
+                f"{entry['max_ms']:.3f}",
+            ]
+            for name, entry in sorted(
+                summary.items(), key=lambda item: -item[1]["total_ms"]
+            )
+        ],
+        ["Operation", "Count", "Total (ms)", "Mean (ms)"]
+        + [f"~p{p} (ms)" for p in PERCENTILES]
+        + ["Max (ms)"],
+        out=out,
+    )
+
+
+def write_summary(path):
+    """
+    Writes the recorded timings to a JSON file (see get_summary()).
+    """
+    import json
+
+    with open(path, "w") as file:
+        json.dump(get_summary(), file, indent=2)
+
+
+def _report_at_exit():
+    """
+    Prints or writes the summary, as chosen by the environment variable.
+    """
+    try:
+        if TIMINGS == "1":
+            print_summary()
+        else:
+            write_summary(TIMINGS)
+    except Exception as e:
+        print(f"Error writing the timings: {e}", file=sys.stderr)
+
+
+if ENABLED:
+    atexit.register(_report_at_exit)
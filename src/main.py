@@ -1,6 +1,8 @@
 import getpass
-from data_access import load_tasks
+import sys
 from authentication import user_login, register_user
+from data_access import load_tasks, load_user_tasks
+from repository import TaskRepository
 from services import (
     capture_task,
     view_all_tasks,
@@ -9,10 +11,42 @@ from services import (
     delete_task,
     modify_task,
 )
-from reports import generate_reports, display_statistics
 
 """Purpose: Serves as the entry point for the application."""
 
+# To start quickly, only the modules needed to log in and show the menu are
+# imported up front. The queries, reports and snapshots modules are imported
+# by the menu options that use them, and the tasks are loaded by the first
+# option that needs all of them (see benchmarks/bench_startup.py).
+OPTIONS_WITHOUT_TASKS = ("r", "vm", "rs", "tr", "e")
+
+
+def load_task_list():
+    """
+    Loads the tasks from the 'tasks.txt' file into a TaskRepository, and
+    records today's statistics snapshot if reports have not run yet today,
+    so the trend history has no gaps on days nobody generates reports.
+    Starts the due-date reminders and the change feed if they are switched
+    on, and the undo log that records the changes made from now on.
+
+    Returns:
+        TaskRepository: The in-memory task list.
+    """
+    from change_feed import start_change_feed_if_enabled
+    from reminders import start_reminders_if_enabled
+    from snapshots import record_snapshot_if_due
+    from undo import get_undo_log
+
+    task_list = TaskRepository(load_tasks())
+    try:
+        record_snapshot_if_due(task_list)
+    except Exception as e:
+        print(f"Error recording statistics snapshot: {e}")
+    start_reminders_if_enabled(task_list)
+    start_change_feed_if_enabled()
+    get_undo_log(task_list)
+    return task_list
+
 
 def main():
     # ============ Login Section Start ============ #
@@ -42,9 +76,10 @@ def main():
         logged_in = user_login(user_username, user_password)
     # ============ Login Section End ============ #
 
-    # Load existing tasks from the 'task.txt' file into the in-memory task
-    # list.
-    task_list = load_tasks()
+    # The existing tasks are loaded from the 'task.txt' file into the
+    # in-memory task list (which can be shared safely with background
+    # threads) by the first menu option that needs them.
+    task_list = None
 
     # --------------------- Main program Loop --------------------- #
     """
@@ -56,7 +91,18 @@ def main():
 
     # Loop continuously until the user enters the correct username and
     # password.
+    announced_report_job = None
     while True:
+        # Tell the user (once) when background report generation is done.
+        report_job = _get_report_job()
+        if (
+            report_job
+            and not report_job.is_running()
+            and report_job is not announced_report_job
+        ):
+            print(report_job.describe())
+            announced_report_job = report_job
+
         # Build dynamic menu based on the logged-in user.
 
         if user_username == "Administrator":
@@ -64,13 +110,21 @@ def main():
                 """\nSelect one of the following options:
                         • r - register a user
                         • a - add task
+                        • st - add a subtask
                         • va - view all tasks
+                        • pt - view project progress
                         • vm - view my tasks
                         • vc - view completed tasks
+                        • qt - query tasks
                         • del - delete a task
                         • mt - modify a task
+                        • bt - bulk task changes
+                        • u - undo the last change
+                        • rd - redo the last undone change
                         • gr - generate reports
+                        • rs - report generation status
                         • ds - display statistics
+                        • tr - view statistics trends
                         • e - exit application
 
                         Enter selection: """
@@ -80,14 +134,23 @@ def main():
             menu = input(
                 """\nSelect one of the following options:
                         • a - add task
+                        • st - add a subtask
                         • va - view all tasks
+                        • pt - view project progress
                         • vm - view my tasks
+                        • qt - query tasks
                         • mt - modify a task
+                        • bt - bulk task changes
+                        • u - undo the last change
+                        • rd - redo the last undone change
                         • e - exit application
 
                         Enter selection: """
             ).lower()
 
+        if task_list is None and menu not in OPTIONS_WITHOUT_TASKS:
+            task_list = load_task_list()
+
         if menu == "r":
             # TODO: Implement the following functionality.
             """
@@ -130,6 +193,20 @@ def main():
             # data about a new task
             capture_task(task_list)
 
+        elif menu == "st":
+            # Call the function capture_subtask to add a task as a subtask
+            # of an existing task.
+            from subtasks import capture_subtask
+
+            capture_subtask(task_list)
+
+        elif menu == "pt":
+            # Call the function view_task_tree to view the progress of the
+            # projects and their subtasks.
+            from subtasks import view_task_tree
+
+            view_task_tree(task_list)
+
         elif menu == "va":
             # TODO: Implement the following functionality.
             """
@@ -166,7 +243,11 @@ def main():
 
             # Call the function view_my_tasks to view the tasks assigned to the
             # current user.
-            view_my_tasks(user_username, task_list)
+            # Until all tasks are needed, only the user's own are loaded.
+            if task_list is None:
+                view_my_tasks(user_username, load_user_tasks(user_username))
+            else:
+                view_my_tasks(user_username, task_list)
 
         elif menu == "vc":
             # Only Administrator can view completed tasks.
@@ -175,6 +256,13 @@ def main():
             else:
                 print("Error: You are not authorized to view completed tasks.")
 
+        elif menu == "qt":
+            # Call the function query_tasks_menu to filter, sort and page
+            # through the tasks.
+            from queries import query_tasks_menu
+
+            query_tasks_menu(task_list)
+
         elif menu == "del":
             # Only Administrator can delete tasks.
             if user_username == "Administrator":
@@ -187,15 +275,68 @@ def main():
             # modify a task.
             modify_task(task_list, user_username)
 
+        elif menu == "bt":
+            # Call the function bulk_tasks_menu to change many tasks at
+            # once, saving the task file only once.
+            from bulk import bulk_tasks_menu
+
+            bulk_tasks_menu(task_list, user_username)
+
+        elif menu == "u":
+            # Call the function undo_last_change to undo the last task
+            # added, modified or deleted in this session.
+            from undo import undo_last_change
+
+            undo_last_change(task_list)
+
+        elif menu == "rd":
+            from undo import redo_last_change
+
+            redo_last_change(task_list)
+
         elif menu == "gr":
-            # Call the function generate_reports to generate the reports.
-            generate_reports(task_list)
+            from reports import start_report_job
+
+            # Generate the reports in the background, so the menu can be
+            # used while they are written.
+            report_job = _get_report_job()
+            if report_job and report_job.is_running():
+                print(report_job.describe())
+            else:
+                start_report_job(task_list)
+                print(
+                    "Generating reports in the background. "
+                    "Enter 'rs' to check on them."
+                )
+
+        elif menu == "rs":
+            report_job = _get_report_job()
+            if report_job:
+                print(report_job.describe())
+            else:
+                print("No reports have been generated in this session.")
 
         elif menu == "ds":
             # Call the function display_statistics to display the statistics.
+            from reports import display_statistics
+
             display_statistics(task_list)
 
+        elif menu == "tr":
+            # Only Administrator can view the statistics history.
+            if user_username == "Administrator":
+                from reports import display_trends
+
+                display_trends()
+            else:
+                print("Error: You are not authorized to view trends.")
+
         elif menu == "e":
+            report_job = _get_report_job()
+            if report_job and report_job.is_running():
+                print("Waiting for the reports to finish...")
+                report_job.wait()
+                print(report_job.describe())
             print("Goodbye!!!")
             exit()
 
@@ -205,5 +346,59 @@ def main():
 
 # --------------------- End of Main Program Loop --------------------- #
 
+
+def _get_report_job():
+    """
+    Returns the background report job, without importing the reports module
+    if no reports were requested yet.
+    """
+    reports = sys.modules.get("reports")
+    return reports.get_report_job() if reports else None
+
+
+def parse_args():
+    """
+    Parses the command line options that start the server or client mode.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Task manager")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--server",
+        action="store_true",
+        help="serve the tasks to clients from one shared in-memory store",
+    )
+    mode.add_argument(
+        "--client",
+        action="store_true",
+        help="use a running task server instead of the local files",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--socket", help="Unix socket path to use instead of host and port"
+    )
+    # Read by the instrumentation module when it is imported, see there.
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print how long the hot paths took when the program exits",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    main()
+    # Without options (the usual case) argparse is not even imported.
+    args = parse_args() if len(sys.argv) > 1 else None
+
+    if args and args.server:
+        from server import serve
+
+        serve(args.host, args.port, args.socket)
+    elif args and args.client:
+        from client import run_client
+
+        run_client(args.host, args.port, args.socket)
+    else:
+        main()
@@ -0,0 +1,237 @@
+import atexit
+import os
+import threading
+import time
+
+"""Purpose: Export operational metrics in the Prometheus text format."""
+
+# Metrics are only kept when this environment variable names the file to
+# write them to, e.g. a .prom file in the node-exporter textfile directory.
+METRICS_FILE_ENV_VAR = "TASK_MANAGER_METRICS_FILE"
+# The file is rewritten after every operation, or at most once per this
+# many seconds if the variable is set, and once more when the program exits.
+METRICS_INTERVAL_ENV_VAR = "TASK_MANAGER_METRICS_INTERVAL"
+METRICS_FILE = os.environ.get(METRICS_FILE_ENV_VAR, "")
+ENABLED = bool(METRICS_FILE)
+PREFIX = "task_manager_"
+
+# The timed operations and what they do.
+OPERATIONS = {
+    "load": "loading the tasks file",
+    "save": "saving the tasks file",
+    "append": "appending a task to the tasks file",
+    "report": "generating the reports",
+}
+# The files whose sizes are exported (TASKS_FILE, USER_FILE and
+# SNAPSHOT_FILE of the data_access, authentication and snapshots modules).
+FILES = ("tasks.txt", "user.txt", "task_history.dat")
+
+_lock = threading.Lock()
+# operation -> [count, total seconds, last seconds]
+_operations = {}
+_gauges = {}
+_counters = {"login_attempts": 0, "login_failures": 0}
+_last_write = float("-inf")
+
+
+def _read_interval():
+    """
+    Returns the minimum number of seconds between two writes of the file.
+    """
+    try:
+        return max(float(os.environ.get(METRICS_INTERVAL_ENV_VAR, 0)), 0.0)
+    except ValueError:
+        return 0.0
+
+
+WRITE_INTERVAL = _read_interval()
+
+
+# ===================== Recording Metrics ===================== #
+def measured(operation):
+    """
+    Decorator that records the duration of every call of a function as the
+    given operation (see OPERATIONS), if metrics are on. If metrics are off
+    the function is returned as it is.
+    """
+    def decorator(function):
+        if not ENABLED:
+            return function
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            record_operation(operation, time.perf_counter() - start)
+            return result
+
+        wrapper.__name__ = function.__name__
+        wrapper.__qualname__ = function.__qualname__
+        wrapper.__doc__ = function.__doc__
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    return decorator
+
+
+def record_operation(operation, seconds):
+    """
+    Adds one run of an operation that took the given number of seconds,
+    and updates the metrics file.
+    """
+    if not ENABLED:
+        return
+    with _lock:
+        stats = _operations.setdefault(operation, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = seconds
+    flush()
+
+
+def set_gauge(name, value):
+    """
+    Sets a gauge, such as "tasks_loaded". The file is updated by the next
+    operation.
+    """
+    if ENABLED:
+        with _lock:
+            _gauges[name] = value
+
+
+def record_login(success):
+    """
+    Counts a login attempt (and a failure if it was not successful), and
+    updates the metrics file.
+    """
+    if not ENABLED:
+        return
+    with _lock:
+        _counters["login_attempts"] += 1
+        if not success:
+            _counters["login_failures"] += 1
+    flush()
+
+
+def reset():
+    """
+    Forgets all recorded metrics.
+    """
+    with _lock:
+        _operations.clear()
+        _gauges.clear()
+        for name in _counters:
+            _counters[name] = 0
+
+
+# ===================== Writing the Metrics File ===================== #
+def _metric(lines, name, metric_type, help_text, samples):
+    """
+    Adds one metric, with its HELP and TYPE lines, to the lines of the
+    file. samples is a list of (name suffix, labels, value) tuples.
+    """
+    lines.append(f"# HELP {PREFIX}{name} {help_text}")
+    lines.append(f"# TYPE {PREFIX}{name} {metric_type}")
+    for suffix, labels, value in samples:
+        lines.append(f"{PREFIX}{name}{suffix}{labels} {value}")
+
+
+def format_metrics():
+    """
+    Returns the metrics in the Prometheus text exposition format.
+    """
+    with _lock:
+        operations = {
+            name: list(stats) for name, stats in _operations.items()
+        }
+        gauges = dict(_gauges)
+        counters = dict(_counters)
+
+    lines = []
+    _metric(
+        lines,
+        "tasks_loaded",
+        "gauge",
+        "Number of tasks read by the last load of the tasks file.",
+        [("", "", gauges.get("tasks_loaded", 0))],
+    )
+    for operation, description in OPERATIONS.items():
+        count, total, last = operations.get(operation, (0, 0.0, 0.0))
+        _metric(
+            lines,
+            f"{operation}_duration_seconds",
+            "summary",
+            f"Time spent {description}.",
+            [("_sum", "", f"{total:.6f}"), ("_count", "", count)],
+        )
+        _metric(
+            lines,
+            f"last_{operation}_duration_seconds",
+            "gauge",
+            f"Time taken by the last run of {description}.",
+            [("", "", f"{last:.6f}")],
+        )
+    _metric(
+        lines,
+        "login_attempts_total",
+        "counter",
+        "Number of login attempts.",
+        [("", "", counters["login_attempts"])],
+    )
+    _metric(
+        lines,
+        "login_failures_total",
+        "counter",
+        "Number of failed login attempts.",
+        [("", "", counters["login_failures"])],
+    )
+    sizes = []
+    for name in FILES:
+        try:
+            sizes.append(("", f'{{file="{name}"}}', os.path.getsize(name)))
+        except OSError:
+            continue
+    _metric(
+        lines, "file_size_bytes", "gauge", "Size of the data files.", sizes
+    )
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path=None):
+    """
+    Writes the metrics file. The metrics go to a temporary file first,
+    which then replaces the file, so a scrape never reads half a file.
+    """
+    global _last_write
+    path = path or METRICS_FILE
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w") as file:
+        file.write(format_metrics())
+    os.replace(temp_path, path)
+    _last_write = time.monotonic()
+
+
+def flush():
+    """
+    Writes the metrics file if metrics are on and the write interval has
+    passed since the last write.
+    """
+    if not ENABLED or time.monotonic() - _last_write < WRITE_INTERVAL:
+        return
+    try:
+        write_metrics()
+    except OSError as e:
+        print(f"Error writing the metrics file: {e}")
+
+
+def _write_at_exit():
+    """
+    Writes the final metrics when the program exits.
+    """
+    try:
+        write_metrics()
+    except OSError as e:
+        print(f"Error writing the metrics file: {e}")
+
+
+if ENABLED:
+    atexit.register(_write_at_exit)
@@ -17,6 +17,9 @@ class Task:
         task_date_added,
         task_due_date,
         task_completion,
+        task_id=None,
+        version=0,
+        parent_id=None,
     ):
         self.username = username
         self.task_title = task_title
@@ -24,6 +27,12 @@ class Task:
         self.task_date_added = task_date_added
         self.task_due_date = task_due_date
         self.task_completion = task_completion
+        # The task_id identifies the task across sessions and the version
+        # counts its saved changes; both are assigned by the task store.
+        self.task_id = task_id
+        self.version = version
+        # The Task ID of the task this is a subtask of, or None.
+        self.parent_id = parent_id
 
     # Method returns a string that represents the a Task object.
     def __str__(self):
@@ -38,3 +47,36 @@ class Task:
             f"Task Due Date: {self.task_due_date}\n"
             f"Task Completion: {self.task_completion}\n"
         )
+
+    def to_dict(self):
+        """
+        Returns the task as a dictionary, e.g. for JSON output.
+        """
+        return {
+            "task_id": self.task_id,
+            "version": self.version,
+            "username": self.username,
+            "task_title": self.task_title,
+            "task_description": self.task_description,
+            "task_date_added": self.task_date_added,
+            "task_due_date": self.task_due_date,
+            "task_completion": self.task_completion,
+            "parent_id": self.parent_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates a Task object from a dictionary made by to_dict().
+        """
+        return cls(
+            data["username"],
+            data["task_title"],
+            data["task_description"],
+            data["task_date_added"],
+            data["task_due_date"],
+            data["task_completion"],
+            task_id=data.get("task_id"),
+            version=data.get("version", 0),
+            parent_id=data.get("parent_id"),
+        )
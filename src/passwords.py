@@ -0,0 +1,145 @@
+import hashlib
+import hmac
+import os
+
+"""Purpose: Hash and verify passwords with a tunable key derivation cost."""
+
+# The key derivation function (KDF) and its work factor can be set per
+# deployment with these environment variables, e.g. a lower cost on slow
+# VMs where logins would otherwise take too long. The cost is the number
+# of iterations for "pbkdf2_sha256" and log2(N) for "scrypt".
+KDF_ENV_VAR = "TASK_MANAGER_KDF"
+COST_ENV_VAR = "TASK_MANAGER_KDF_COST"
+DEFAULT_KDF = "pbkdf2_sha256"
+DEFAULT_COSTS = {"pbkdf2_sha256": 600_000, "scrypt": 15}
+COST_LIMITS = {"pbkdf2_sha256": (1_000, 10_000_000), "scrypt": (10, 20)}
+SALT_SIZE = 16
+SCRYPT_BLOCK_SIZE = 8
+
+# Stored hashes look like "pbkdf2_sha256$600000$<salt hex>$<hash hex>".
+HASH_SEPARATOR = "$"
+
+
+def get_kdf_settings():
+    """
+    Returns the (kdf, cost) pair configured for this deployment.
+
+    Raises:
+        ValueError: If the configured KDF or cost is not supported.
+    """
+    kdf = os.environ.get(KDF_ENV_VAR, DEFAULT_KDF).strip().lower()
+    if kdf not in DEFAULT_COSTS:
+        raise ValueError(
+            f"Unsupported {KDF_ENV_VAR} '{kdf}'. "
+            f"Use one of: {', '.join(DEFAULT_COSTS)}."
+        )
+    cost = os.environ.get(COST_ENV_VAR, "").strip()
+    cost = int(cost) if cost else DEFAULT_COSTS[kdf]
+    low, high = COST_LIMITS[kdf]
+    if not low <= cost <= high:
+        raise ValueError(
+            f"{COST_ENV_VAR} for {kdf} must be between {low} and {high}."
+        )
+    return kdf, cost
+
+
+def _derive(kdf, cost, password, salt):
+    """
+    Derives the password hash bytes with the given KDF and cost.
+    """
+    if kdf == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac(
+            "sha256", password.encode("utf-8"), salt, cost
+        )
+    if kdf == "scrypt":
+        n = 2**cost
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=SCRYPT_BLOCK_SIZE,
+            p=1,
+            # scrypt needs about 128 * r * n bytes; allow some headroom.
+            maxmem=256 * SCRYPT_BLOCK_SIZE * n,
+        )
+    raise ValueError(f"Unsupported key derivation function '{kdf}'.")
+
+
+def hash_password(password, kdf=None, cost=None):
+    """
+    Hashes a password with a new random salt.
+
+    Args:
+        password (str): The plaintext password.
+        kdf (str, optional): The KDF to use. Defaults to the configured one.
+        cost (int, optional): The work factor. Defaults to the configured
+            cost for the KDF.
+
+    Returns:
+        str: The stored form "<kdf>$<cost>$<salt hex>$<hash hex>".
+    """
+    if kdf is None or cost is None:
+        configured_kdf, configured_cost = get_kdf_settings()
+        if kdf is None:
+            kdf = configured_kdf
+        if cost is None:
+            cost = (
+                configured_cost
+                if kdf == configured_kdf
+                else DEFAULT_COSTS[kdf]
+            )
+    salt = os.urandom(SALT_SIZE)
+    digest = _derive(kdf, cost, password, salt)
+    return HASH_SEPARATOR.join([kdf, str(cost), salt.hex(), digest.hex()])
+
+
+def parse_password_hash(stored):
+    """
+    Splits a stored password hash into (kdf, cost, salt, digest).
+
+    Returns:
+        tuple or None: None if the stored value is not a password hash
+        (i.e. it is a legacy plaintext password).
+    """
+    parts = stored.split(HASH_SEPARATOR)
+    if len(parts) != 4 or parts[0] not in DEFAULT_COSTS:
+        return None
+    kdf, cost, salt, digest = parts
+    try:
+        return kdf, int(cost), bytes.fromhex(salt), bytes.fromhex(digest)
+    except ValueError:
+        return None
+
+
+def verify_password(password, stored):
+    """
+    Checks a password against its stored form, which is either a password
+    hash or a legacy plaintext password. Comparisons take constant time.
+
+    Returns:
+        bool: True if the password matches, otherwise False.
+    """
+    parsed = parse_password_hash(stored)
+    if parsed is None:
+        return hmac.compare_digest(
+            password.encode("utf-8"), stored.encode("utf-8")
+        )
+    kdf, cost, salt, digest = parsed
+    return hmac.compare_digest(_derive(kdf, cost, password, salt), digest)
+
+
+def needs_rehash(stored):
+    """
+    Checks if a stored password should be hashed again after a successful
+    login: it is still plaintext, or it was hashed with a different KDF or
+    cost than the one configured now.
+
+    If the configured KDF or cost is not supported, nothing is hashed again
+    (the login itself still succeeds) until the setting is fixed.
+    """
+    try:
+        settings = get_kdf_settings()
+    except ValueError:
+        return False
+    parsed = parse_password_hash(stored)
+    return parsed is None or parsed[:2] != settings
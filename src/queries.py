@@ -0,0 +1,376 @@
+import heapq
+from bisect import bisect_left, insort
+from itertools import chain, count, islice
+
+from instrumentation import timed
+from repository import (
+    derived_data_to_update,
+    drop_derived_data,
+    get_derived_data,
+    reading,
+)
+from services import add_task_listener, print_task_page
+from utilities import parse_date
+
+"""Purpose: Filter, sort and page through tasks using maintained indexes."""
+
+SORT_FIELDS = {
+    "due_date": "task_due_date",
+    "date_added": "task_date_added",
+}
+# The sort key of tasks whose date cannot be parsed, after every valid date.
+UNPARSED_DATE_KEY = float("inf")
+
+
+def _date_key(date_str):
+    """
+    Returns the sort key of a task date: its ordinal, or UNPARSED_DATE_KEY.
+    """
+    parsed = parse_date(date_str)
+    return parsed.toordinal() if parsed else UNPARSED_DATE_KEY
+
+
+def _in_range(key, key_from, key_to):
+    """
+    Checks if a date key is a valid date between the (optional) bounds.
+    """
+    return (
+        key != UNPARSED_DATE_KEY
+        and (key_from is None or key >= key_from)
+        and (key_to is None or key <= key_to)
+    )
+
+
+def _is_completed(task):
+    """
+    Checks if a task is marked as completed.
+    """
+    return task.task_completion.lower() == "yes"
+
+
+# ===================== Task Index ===================== #
+class TaskIndex:
+    """
+    This class keeps the tasks of one task list pre-sorted by due date and
+    by date of assignment, split into buckets per (assignee, completed).
+
+    A query for one assignee and completion status only reads its own
+    bucket, and a due date range is located by binary search, so "the next
+    20 open tasks due for user X" reads about 20 entries. Queries across
+    buckets lazily merge the already sorted buckets.
+
+    The index is updated incrementally by the task listener registered in
+    this module, so it never needs to be rebuilt after capture, modify or
+    delete.
+    """
+    def __init__(self, task_list):
+        self._sequence = count()
+        # sort field -> {(username, completed): sorted [(key, seq, task)]}
+        self._buckets = {field: {} for field in SORT_FIELDS}
+        # id(task) -> {sort field: (bucket key, entry)}
+        self._entries = {}
+        for task in task_list:
+            self.add(task)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, task):
+        """
+        Adds a task to every ordering of the index.
+        """
+        bucket_key = (task.username, _is_completed(task))
+        sequence = next(self._sequence)
+        entries = {}
+        for field, attribute in SORT_FIELDS.items():
+            entry = (_date_key(getattr(task, attribute)), sequence, task)
+            insort(self._buckets[field].setdefault(bucket_key, []), entry)
+            entries[field] = (bucket_key, entry)
+        self._entries[id(task)] = entries
+
+    def remove(self, task):
+        """
+        Removes a task from every ordering of the index.
+        """
+        entries = self._entries.pop(id(task), None)
+        if entries is None:
+            return
+        for field, (bucket_key, entry) in entries.items():
+            bucket = self._buckets[field][bucket_key]
+            del bucket[bisect_left(bucket, entry)]
+            if not bucket:
+                del self._buckets[field][bucket_key]
+
+    def update(self, task):
+        """
+        Moves a changed task to its new position in every ordering.
+        """
+        self.remove(task)
+        self.add(task)
+
+    def iter_sorted(
+        self,
+        sort_by="due_date",
+        assignee=None,
+        completed=None,
+        key_from=None,
+        key_to=None,
+        descending=False,
+    ):
+        """
+        Lazily yields the tasks of the matching buckets in sort order,
+        restricted to sort keys between key_from and key_to (inclusive).
+        Without a range, the tasks with unreadable dates follow last.
+        """
+        runs, unparsed_runs = [], []
+        for (username, is_completed), bucket in self._buckets[
+            sort_by
+        ].items():
+            if assignee is not None and username != assignee:
+                continue
+            if completed is not None and is_completed != completed:
+                continue
+            # Tasks with unreadable dates are at the end of the bucket.
+            # They never match a date range, and come last in either sort
+            # direction (in the order they were added).
+            valid_end = bisect_left(bucket, (UNPARSED_DATE_KEY,))
+            start, end = 0, valid_end
+            if key_from is not None:
+                start = bisect_left(bucket, (key_from,))
+            if key_to is not None:
+                end = bisect_left(bucket, (key_to + 1,))
+            elif key_from is None and valid_end < len(bucket):
+                unparsed_runs.append(
+                    map(bucket.__getitem__, range(valid_end, len(bucket)))
+                )
+            if start >= end:
+                continue
+            positions = (
+                range(end - 1, start - 1, -1)
+                if descending
+                else range(start, end)
+            )
+            runs.append(map(bucket.__getitem__, positions))
+        for _, _, task in chain(
+            heapq.merge(*runs, reverse=descending),
+            heapq.merge(*unparsed_runs),
+        ):
+            yield task
+
+
+# The name the index of a TaskRepository is kept under (see repository.py).
+INDEX_NAME = "query_index"
+
+
+def get_task_index(task_list):
+    """
+    Returns the index of a task list. The index of a TaskRepository is kept
+    on it, built on first use (or again if the list was changed without
+    going through the services functions); a plain list gets a new index.
+    """
+    return get_derived_data(task_list, INDEX_NAME, TaskIndex)
+
+
+def invalidate_task_index(task_list):
+    """
+    Drops the index of a task list, e.g. after it was reloaded from file.
+    """
+    drop_derived_data(task_list, INDEX_NAME)
+
+
+def _on_task_change(task_list, action, task, changes):
+    """
+    Task listener that keeps existing indexes in step with the task list.
+    """
+    if action == "reload":
+        invalidate_task_index(task_list)
+        return
+    index = derived_data_to_update(
+        task_list, INDEX_NAME, action in ("add", "delete")
+    )
+    if index is None:
+        return
+    if action == "add":
+        index.add(task)
+    elif action == "delete":
+        index.remove(task)
+    elif action == "update":
+        index.update(task)
+
+
+add_task_listener(_on_task_change)
+
+
+# ===================== Task Queries ===================== #
+def _match_tasks(
+    task_list,
+    assignee=None,
+    completed=None,
+    due_from=None,
+    due_to=None,
+    title_contains=None,
+    sort_by="due_date",
+    descending=False,
+):
+    """
+    Returns a lazy iterator of the tasks matching all of the given filters
+    (see query_tasks()), in sorted order. It must be used up while holding
+    the read lock of the task list.
+
+    Raises:
+        ValueError: If sort_by is not a supported sort field.
+    """
+    if sort_by not in SORT_FIELDS:
+        raise ValueError(f"Cannot sort tasks by {sort_by}.")
+    index = get_task_index(task_list)
+    due_range = (
+        due_from.toordinal() if due_from else None,
+        due_to.toordinal() if due_to else None,
+    )
+
+    if sort_by == "due_date":
+        # The due date range is applied by binary search in the buckets.
+        matches = index.iter_sorted(
+            sort_by, assignee, completed, *due_range, descending
+        )
+    else:
+        matches = index.iter_sorted(
+            sort_by, assignee, completed, descending=descending
+        )
+        if due_from or due_to:
+            matches = (
+                task
+                for task in matches
+                if _in_range(_date_key(task.task_due_date), *due_range)
+            )
+    if title_contains:
+        text = title_contains.lower()
+        matches = (
+            task for task in matches if text in task.task_title.lower()
+        )
+    return matches
+
+
+@timed
+def query_tasks(
+    task_list,
+    assignee=None,
+    completed=None,
+    due_from=None,
+    due_to=None,
+    title_contains=None,
+    sort_by="due_date",
+    descending=False,
+    limit=None,
+    offset=0,
+):
+    """
+    Returns the tasks matching all of the given filters, sorted and paged.
+
+    Args:
+        task_list (list): A list of Task objects.
+        assignee (str, optional): Only tasks assigned to this username.
+        completed (bool, optional): Only completed (True) or incomplete
+            (False) tasks.
+        due_from (datetime.date, optional): Only tasks due on or after it.
+        due_to (datetime.date, optional): Only tasks due on or before it.
+        title_contains (str, optional): Only tasks whose title contains
+            this text (case-insensitive).
+        sort_by (str, optional): "due_date" (default) or "date_added".
+            Tasks with unreadable dates are sorted last.
+        descending (bool, optional): Sort from the latest date.
+        limit (int, optional): The maximum number of tasks to return.
+        offset (int, optional): The number of matching tasks to skip.
+
+    Returns:
+        list: The matching Task objects.
+
+    Raises:
+        ValueError: If sort_by is not a supported sort field.
+    """
+    # The lazy matching must finish before the lock is released.
+    with reading(task_list):
+        matches = _match_tasks(
+            task_list,
+            assignee,
+            completed,
+            due_from,
+            due_to,
+            title_contains,
+            sort_by,
+            descending,
+        )
+        end = None if limit is None else offset + limit
+        return list(islice(matches, offset, end))
+
+
+@timed
+def query_task_page(task_list, limit, offset=0, **filters):
+    """
+    Returns one page of the tasks matching the filters of query_tasks(),
+    together with the number of all matching tasks (e.g. for "showing 21
+    to 40 of 75"). Both come from the same state of the task list.
+
+    Returns:
+        tuple: (the Task objects on the page, the number of matching
+        tasks).
+
+    Raises:
+        ValueError: If sort_by is not a supported sort field.
+    """
+    with reading(task_list):
+        matches = _match_tasks(task_list, **filters)
+        skipped = sum(1 for _ in islice(matches, offset))
+        page = list(islice(matches, limit))
+        return page, skipped + len(page) + sum(1 for _ in matches)
+
+
+def query_tasks_menu(task_list):
+    """
+    Prompts the user for query filters, sorting and paging, then displays
+    the matching tasks. Pressing Enter skips a filter.
+    """
+    assignee = input("Assigned to (or press Enter for anyone): ").strip()
+    status = input(
+        "Completed? Enter 'y', 'n' or press Enter for both: "
+    ).strip().lower()
+    due_from_text = input("Due on or after (e.g. 01 Jan 2025): ").strip()
+    due_to_text = input("Due on or before (e.g. 31 Dec 2025): ").strip()
+    title_contains = input("Title contains: ").strip()
+    sort_by = input(
+        "Sort by 'd' due date or 'a' date of assignment (default d): "
+    ).strip().lower()
+    descending = input(
+        "Latest first? Enter 'y' or press Enter for earliest first: "
+    ).strip().lower() == "y"
+    try:
+        limit = int(input("Number of tasks to show (default 20): ") or 20)
+        offset = int(input("Number of tasks to skip (default 0): ") or 0)
+    except ValueError:
+        print("Invalid input. Please enter a whole number.")
+        return
+
+    due_from = parse_date(due_from_text) if due_from_text else None
+    due_to = parse_date(due_to_text) if due_to_text else None
+    if (due_from_text and not due_from) or (due_to_text and not due_to):
+        print("Invalid date. Please use the format 01 Jan 2025.")
+        return
+
+    results = query_tasks(
+        task_list,
+        assignee=assignee or None,
+        completed={"y": True, "n": False}.get(status),
+        due_from=due_from,
+        due_to=due_to,
+        title_contains=title_contains or None,
+        sort_by="date_added" if sort_by == "a" else "due_date",
+        descending=descending,
+        limit=max(limit, 0),
+        offset=max(offset, 0),
+    )
+    if not results:
+        print("No tasks match the query.")
+        return
+    # The tasks can come from anywhere in the task list, so they are shown
+    # with their Task IDs rather than looked up by position.
+    print_task_page(results, show_task_ids=True)
@@ -0,0 +1,372 @@
+import heapq
+import itertools
+import os
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from repository import reading
+from services import add_task_listener, remove_task_listener
+from utilities import parse_date
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl, so files are not locked there.
+    fcntl = None
+
+"""Purpose: Remind users of upcoming and missed due dates."""
+
+# Reminders are off unless this environment variable is set. The lead time
+# (how many hours before the start of the due date a reminder is sent)
+# defaults to one day.
+REMINDERS_ENV_VAR = "TASK_MANAGER_REMINDERS"
+LEAD_HOURS_ENV_VAR = "TASK_MANAGER_REMINDER_LEAD_HOURS"
+DEFAULT_LEAD_HOURS = 24
+# Every user has an outbox file in this directory, with one reminder per
+# line. The reminders already sent are listed in SENT_FILE, so a task is
+# only reminded of once per due date, across sessions: the file is read
+# again and appended to under a lock before reminders are sent, so also
+# sessions running at the same time do not send the same reminder.
+OUTBOX_DIR = "outbox"
+SENT_FILE = "sent.txt"
+# The task attributes a reminder depends on.
+REMINDER_FIELDS = {
+    "username",
+    "task_title",
+    "task_due_date",
+    "task_completion",
+}
+
+Reminder = namedtuple(
+    "Reminder", ["remind_at", "username", "task_id", "task_title", "due_date"]
+)
+
+
+def _lead_time_from_env():
+    """
+    Returns the lead time set with the environment variable, or the
+    default lead time.
+    """
+    try:
+        hours = float(os.environ.get(LEAD_HOURS_ENV_VAR, DEFAULT_LEAD_HOURS))
+    except ValueError:
+        hours = DEFAULT_LEAD_HOURS
+    return timedelta(hours=hours)
+
+
+def _outbox_name(username):
+    """
+    Returns the outbox file name of a user, with any character that does
+    not belong in a file name replaced.
+    """
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in username)
+    return f"{safe or '_'}.txt"
+
+
+class ReminderScheduler:
+    """
+    This class sends a reminder for every incomplete task when its due date
+    is near (lead time before the start of the due date), and at once for
+    tasks that are already overdue.
+
+    The reminders wait in a heap ordered by the time they are due, so the
+    next one is always at the top:
+      - the heap is built once from the task list, and after that it is
+        kept up to date by a task listener (see services.py): adding a task
+        or changing its due date pushes a new entry, and completing or
+        deleting a task marks its entry as cancelled, which is skipped when
+        it reaches the top. Each change costs O(log n), and the task list
+        is never scanned again (except when it is reloaded);
+      - sending the due reminders pops them off the top of the heap.
+    start() runs a background thread that sleeps until the next reminder
+    is due (or the heap changes), for long-running sessions and the server.
+    """
+    def __init__(self, task_list, lead_time=None, outbox_dir=OUTBOX_DIR):
+        self.task_list = task_list
+        self.lead_time = (
+            lead_time if lead_time is not None else _lead_time_from_env()
+        )
+        self.outbox_dir = outbox_dir
+        self.sent_path = os.path.join(outbox_dir, SENT_FILE)
+        self.lock_path = self.sent_path + ".lock"
+        self._condition = threading.Condition()
+        self._counter = itertools.count()
+        # [remind_at, order, task or None if cancelled, reminder]
+        self._heap = []
+        # id(task) -> its entry in the heap.
+        self._entries = {}
+        # The number of cancelled entries still in the heap.
+        self._cancelled = 0
+        self._sent = set()
+        # How much of the sent file has been read into self._sent.
+        self._sent_position = 0
+        self._read_sent()
+        self._thread = None
+        self._stopping = False
+        self.rebuild()
+        add_task_listener(self._on_task_change)
+
+    # ===================== Scheduling ===================== #
+    def _read_sent(self):
+        """
+        Adds the (Task ID, due date) pairs reminded of since the sent file
+        was last read, by this or another session, to the sent pairs. Only
+        the new end of the file is read.
+        """
+        try:
+            with open(self.sent_path, "rb") as file:
+                file.seek(self._sent_position)
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    self._sent_position += len(line)
+                    task_id, _, due_date = (
+                        line.decode("utf-8").rstrip("\n").partition(",")
+                    )
+                    self._sent.add((task_id, due_date))
+        except FileNotFoundError:
+            pass
+
+    def _make_entry(self, task):
+        """
+        Returns the heap entry of a task, or None if it needs no reminder
+        (it is complete, has no valid due date or was reminded of already).
+        """
+        if task.task_completion.lower() == "yes":
+            return None
+        due_date = parse_date(task.task_due_date)
+        if due_date is None:
+            return None
+        if (str(task.task_id), task.task_due_date) in self._sent:
+            return None
+        remind_at = (
+            datetime.combine(due_date, datetime.min.time()) - self.lead_time
+        )
+        reminder = Reminder(
+            remind_at,
+            task.username,
+            task.task_id,
+            task.task_title,
+            task.task_due_date,
+        )
+        return [remind_at, next(self._counter), task, reminder]
+
+    def rebuild(self):
+        """
+        Builds the heap from the whole task list.
+        """
+        with reading(self.task_list):
+            entries = [self._make_entry(task) for task in self.task_list]
+        with self._condition:
+            self._heap = [entry for entry in entries if entry]
+            heapq.heapify(self._heap)
+            self._entries = {id(entry[2]): entry for entry in self._heap}
+            self._cancelled = 0
+            self._condition.notify_all()
+
+    def schedule(self, task):
+        """
+        Schedules (or reschedules) the reminder of a task.
+        """
+        entry = self._make_entry(task)
+        with self._condition:
+            self._cancel(task)
+            if entry is None:
+                return
+            self._entries[id(task)] = entry
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                # The background thread may sleep until a later reminder.
+                self._condition.notify_all()
+
+    def cancel(self, task):
+        """
+        Cancels the reminder of a task, if it has one.
+        """
+        with self._condition:
+            self._cancel(task)
+
+    def _cancel(self, task):
+        entry = self._entries.pop(id(task), None)
+        if entry is None:
+            return
+        entry[2] = None
+        self._cancelled += 1
+        # Drop the cancelled entries once they make up half of the heap, so
+        # frequent rescheduling does not make it grow without bound.
+        if self._cancelled * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if e[2] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def _on_task_change(self, task_list, action, task, changes):
+        """
+        Task listener that keeps the heap in step with the task list.
+        """
+        if task_list is not self.task_list:
+            return
+        if action == "add":
+            self.schedule(task)
+        elif action == "update" and REMINDER_FIELDS & set(changes):
+            self.schedule(task)
+        elif action == "delete":
+            self.cancel(task)
+        elif action == "reload":
+            self.rebuild()
+
+    def next_reminder_time(self):
+        """
+        Returns when the next reminder is due, or None if there is none.
+        """
+        with self._condition:
+            self._drop_cancelled()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_cancelled(self):
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    # ===================== Sending Reminders ===================== #
+    @contextmanager
+    def _locked(self):
+        """
+        Holds an exclusive advisory lock on the lock file of the sent file,
+        so sessions send reminders one at a time.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def pop_due(self, now=None):
+        """
+        Takes the reminders that are due by now off the heap.
+
+        Returns:
+            list: The due Reminder objects, earliest first.
+        """
+        now = now or datetime.now()
+        due = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, task, reminder = heapq.heappop(self._heap)
+                if task is None:
+                    self._cancelled -= 1
+                else:
+                    del self._entries[id(task)]
+                    due.append(reminder)
+        return due
+
+    def send_due(self, now=None):
+        """
+        Writes the reminders that are due by now to the outboxes of their
+        users, except those another session sent already.
+
+        Returns:
+            list: The Reminder objects sent.
+        """
+        now = now or datetime.now()
+        reminders = self.pop_due(now)
+        if not reminders:
+            return reminders
+        os.makedirs(self.outbox_dir, exist_ok=True)
+        with self._locked():
+            self._read_sent()
+            reminders = [
+                reminder
+                for reminder in reminders
+                if (str(reminder.task_id), reminder.due_date) not in self._sent
+            ]
+            lines_by_user = {}
+            for reminder in reminders:
+                overdue = parse_date(reminder.due_date) < now.date()
+                lines_by_user.setdefault(reminder.username, []).append(
+                    f"{now:%d %b %Y %H:%M} Reminder: "
+                    f"'{reminder.task_title}' (Task ID {reminder.task_id}) "
+                    f"{'was' if overdue else 'is'} due on "
+                    f"{reminder.due_date}.\n"
+                )
+            for username, lines in lines_by_user.items():
+                path = os.path.join(self.outbox_dir, _outbox_name(username))
+                with open(path, "a") as file:
+                    file.writelines(lines)
+            with open(self.sent_path, "ab") as file:
+                for reminder in reminders:
+                    key = (str(reminder.task_id), reminder.due_date)
+                    self._sent.add(key)
+                    file.write(f"{key[0]},{key[1]}\n".encode("utf-8"))
+                # What was just written is already in the sent pairs.
+                self._sent_position = file.tell()
+        return reminders
+
+    # ===================== Background Thread ===================== #
+    def _run(self):
+        """
+        Sends the reminders as they fall due, until stop() is called.
+        """
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                self._drop_cancelled()
+                if self._heap:
+                    delay = (self._heap[0][0] - datetime.now()).total_seconds()
+                else:
+                    delay = None
+                if delay is None or delay > 0:
+                    self._condition.wait(delay)
+                    continue
+            try:
+                self.send_due()
+            except OSError as e:
+                print(f"Error writing reminders: {e}")
+
+    def start(self):
+        """
+        Starts sending reminders in a background thread.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="reminders", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread and stops following the task list.
+        """
+        remove_task_listener(self._on_task_change)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def start_reminders_if_enabled(task_list):
+    """
+    Starts a ReminderScheduler for the task list if reminders are switched
+    on with the environment variable.
+
+    Returns:
+        ReminderScheduler: The running scheduler, or None.
+    """
+    if not os.environ.get(REMINDERS_ENV_VAR):
+        return None
+    scheduler = ReminderScheduler(task_list)
+    # Send the reminders that are already due before the session goes on,
+    # so short sessions send them too.
+    try:
+        scheduler.send_due()
+    except OSError as e:
+        print(f"Error writing reminders: {e}")
+    scheduler.start()
+    return scheduler
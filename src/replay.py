@@ -0,0 +1,225 @@
+import argparse
+import builtins
+import getpass
+import math
+import os
+import sys
+import time
+from collections import deque
+from contextlib import redirect_stdout
+
+import main as task_manager
+from table_renderer import render_table
+
+"""Purpose: Replay a script of menu selections to measure the menu flow."""
+
+# A replay script has one menu operation per line: the menu option followed
+# by the answers to the prompts it asks, separated by "|". An empty answer
+# (pressing Enter) is written as nothing between two separators. Blank
+# lines and lines starting with "#" are ignored. For example:
+#
+#     a | AliceB | Write report | Monthly report | 31 Dec 2030
+#     mt | 1 | e | | 15 Jan 2031
+#     va
+#
+# The user logs in before the first operation and exits after the last.
+ANSWER_SEPARATOR = "|"
+MENU_PROMPT = "Enter selection"
+USERNAME_ENV_VAR = "TASK_MANAGER_USERNAME"
+PASSWORD_ENV_VAR = "TASK_MANAGER_PASSWORD"
+PERCENTILES = (50, 90, 99)
+
+
+# Both exceptions are raised from inside the menu code, which catches
+# Exception in places, so they derive from BaseException to get through.
+class ReplayError(BaseException):
+    """
+    Raised when the script and the prompts of the application disagree,
+    e.g. an operation has too few or too many answers.
+    """
+
+
+class _ReplayFinished(BaseException):
+    """
+    Raised by the scripted input once the script has been used up.
+    """
+
+
+def parse_script(lines):
+    """
+    Parses the lines of a replay script.
+
+    Returns:
+        list: One [option, answer, ...] list per operation.
+    """
+    operations = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            operations.append(
+                [part.strip() for part in line.split(ANSWER_SEPARATOR)]
+            )
+    return operations
+
+
+class ScriptedInput:
+    """
+    This class stands in for input() and getpass.getpass() and answers the
+    prompts of the application from a replay script.
+
+    An operation starts when its menu option is entered and ends when the
+    menu is shown again, so its latency includes everything the
+    application does for it, apart from waiting for input. The latencies
+    are collected per menu option; the login is timed from entering the
+    password to the first menu.
+    """
+    def __init__(self, username, password, operations):
+        # (operation number, is menu option, answer)
+        self._answers = deque([(0, False, username), (0, False, password)])
+        for number, operation in enumerate(operations, 1):
+            self._answers.append((number, True, operation[0]))
+            for answer in operation[1:]:
+                self._answers.append((number, False, answer))
+        self._operations = operations
+        self._current = None
+        self.latencies = {}
+
+    def _describe(self, number):
+        if number == 0:
+            return "the login"
+        operation = self._operations[number - 1]
+        return f"operation {number} ({' | '.join(operation)})"
+
+    def __call__(self, prompt=""):
+        now = time.perf_counter()
+        is_menu = MENU_PROMPT in prompt
+        if is_menu and self._current is not None:
+            option, started = self._current
+            self.latencies.setdefault(option, []).append(now - started)
+            self._current = None
+        if not self._answers:
+            raise _ReplayFinished()
+
+        number, is_option, answer = self._answers.popleft()
+        if is_menu and not is_option:
+            raise ReplayError(
+                f"The script has unused answers for {self._describe(number)}."
+            )
+        if is_option and not is_menu:
+            raise ReplayError(
+                f"The script has too few answers for "
+                f"{self._describe(number - 1)}, which asked: {prompt.strip()}"
+            )
+        if is_option:
+            self._current = (answer, time.perf_counter())
+        elif number == 0 and self._answers[0][0] != 0:
+            self._current = ("login", time.perf_counter())
+        return answer
+
+
+def run_replay(operations, username, password, repeat=1):
+    """
+    Logs in and runs the operations (repeat times over) through main(),
+    with the application's output discarded.
+
+    Returns:
+        dict: The latencies in seconds, per menu option.
+
+    Raises:
+        ReplayError: If the script does not match the application's prompts.
+    """
+    scripted_input = ScriptedInput(
+        username, password, operations * repeat + [["e"]]
+    )
+    original_input, original_getpass = builtins.input, getpass.getpass
+    builtins.input = getpass.getpass = scripted_input
+    try:
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            task_manager.main()
+    except (SystemExit, _ReplayFinished):
+        pass
+    finally:
+        builtins.input, getpass.getpass = original_input, original_getpass
+    return scripted_input.latencies
+
+
+def percentile(sorted_values, percent):
+    """
+    Returns the nearest-rank percentile of a sorted list of values.
+    """
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def print_latencies(latencies):
+    """
+    Prints the count and latency percentiles (in milliseconds) of every
+    menu option, followed by all operations together.
+    """
+    rows = []
+    everything = []
+    for option, values in sorted(latencies.items()):
+        if option != "login":
+            everything.extend(values)
+        rows.append([option, *_summarise(values)])
+    if everything:
+        rows.append(["all", *_summarise(everything)])
+    render_table(
+        rows,
+        ["Option", "Count"]
+        + [f"p{p} (ms)" for p in PERCENTILES]
+        + ["Max (ms)"],
+    )
+
+
+def _summarise(values):
+    """
+    Returns the count, percentiles and maximum of latencies in seconds, as
+    a table row in milliseconds.
+    """
+    values = sorted(values)
+    return [len(values)] + [
+        f"{value * 1000:.3f}"
+        for value in [percentile(values, p) for p in PERCENTILES] + values[-1:]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a script of menu operations against the task "
+        "and user files of the current directory, and print the latency "
+        "percentiles per menu option."
+    )
+    parser.add_argument("script", help="the replay script to run")
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="run the script this often"
+    )
+    parser.add_argument("--username", default=os.environ.get(USERNAME_ENV_VAR))
+    parser.add_argument("--password", default=os.environ.get(PASSWORD_ENV_VAR))
+    args = parser.parse_args()
+    if not args.username or args.password is None:
+        parser.error(
+            f"use --username and --password, or set {USERNAME_ENV_VAR} and "
+            f"{PASSWORD_ENV_VAR}"
+        )
+
+    with open(args.script, "r") as file:
+        operations = parse_script(file)
+    started = time.perf_counter()
+    try:
+        latencies = run_replay(
+            operations, args.username, args.password, args.repeat
+        )
+    except ReplayError as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    count = sum(len(v) for o, v in latencies.items() if o != "login")
+    print(f"Replayed {count} operations in {elapsed:.2f}s.")
+    print_latencies(latencies)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
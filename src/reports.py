@@ -1,12 +1,42 @@
 import os
-from datetime import date, datetime
-from tabulate import tabulate
+import threading
+import time
+from datetime import date, timedelta
+from authentication import get_user_registry
+from instrumentation import timed
+from metrics import measured
+from table_renderer import render_table
+from repository import take_snapshot
+from snapshots import OVERVIEW_SCOPE, compute_counters, record_counters, trend
 
 """Purpose: Generate reports and statistics based on the tasks."""
 
+USER_OVERVIEW_HEADERS = [
+    "Username",
+    "Tasks Assigned",
+    "% of Total Tasks",
+    "% Completed",
+    "% Incomplete",
+    "% Overdue",
+]
+
 
 # ===================== Reporting Functions ===================== #
-def generate_reports(task_list):
+def get_registered_users():
+    """
+    Returns the usernames from "user.txt" (without duplicates), using the
+    shared user registry so the file is not parsed again for every report.
+    """
+    registry = get_user_registry()
+    users = registry.usernames()
+    if not registry.file_found:
+        print("User file not found.")
+    return users
+
+
+@timed
+@measured("report")
+def generate_reports(task_list, progress=None, output=print):
     """
     Generates two reports:
     1. "task_overview.txt": Contains statistics about tasks.
@@ -39,29 +69,31 @@ def generate_reports(task_list):
          task_list (list): A list of task objects, where each task contains
                           attributes such as `task_completion`,
                           `task_due_date`, and `username`.
+         progress (callable, optional): Called as progress(done, total)
+                          after each step (the task overview, each user and
+                          the statistics snapshot).
+         output (callable, optional): Receives the success and error
+                          messages instead of print().
 
     Returns:
-         None: The function writes the reports to files and prints a success
+         bool: True if both reports were written, otherwise False. The
+         function writes the reports to files and prints a success
          message.
     """
+    # Count the tasks of a snapshot of the task list (in one pass), so the
+    # (slow) report writing neither holds up changes made by other threads
+    # in the meantime nor sees them.
+    today = date.today()
+    tasks = take_snapshot(task_list)
+    try:
+        counters = compute_counters(tasks, today)
+    finally:
+        if tasks is not task_list:
+            tasks.close()
+
     # --- Task Overview ---
-    total_tasks = len(task_list)
-    completed_tasks = sum(
-        1 for task in task_list if task.task_completion.lower() == "yes"
-    )
+    total_tasks, completed_tasks, overdue_tasks = counters[OVERVIEW_SCOPE]
     uncompleted_tasks = total_tasks - completed_tasks
-    today = date.today()
-    overdue_tasks = 0
-    for task in task_list:
-        if task.task_completion.lower() != "yes":
-            try:
-                due_date = datetime.strptime(
-                    task.task_due_date, "%d %b %Y"
-                ).date()
-                if due_date < today:
-                    overdue_tasks += 1
-            except Exception:
-                continue
     pct_incomplete = (
         (uncompleted_tasks / total_tasks * 100) if total_tasks else 0
     )
@@ -81,33 +113,27 @@ def generate_reports(task_list):
             )
             file.write(f"Percentage of tasks overdue: {pct_overdue:.2f}%\n")
     except Exception as e:
-        print(f"Error writing task_overview.txt: {e}")
+        output(f"Error writing task_overview.txt: {e}")
+        succeeded = False
+    else:
+        succeeded = True
 
     # --- User Overview ---
-    users = []
-    try:
-        with open("user.txt", "r") as file:
-            for line in file:
-                line = line.strip()
-                if line:
-                    u, _ = line.split(", ")
-                    if u not in users:
-                        users.append(u)
-    except FileNotFoundError:
-        print("User file not found.")
+    users = get_registered_users()
+    total_steps = len(users) + 2
+    if progress:
+        progress(1, total_steps)
 
     total_users = len(users)
     user_report_lines = []
     user_report_lines.append(f"Total number of users: {total_users}")
     user_report_lines.append(f"Total number of tasks: {total_tasks}\n")
 
-    for u in users:
-        tasks_for_u = [task for task in task_list if task.username == u]
-        num_tasks_for_u = len(tasks_for_u)
-        pct_total = (num_tasks_for_u / total_tasks * 100) if total_tasks else 0
-        completed_for_u = sum(
-            1 for task in tasks_for_u if task.task_completion.lower() == "yes"
+    for step, u in enumerate(users, 2):
+        num_tasks_for_u, completed_for_u, overdue_for_u = counters.get(
+            u, (0, 0, 0)
         )
+        pct_total = (num_tasks_for_u / total_tasks * 100) if total_tasks else 0
         pct_completed = (
             (completed_for_u / num_tasks_for_u * 100) if num_tasks_for_u else 0
         )
@@ -116,17 +142,6 @@ def generate_reports(task_list):
             if num_tasks_for_u
             else 0
         )
-        overdue_for_u = 0
-        for task in tasks_for_u:
-            if task.task_completion.lower() != "yes":
-                try:
-                    due_date = datetime.strptime(
-                        task.task_due_date, "%d %b %Y"
-                    ).date()
-                    if due_date < today:
-                        overdue_for_u += 1
-                except Exception:
-                    continue
         pct_overdue = (
             (overdue_for_u / num_tasks_for_u * 100) if num_tasks_for_u else 0
         )
@@ -142,82 +157,154 @@ def generate_reports(task_list):
             f"  % of tasks incomplete: {pct_incomplete:.2f}%"
         )
         user_report_lines.append(f"  % of tasks overdue: {pct_overdue:.2f}%\n")
+        if progress:
+            progress(step, total_steps)
 
     try:
         with open("user_overview.txt", "w") as file:
             file.write("\n".join(user_report_lines))
     except Exception as e:
-        print(f"Error writing user_overview.txt: {e}")
+        output(f"Error writing user_overview.txt: {e}")
+        succeeded = False
 
-    print("Reports generated successfully.")
+    # Keep a daily history of the counters for trend queries, since the
+    # overview files above are overwritten on every run.
+    try:
+        record_counters(counters, today)
+    except Exception as e:
+        output(f"Error recording statistics snapshot: {e}")
+    if progress:
+        progress(total_steps, total_steps)
 
+    if succeeded:
+        output("Reports generated successfully.")
+    return succeeded
 
-def display_statistics(task_list):
+
+# ===================== Background Report Generation ===================== #
+class ReportJob:
     """
-    Displays task and user statistics in a tabular format.
-    This function ensures that the necessary report files exist
-    by generating them if they are missing. It then computes and displays
-    two tables: one for task overview statistics and another for user
-    overview statistics. The tables are formatted using the `tabulate`
-    library for better readability.
+    This class generates the reports in a worker thread, so the menu stays
+    responsive while large task lists are processed.
 
-    Generates the reports first if they do not already exist.
+    A snapshot of the tasks is taken when the job is created (without
+    copying them, see repository.TaskSnapshot), so the reports describe the
+    task list at the moment they were requested, and later changes neither
+    wait for the job nor appear in its reports. The status is one
+    of "running", "done" or "failed", and messages holds the output of
+    generate_reports().
+    """
+    def __init__(self, task_list):
+        self.status = "running"
+        self.messages = []
+        self.steps_done = 0
+        self.total_steps = 0
+        self.started = time.monotonic()
+        self.finished = None
+        self._tasks = take_snapshot(task_list)
+        self._thread = threading.Thread(
+            target=self._run, name="report-job"
+        )
+        self._thread.start()
 
-    Ensures that the report files exist (by calling generate_reports
-    if needed) and then recomputes the statistics, displaying
-    two user‑friendly tables (one for task overview and one
-    for user overview) using tabulate.
+    def _progress(self, done, total):
+        self.steps_done, self.total_steps = done, total
 
-    Task Overview Statistics:
-    - Total number of tasks.
-    - Number of completed tasks.
-    - Number of uncompleted tasks.
-    - Number of overdue tasks.
-    - Percentage of incomplete tasks.
-    - Percentage of overdue tasks.
+    def _run(self):
+        try:
+            succeeded = generate_reports(
+                self._tasks, self._progress, self.messages.append
+            )
+        except Exception as e:
+            self.messages.append(f"Error generating reports: {e}")
+            succeeded = False
+        finally:
+            self._tasks.close()
+        self.finished = time.monotonic()
+        self.status = "done" if succeeded else "failed"
 
-    User Overview Statistics:
-    - Username.
-    - Number of tasks assigned to each user.
-    - Percentage of total tasks assigned to each user.
-    - Percentage of tasks completed by each user.
-    - Percentage of tasks incomplete for each user.
-    - Percentage of tasks overdue for each user.
+    def is_running(self):
+        """
+        Checks if the reports are still being generated.
+        """
+        return self.status == "running"
+
+    def wait(self, timeout=None):
+        """
+        Waits for the job to finish (or for the timeout in seconds).
+
+        Returns:
+            bool: True if the job has finished.
+        """
+        self._thread.join(timeout)
+        return not self.is_running()
+
+    def describe(self):
+        """
+        Returns a one-line description of the job's status and progress.
+        """
+        if self.is_running():
+            if not self.total_steps:
+                return "Generating reports: starting..."
+            percent = self.steps_done / self.total_steps * 100
+            return (
+                f"Generating reports: {percent:.0f}% "
+                f"({self.steps_done} of {self.total_steps} steps)"
+            )
+        elapsed = self.finished - self.started
+        if self.status == "done":
+            return f"Reports generated successfully in {elapsed:.1f}s."
+        return "Report generation failed: " + "; ".join(
+            message for message in self.messages if message.startswith("Error")
+        )
+
+
+# The most recent background report job, if any.
+_report_job = None
+
+
+def start_report_job(task_list):
+    """
+    Starts generating the reports in the background, unless a report job is
+    already running.
+
+    Returns:
+        ReportJob: The new job, or the one that is still running.
+    """
+    global _report_job
+    if _report_job is None or not _report_job.is_running():
+        _report_job = ReportJob(task_list)
+    return _report_job
+
+
+def get_report_job():
+    """
+    Returns the most recent background report job, or None.
+    """
+    return _report_job
+
+
+@timed
+def compute_statistics(task_list):
+    """
+    Computes the task overview and user overview statistics shown by
+    display_statistics(), in a single pass over the task list.
 
     Args:
-        task_list (list): A list of task objects, where each task contains
-                          details such as username, task completion status,
-                          and due date.
+        task_list (list): A list of task objects.
 
-    Raises:
-        FileNotFoundError: If the user file (`user.txt`) is not found,
-            a message is printed, and the user overview statistics
-            are skipped.
+    Returns:
+        tuple: (task_overview_data, user_overview_data), where the first is
+        a list of [metric, value] rows and the second has one row per user
+        with the columns in USER_OVERVIEW_HEADERS.
     """
-    # Ensure reports exist by generating them.
-    if not os.path.exists("task_overview.txt") or not os.path.exists(
-        "user_overview.txt"
-    ):
-        generate_reports(task_list)
+    # A snapshot, so changes do not wait for the counting.
+    with take_snapshot(task_list) as tasks:
+        counters = compute_counters(tasks)
 
     # --- Task Overview Statistics ---
-    total_tasks = len(task_list)
-    completed_tasks = sum(
-        1 for task in task_list if task.task_completion.lower() == "yes"
-    )
+    total_tasks, completed_tasks, overdue_tasks = counters[OVERVIEW_SCOPE]
     uncompleted_tasks = total_tasks - completed_tasks
-    today = date.today()
-    overdue_tasks = 0
-    for task in task_list:
-        if task.task_completion.lower() != "yes":
-            try:
-                due_date = datetime.strptime(
-                    task.task_due_date, "%d %b %Y"
-                ).date()
-                if due_date < today:
-                    overdue_tasks += 1
-            except Exception:
-                continue
     pct_incomplete = (
         (uncompleted_tasks / total_tasks * 100) if total_tasks else 0
     )
@@ -233,27 +320,12 @@ def display_statistics(task_list):
     ]
 
     # --- User Overview Statistics ---
-    users = []
-    try:
-        with open("user.txt", "r") as file:
-            for line in file:
-                line = line.strip()
-                if line:
-                    u, _ = line.split(", ")
-                    if u not in users:
-                        users.append(u)
-    except FileNotFoundError:
-        print("User file not found.")
-        users = []
-
     user_overview_data = []
-    for u in users:
-        tasks_for_u = [task for task in task_list if task.username == u]
-        num_tasks_for_u = len(tasks_for_u)
-        pct_total = (num_tasks_for_u / total_tasks * 100) if total_tasks else 0
-        completed_for_u = sum(
-            1 for task in tasks_for_u if task.task_completion.lower() == "yes"
+    for u in get_registered_users():
+        num_tasks_for_u, completed_for_u, overdue_for_u = counters.get(
+            u, (0, 0, 0)
         )
+        pct_total = (num_tasks_for_u / total_tasks * 100) if total_tasks else 0
         pct_completed = (
             (completed_for_u / num_tasks_for_u * 100) if num_tasks_for_u else 0
         )
@@ -262,17 +334,6 @@ def display_statistics(task_list):
             if num_tasks_for_u
             else 0
         )
-        overdue_for_u = 0
-        for task in tasks_for_u:
-            if task.task_completion.lower() != "yes":
-                try:
-                    due_date = datetime.strptime(
-                        task.task_due_date, "%d %b %Y"
-                    ).date()
-                    if due_date < today:
-                        overdue_for_u += 1
-                except Exception:
-                    continue
         pct_overdue_u = (
             (overdue_for_u / num_tasks_for_u * 100) if num_tasks_for_u else 0
         )
@@ -286,23 +347,104 @@ def display_statistics(task_list):
                 f"{pct_overdue_u:.2f}%",
             ]
         )
+    return task_overview_data, user_overview_data
+
+
+@timed
+def display_statistics(task_list):
+    """
+    Displays task and user statistics in a tabular format.
+    This function ensures that the necessary report files exist
+    by generating them if they are missing. It then computes and displays
+    two tables: one for task overview statistics and another for user
+    overview statistics. The tables are formatted using the built-in
+    table renderer for better readability.
+
+    Generates the reports first if they do not already exist.
+
+    Ensures that the report files exist (by calling generate_reports
+    if needed) and then recomputes the statistics, displaying
+    two user‑friendly tables (one for task overview and one
+    for user overview) using the built-in table renderer.
+
+    Task Overview Statistics:
+    - Total number of tasks.
+    - Number of completed tasks.
+    - Number of uncompleted tasks.
+    - Number of overdue tasks.
+    - Percentage of incomplete tasks.
+    - Percentage of overdue tasks.
+
+    User Overview Statistics:
+    - Username.
+    - Number of tasks assigned to each user.
+    - Percentage of total tasks assigned to each user.
+    - Percentage of tasks completed by each user.
+    - Percentage of tasks incomplete for each user.
+    - Percentage of tasks overdue for each user.
+
+    Args:
+        task_list (list): A list of task objects, where each task contains
+                          details such as username, task completion status,
+                          and due date.
+
+    Raises:
+        FileNotFoundError: If the user file (`user.txt`) is not found,
+            a message is printed, and the user overview statistics
+            are skipped.
+    """
+    # Ensure reports exist by generating them.
+    if not os.path.exists("task_overview.txt") or not os.path.exists(
+        "user_overview.txt"
+    ):
+        generate_reports(task_list)
+
+    task_overview_data, user_overview_data = compute_statistics(task_list)
 
     # Display the tables.
     print("\nTASK OVERVIEW REPORT:")
-    print(
-        tabulate(
-            task_overview_data,
-            headers=["Metric", "Value"],
-            tablefmt="fancy_grid",
-        )
-    )
+    render_table(task_overview_data, ["Metric", "Value"])
     print("\nUSER OVERVIEW REPORT:")
-    headers = [
-        "Username",
-        "Tasks Assigned",
-        "% of Total Tasks",
-        "% Completed",
-        "% Incomplete",
-        "% Overdue",
+    render_table(user_overview_data, USER_OVERVIEW_HEADERS)
+
+
+def display_trends(days=365):
+    """
+    Displays how the completion and overdue percentages changed over time,
+    using the daily snapshots recorded whenever reports are generated.
+
+    Prompts for a username (or Enter for the overview of all tasks) and a
+    period ("day", "week" or "month"), then prints one row per period for
+    the last `days` days.
+
+    Args:
+        days (int, optional): How far back to look. Defaults to 365.
+    """
+    scope = input(
+        "Enter a username (or press Enter for all tasks): "
+    ).strip() or OVERVIEW_SCOPE
+    period = input(
+        "Enter the period - day, week or month (default week): "
+    ).strip().lower() or "week"
+    if period not in ("day", "week", "month"):
+        print("Invalid period. Please enter day, week or month.")
+        return
+
+    start = date.today() - timedelta(days=days)
+    completion = trend("completion_pct", start, scope=scope, period=period)
+    overdue = dict(trend("overdue_pct", start, scope=scope, period=period))
+    if not completion:
+        print("No statistics history has been recorded yet.")
+        return
+
+    trend_data = [
+        [
+            period_start.strftime("%d %b %Y"),
+            f"{value:.2f}%",
+            f"{overdue[period_start]:.2f}%",
+        ]
+        for period_start, value in completion
     ]
-    print(tabulate(user_overview_data, headers=headers, tablefmt="fancy_grid"))
+    title = "ALL TASKS" if scope == OVERVIEW_SCOPE else scope
+    print(f"\nSTATISTICS TREND ({title}, per {period}):")
+    render_table(trend_data, ["Period Starting", "% Completed", "% Overdue"])
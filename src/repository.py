@@ -0,0 +1,389 @@
+import threading
+import weakref
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+from operator import attrgetter
+
+"""Purpose: Share one task list safely between threads."""
+
+# The attributes of a Task, as kept by task snapshots.
+TASK_ATTRIBUTES = [
+    "username",
+    "task_title",
+    "task_description",
+    "task_date_added",
+    "task_due_date",
+    "task_completion",
+    "task_id",
+    "version",
+    "parent_id",
+]
+# How many tasks a snapshot reader copies at a time. Writers wait for at
+# most one such copy (see TaskSnapshot).
+SNAPSHOT_CHUNK_SIZE = 1024
+
+TaskView = namedtuple("TaskView", TASK_ATTRIBUTES)
+_get_task_attributes = attrgetter(*TASK_ATTRIBUTES)
+
+
+def view_task(task):
+    """
+    Returns a TaskView: a read-only copy of the attributes of a task.
+    """
+    return TaskView._make(_get_task_attributes(task))
+
+
+# ===================== Reader/Writer Lock ===================== #
+class ReadWriteLock:
+    """
+    This class is a lock that any number of threads can hold for reading at
+    the same time, while a thread holding it for writing has it to itself.
+
+    Waiting writers go before new readers, so a steady stream of reads
+    cannot hold back a write forever. Both sides can be taken again by the
+    thread that holds them, and a writer can also read. A reader cannot
+    become a writer without releasing its read lock first.
+    """
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        # Per thread: how deep it holds the read lock, and whether it is
+        # counted in self._readers (it is not when it is also the writer).
+        self._local = threading.local()
+
+    def acquire_read(self):
+        """
+        Waits until no thread is writing or waiting to write, then holds
+        the lock for reading.
+        """
+        depth = getattr(self._local, "depth", 0)
+        if depth:
+            self._local.depth = depth + 1
+            return
+        me = threading.get_ident()
+        with self._condition:
+            counted = self._writer != me
+            if counted:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+                self._readers += 1
+        self._local.depth = 1
+        self._local.counted = counted
+
+    def release_read(self):
+        """
+        Releases one hold of the read lock.
+        """
+        self._local.depth -= 1
+        if self._local.depth or not self._local.counted:
+            return
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Waits until no other thread is reading or writing, then holds the
+        lock for writing.
+
+        Raises:
+            RuntimeError: If the calling thread holds the read lock.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if getattr(self._local, "depth", 0):
+                raise RuntimeError(
+                    "Cannot write while holding the read lock."
+                )
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self):
+        """
+        Releases one hold of the write lock.
+        """
+        with self._condition:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """
+        Holds the read lock for the duration of a with block.
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """
+        Holds the write lock for the duration of a with block.
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+# ===================== Task Repository ===================== #
+class TaskRepository(list):
+    """
+    This class is the task list shared by the interactive menu and any
+    background work (autosave, report refresh, the task server).
+
+    It is a normal list of Task objects, so every function that takes a
+    task list accepts it, plus a reader/writer lock. The services functions
+    take the write lock to add, change, remove and save tasks, and the
+    views, queries and reports take the read lock, so reads run in parallel
+    and never see a half-applied change.
+
+    Other modules can keep data derived from the tasks on the repository
+    (e.g. the query index, see get_derived_data()), so it goes away with
+    the task list. The repository counts the times tasks are added, removed
+    or reordered, so such data can tell if it missed a change.
+    """
+    def __init__(self, tasks=()):
+        super().__init__(tasks)
+        self.lock = ReadWriteLock()
+        self.list_changes = 0
+        # name -> [list_changes the data is in step with, data]
+        self._derived = {}
+        # The open snapshots, and the lock between their readers and the
+        # writers that preserve what the snapshots need (see TaskSnapshot).
+        self._snapshots = weakref.WeakSet()
+        self._snapshot_lock = threading.Lock()
+
+    def snapshot(self):
+        """
+        Returns a TaskSnapshot of the tasks as they are now, in O(1).
+        """
+        with self.lock.read_locked():
+            snapshot = TaskSnapshot(self, self)
+            with self._snapshot_lock:
+                self._snapshots.add(snapshot)
+        return snapshot
+
+    def before_task_change(self, task):
+        """
+        Called by writers (holding the write lock) before they change the
+        attributes of a task: the open snapshots keep a copy of its current
+        attributes, unless they have one already.
+        """
+        if not self._snapshots:
+            return
+        with self._snapshot_lock:
+            for snapshot in self._snapshots:
+                snapshot._preserve_task(task)
+
+    def before_list_change(self):
+        """
+        Called by writers (holding the write lock) before they add, remove
+        or reorder tasks: the open snapshots keep the current order of the
+        tasks, unless they have it already.
+        """
+        self.list_changes += 1
+        if not self._snapshots:
+            return
+        with self._snapshot_lock:
+            for snapshot in self._snapshots:
+                snapshot._preserve_order()
+
+    def _close_snapshot(self, snapshot):
+        with self._snapshot_lock:
+            self._snapshots.discard(snapshot)
+
+
+class TaskSnapshot:
+    """
+    This class is a point-in-time view of a task list, for reports and
+    other long reads that should neither hold up writers nor see their
+    changes half-way through.
+
+    Taking a snapshot copies nothing. Instead, the writers copy on write:
+      - before the first change to the attributes of a task after the
+        snapshot was taken, the snapshot is given a TaskView of the task's
+        current attributes;
+      - before the first task is added or removed, the snapshot is given a
+        copy of the list of tasks (only the references, not the tasks).
+    A snapshot costs nothing while the task list does not change, and each
+    change costs the writer at most one small copy per open snapshot.
+
+    Iterating the snapshot yields a TaskView for every task, as it was when
+    the snapshot was taken. The views are made a chunk at a time while
+    holding the snapshot lock, which writers also take to preserve a task,
+    so a view is never made of a task in the middle of a change. Because
+    the views are copies, they can be kept (e.g. grouped by user) while the
+    tasks go on changing.
+
+    Close the snapshot (or use it in a with block) when done, so writers
+    stop preserving tasks for it; an unreferenced snapshot is closed too.
+    """
+    def __init__(self, tasks, repository=None):
+        self._repository = repository
+        # The tasks in snapshot order: the live list of the repository until
+        # it changes (or the TaskViews of a plain list).
+        self._tasks = tasks
+        self._length = len(tasks)
+        # id(task) -> TaskView of the task before it was changed.
+        self._originals = {}
+
+    def _preserve_task(self, task):
+        if id(task) not in self._originals:
+            self._originals[id(task)] = view_task(task)
+
+    def _preserve_order(self):
+        if self._tasks is self._repository:
+            self._tasks = list(self._tasks)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        if self._repository is None:
+            yield from self._tasks
+            return
+        lock = self._repository._snapshot_lock
+        originals = self._originals
+        for start in range(0, self._length, SNAPSHOT_CHUNK_SIZE):
+            with lock:
+                chunk = [
+                    originals.get(id(task)) or view_task(task)
+                    for task in self._tasks[start:start + SNAPSHOT_CHUNK_SIZE]
+                ]
+            yield from chunk
+
+    def close(self):
+        """
+        Stops the writers preserving tasks for this snapshot, which should
+        not be used after that.
+        """
+        if self._repository is not None:
+            self._repository._close_snapshot(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def reading(task_list):
+    """
+    Returns a context manager that holds the read lock of a TaskRepository.
+    Plain lists have no lock, so nothing is held for them.
+    """
+    if isinstance(task_list, TaskRepository):
+        return task_list.lock.read_locked()
+    return nullcontext()
+
+
+def writing(task_list):
+    """
+    Returns a context manager that holds the write lock of a
+    TaskRepository. Plain lists have no lock, so nothing is held for them.
+    """
+    if isinstance(task_list, TaskRepository):
+        return task_list.lock.write_locked()
+    return nullcontext()
+
+
+def take_snapshot(task_list):
+    """
+    Returns a TaskSnapshot of a task list (a TaskRepository, a plain list
+    or a TaskSnapshot, which is returned as it is). A plain list does not
+    tell its snapshots about changes, so its tasks are viewed at once.
+    """
+    if isinstance(task_list, TaskSnapshot):
+        return task_list
+    if isinstance(task_list, TaskRepository):
+        return task_list.snapshot()
+    return TaskSnapshot([view_task(task) for task in task_list])
+
+
+def before_task_change(task_list, task):
+    """
+    Lets the snapshots of a TaskRepository preserve a task before it is
+    changed. Plain lists have no snapshots, so nothing is done for them.
+    """
+    if isinstance(task_list, TaskRepository):
+        task_list.before_task_change(task)
+
+
+def before_list_change(task_list):
+    """
+    Lets the snapshots of a TaskRepository preserve the order of the tasks
+    before tasks are added or removed. Plain lists have no snapshots, so
+    nothing is done for them.
+    """
+    if isinstance(task_list, TaskRepository):
+        task_list.before_list_change()
+
+
+def get_derived_data(task_list, name, build):
+    """
+    Returns the data of the given name that a module keeps in step with a
+    TaskRepository (e.g. the query index), calling build(task_list) to make
+    it on first use, or again if it missed a change (see
+    derived_data_to_update()). A plain list cannot tell when it changes, so
+    its data is made anew on every call.
+    """
+    if not isinstance(task_list, TaskRepository):
+        return build(task_list)
+    entry = task_list._derived.get(name)
+    if entry is None or entry[0] != task_list.list_changes:
+        entry = [task_list.list_changes, build(task_list)]
+        task_list._derived[name] = entry
+    return entry[1]
+
+
+def derived_data_to_update(task_list, name, list_changed):
+    """
+    Returns the data of the given name kept for a TaskRepository, for a
+    task listener to update after one change (list_changed is True if a
+    task was added or removed), or None if there is nothing to update.
+
+    Data that missed a change of the list (tasks added or removed without
+    a task listener being told) is dropped instead, so it is made again on
+    next use.
+    """
+    if not isinstance(task_list, TaskRepository):
+        return None
+    entry = task_list._derived.get(name)
+    if entry is None:
+        return None
+    # The change being reported was counted already, and several tasks
+    # removed at once count as one change.
+    missed = task_list.list_changes - entry[0] - bool(list_changed)
+    if missed > 0:
+        del task_list._derived[name]
+        return None
+    entry[0] = task_list.list_changes
+    return entry[1]
+
+
+def drop_derived_data(task_list, name):
+    """
+    Drops the data of the given name kept for a TaskRepository, e.g. after
+    the task list was reloaded, so it is made again on next use.
+    """
+    if isinstance(task_list, TaskRepository):
+        task_list._derived.pop(name, None)
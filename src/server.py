@@ -0,0 +1,317 @@
+import asyncio
+import json
+from datetime import date
+from functools import partial
+
+from authentication import check_credentials
+from change_feed import start_change_feed_if_enabled
+from data_access import append_task, load_tasks
+from models import Task
+from queries import query_task_page
+from reminders import start_reminders_if_enabled
+from reports import compute_statistics, generate_reports
+from repository import TaskRepository, writing
+from services import (
+    add_task,
+    add_task_listener,
+    persist_tasks,
+    remove_task,
+    remove_task_listener,
+    update_task,
+)
+from utilities import parse_date, validate_single_line
+
+"""Purpose: Serve one shared in-memory task store to many CLI clients."""
+
+# Clients and the server exchange one JSON object per line. Every request
+# has an "op" (see TaskServer.OPERATIONS) and every response has "ok", plus
+# either the result fields or an "error" message.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+ADMIN_USERNAME = "Administrator"
+MAX_PAGE_SIZE = 1000
+
+
+class TaskServer:
+    """
+    This class owns the single in-memory task list shared by all clients.
+
+    The task list is loaded once at start-up. Requests from all connections
+    are read on one asyncio event loop, and anything that can block is
+    moved off the loop so other clients are not held up:
+      - password checks and file writes run in the default thread pool;
+      - queries, reports and statistics run in the thread pool under the
+        read lock of the task repository (see repository.py), so several
+        can run at once and never see a half-applied change;
+      - changes to the task list run in the thread pool too, as they wait
+        for its write lock.
+    Changes are applied one at a time (under an asyncio lock) and saved
+    with the same functions the interactive CLI uses.
+    """
+    OPERATIONS = (
+        "login",
+        "add",
+        "list",
+        "complete",
+        "edit",
+        "delete",
+        "report",
+        "statistics",
+    )
+
+    def __init__(self, task_list=None, registry=None):
+        if task_list is None:
+            task_list = TaskRepository(load_tasks())
+        self.task_list = task_list
+        self.registry = registry
+        self._tasks_by_id = {task.task_id: task for task in self.task_list}
+        self._write_lock = asyncio.Lock()
+        add_task_listener(self._on_task_change)
+
+    def close(self):
+        """
+        Stops following the changes of the task list.
+        """
+        remove_task_listener(self._on_task_change)
+
+    def _on_task_change(self, task_list, action, task, changes):
+        """
+        Task listener that keeps the Task ID lookup table up to date.
+        """
+        if task_list is not self.task_list:
+            return
+        if action == "add":
+            self._tasks_by_id[task.task_id] = task
+        elif action == "delete":
+            self._tasks_by_id.pop(task.task_id, None)
+        elif action == "reload":
+            self._tasks_by_id = {t.task_id: t for t in self.task_list}
+
+    # ===================== Connection Handling ===================== #
+    async def handle_client(self, reader, writer):
+        """
+        Serves the requests of one client connection until it disconnects.
+        """
+        session = {"username": None}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_request(session, line)
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, session, line):
+        """
+        Decodes one request line and runs its operation.
+
+        Returns:
+            dict: The response, with "ok" set to False and an "error"
+            message if the request failed.
+        """
+        try:
+            request = json.loads(line)
+            operation = request.get("op")
+            if operation not in self.OPERATIONS:
+                raise ValueError(f"Unknown operation: {operation}")
+            if operation != "login" and session["username"] is None:
+                raise PermissionError("Please log in first.")
+            handler = getattr(self, f"_op_{operation}")
+            result = await handler(session, request)
+            return {"ok": True, **result}
+        except KeyError as e:
+            return {"ok": False, "error": f"Missing request field: {e}"}
+        except (ValueError, PermissionError) as e:
+            return {"ok": False, "error": str(e)}
+        except OSError as e:
+            return {"ok": False, "error": f"Error saving tasks: {e}"}
+        except Exception as e:
+            return {"ok": False, "error": f"Internal server error: {e}"}
+
+    async def _run_in_thread(self, function, *args, **kwargs):
+        """
+        Runs a blocking function in the thread pool of the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(function, *args, **kwargs)
+        )
+
+    def _update_and_save(self, task, **changes):
+        """
+        Changes a task and saves the task list (run in the thread pool).
+        """
+        update_task(self.task_list, task, **changes)
+        persist_tasks(self.task_list)
+
+    def _remove_and_save(self, task):
+        """
+        Removes a task and saves the task list (run in the thread pool).
+        """
+        with writing(self.task_list):
+            remove_task(self.task_list, self.task_list.index(task))
+        persist_tasks(self.task_list)
+
+    def _get_text(self, request, field):
+        """
+        Returns a text field of the request, stripped, after checking that
+        it fits on one line of the tasks file (see validate_single_line()).
+        """
+        return validate_single_line(request[field], field).strip()
+
+    def _get_task(self, request):
+        """
+        Looks up the task with the Task ID given in the request.
+        """
+        task = self._tasks_by_id.get(int(request["task_id"]))
+        if task is None:
+            raise ValueError(f"There is no task {request['task_id']}.")
+        return task
+
+    def _require_admin(self, session):
+        """
+        Rejects the request unless the Administrator is logged in.
+        """
+        if session["username"] != ADMIN_USERNAME:
+            raise PermissionError("Only the Administrator can do this.")
+
+    # ===================== Operations ===================== #
+    async def _op_login(self, session, request):
+        username = request["username"]
+        if not await self._run_in_thread(
+            check_credentials, username, request["password"], self.registry
+        ):
+            raise PermissionError("Invalid username or password.")
+        session["username"] = username
+        return {"username": username}
+
+    async def _op_add(self, session, request):
+        task = Task(
+            self._get_text(request, "assigned_to"),
+            self._get_text(request, "title"),
+            self._get_text(request, "description"),
+            date.today().strftime("%d %b %Y"),
+            self._get_text(request, "due_date"),
+            "No",
+        )
+        async with self._write_lock:
+            await self._run_in_thread(append_task, task)
+            await self._run_in_thread(add_task, self.task_list, task)
+        return {"task": task.to_dict()}
+
+    async def _op_list(self, session, request):
+        dates = {}
+        for field in ("due_from", "due_to"):
+            if request.get(field):
+                dates[field] = parse_date(request[field])
+                if dates[field] is None:
+                    raise ValueError(f"Invalid date: {request[field]}")
+        limit = min(int(request.get("limit", 20)), MAX_PAGE_SIZE)
+        tasks, total = await self._run_in_thread(
+            query_task_page,
+            self.task_list,
+            max(limit, 0),
+            max(int(request.get("offset", 0)), 0),
+            assignee=request.get("assignee"),
+            completed=request.get("completed"),
+            title_contains=request.get("title_contains"),
+            sort_by=request.get("sort_by", "due_date"),
+            descending=bool(request.get("descending")),
+            **dates,
+        )
+        # "total" is the number of matching tasks, for paging through them.
+        return {"tasks": [task.to_dict() for task in tasks], "total": total}
+
+    def _get_own_open_task(self, session, request):
+        """
+        Looks up a task the user may change: one of their own tasks that is
+        not completed yet (the same rule as modify_task()).
+        """
+        task = self._get_task(request)
+        if task.username != session["username"]:
+            raise PermissionError("Task does not belong to you.")
+        if task.task_completion.lower() == "yes":
+            raise ValueError("Task is already marked as complete.")
+        return task
+
+    async def _op_complete(self, session, request):
+        async with self._write_lock:
+            task = self._get_own_open_task(session, request)
+            await self._run_in_thread(
+                self._update_and_save, task, task_completion="Yes"
+            )
+        return {"task": task.to_dict()}
+
+    async def _op_edit(self, session, request):
+        changes = {}
+        if request.get("username"):
+            changes["username"] = self._get_text(request, "username")
+        if request.get("due_date"):
+            changes["task_due_date"] = self._get_text(request, "due_date")
+        async with self._write_lock:
+            task = self._get_own_open_task(session, request)
+            await self._run_in_thread(self._update_and_save, task, **changes)
+        return {"task": task.to_dict()}
+
+    async def _op_delete(self, session, request):
+        self._require_admin(session)
+        async with self._write_lock:
+            task = self._get_task(request)
+            await self._run_in_thread(self._remove_and_save, task)
+        return {"task": task.to_dict()}
+
+    async def _op_report(self, session, request):
+        self._require_admin(session)
+        await self._run_in_thread(generate_reports, self.task_list)
+        return {}
+
+    async def _op_statistics(self, session, request):
+        task_overview, user_overview = await self._run_in_thread(
+            compute_statistics, self.task_list
+        )
+        return {"task_overview": task_overview, "user_overview": user_overview}
+
+
+async def start_server(
+    task_server, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None
+):
+    """
+    Starts listening for clients on a Unix socket (if socket_path is given)
+    or on a TCP host and port.
+
+    Returns:
+        asyncio.Server: The running server.
+    """
+    if socket_path:
+        return await asyncio.start_unix_server(
+            task_server.handle_client, path=socket_path
+        )
+    return await asyncio.start_server(task_server.handle_client, host, port)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+    """
+    Loads the tasks once and serves them to clients until interrupted.
+    """
+    async def run():
+        task_server = TaskServer()
+        start_reminders_if_enabled(task_server.task_list)
+        start_change_feed_if_enabled()
+        server = await start_server(task_server, host, port, socket_path)
+        address = socket_path or f"{host}:{port}"
+        print(
+            f"Task server listening on {address} "
+            f"with {len(task_server.task_list)} tasks."
+        )
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("Task server stopped.")
@@ -11,14 +11,203 @@ from models import Task     # Absolute import of Task class from models
 from datetime import date
 
 from data_access import save_tasks   # Absolute import of save_tasks function
+from data_access import append_task
+from instrumentation import timed
+from repository import (
+    before_list_change,
+    before_task_change,
+    reading,
+    writing,
+)
+from table_renderer import render_table
 
 """Business logic: adding, modifying, viewing, and deleting tasks."""
 
 """Purpose: Encapsulate the core task management functions."""
 
+# The number of tasks shown per page by view_all_tasks().
+TASKS_PER_PAGE = 20
+# Longer titles and descriptions are truncated in task tables.
+TITLE_WIDTH = 30
+DESCRIPTION_WIDTH = 50
+
+
+# ===================== Task Change Listeners ===================== #
+# Functions that keep derived data (such as query indexes) in step with the
+# task list. Every listener is called as listener(task_list, action, task,
+# changes) after a task is added ("add"), updated ("update") or removed
+# ("delete"); for updates, changes maps each changed attribute to its
+# (old, new) values, and for removals changes holds the index the task was
+# removed from as {"index": (index, None)} (so the removal can be undone,
+# see undo.py). After saving changed the task list in other ways (merged in
+# changes from other sessions, or gave new tasks their Task IDs), listeners
+# are called once with the "reload" action and no task. Listeners run while
+# the task list's write lock is held (see repository.py).
+_task_listeners = []
+
+
+def add_task_listener(listener):
+    """
+    Registers a function to be called after every task change.
+    """
+    if listener not in _task_listeners:
+        _task_listeners.append(listener)
+
+
+def remove_task_listener(listener):
+    """
+    Unregisters a function added with add_task_listener().
+    """
+    if listener in _task_listeners:
+        _task_listeners.remove(listener)
+
+
+def _notify_task_listeners(task_list, action, task, changes=None):
+    """
+    Calls every registered listener for one task change.
+    """
+    for listener in list(_task_listeners):
+        listener(task_list, action, task, changes or {})
+
+
+@timed
+def add_task(task_list, task, index=None):
+    """
+    Appends a task to the task list (or inserts it at the given index) and
+    notifies the task listeners.
+    """
+    with writing(task_list):
+        before_list_change(task_list)
+        if index is None:
+            task_list.append(task)
+        else:
+            task_list.insert(index, task)
+        _notify_task_listeners(task_list, "add", task)
+
+
+@timed
+def update_task(task_list, task, **changes):
+    """
+    Sets the given attributes of a task and notifies the task listeners.
+    Attributes that already have the requested value are left alone.
+
+    Returns:
+        dict: The changed attributes mapped to their (old, new) values.
+    """
+    changed = {}
+    with writing(task_list):
+        for attribute, value in changes.items():
+            old_value = getattr(task, attribute)
+            if old_value != value:
+                if not changed:
+                    before_task_change(task_list, task)
+                changed[attribute] = (old_value, value)
+                setattr(task, attribute, value)
+        if changed:
+            _notify_task_listeners(task_list, "update", task, changed)
+    return changed
+
+
+@timed
+def remove_task(task_list, index):
+    """
+    Removes the task at the given index of the task list and notifies the
+    task listeners.
+
+    Returns:
+        Task: The removed task.
+    """
+    with writing(task_list):
+        before_list_change(task_list)
+        task = task_list.pop(index)
+        _notify_task_listeners(
+            task_list, "delete", task, {"index": (index, None)}
+        )
+    return task
+
+
+@timed
+def remove_tasks(task_list, tasks):
+    """
+    Removes several tasks from the task list in one pass (instead of one
+    remove_task() call per task) and notifies the task listeners.
+
+    Returns:
+        list: The removed tasks.
+    """
+    targets = {id(task) for task in tasks}
+    with writing(task_list):
+        removed = [
+            (index, task)
+            for index, task in enumerate(task_list)
+            if id(task) in targets
+        ]
+        if removed:
+            before_list_change(task_list)
+            task_list[:] = [
+                task for task in task_list if id(task) not in targets
+            ]
+            # The indexes are reported as if the tasks were removed one by
+            # one from the front, so re-inserting them in reverse order
+            # restores the list.
+            for count, (index, task) in enumerate(removed):
+                _notify_task_listeners(
+                    task_list, "delete", task, {"index": (index - count, None)}
+                )
+    return [task for _, task in removed]
+
+
+@timed
+def persist_tasks(task_list):
+    """
+    Saves the task list to the tasks.txt file with save_tasks(). If changes
+    saved by other sessions were merged into the task list, or new tasks
+    got their Task IDs, the task listeners are told to reload.
+
+    Raises:
+        OSError: If the file cannot be written (see save_tasks()).
+        ValueError: If local changes were discarded because other sessions
+        changed the same tasks first. The rest of the task list is saved.
+
+    The write lock of the task list is only held while the tasks are
+    changed by saving, not while the file is written (see
+    TaskStore.save()), so do not call it while holding the write lock.
+    """
+    reload, conflicts = save_tasks(task_list)
+    if reload:
+        with writing(task_list):
+            _notify_task_listeners(task_list, "reload", None)
+    if len(conflicts) == 1:
+        raise ValueError(
+            f"Task '{conflicts[0].task_title}' was changed by another "
+            "session, so your change to it was not saved."
+        )
+    if conflicts:
+        titles = ", ".join(f"'{task.task_title}'" for task in conflicts)
+        raise ValueError(
+            f"Tasks {titles} were changed by another session, so your "
+            "changes to them were not saved."
+        )
+
+
+def save_changes(task_list):
+    """
+    Saves the task list for the menu functions with persist_tasks(),
+    printing the reason if the changes could not be saved.
+
+    Returns:
+        bool: True if the changes were saved, otherwise False.
+    """
+    try:
+        persist_tasks(task_list)
+    except (OSError, ValueError) as e:
+        print(f"Error saving tasks: {e}")
+        return False
+    return True
+
 
 # ===================== Task Management Functions ===================== #
-def capture_task(task_list):
+def capture_task(task_list, parent_id=None):
     """
     This function allows a user to capture data about a new task,
     create a Task object with the provided data, append the object to
@@ -33,6 +222,8 @@ def capture_task(task_list):
     Parameters:
         task_list (list): A list to which the newly created Task object
         will be appended.
+        parent_id (int, optional): The Task ID of the task the new task is
+        a subtask of (see subtasks.py).
 
     Functionality:
         - Prompts the user to input the username of the assignee, task title,
@@ -41,7 +232,8 @@ def capture_task(task_list):
         - Sets the task completion status to "No" by default.
         - Creates a Task object with the provided and generated data.
         - Appends the Task object to the provided task_list.
-        - Writes the task details to the tasks.txt file in an append mode.
+        - Appends the task details to the tasks.txt file with
+          append_task(), which assigns the Task ID.
 
     Exceptions:
         - ValueError: Raised if invalid input is provided. This ensures
@@ -76,22 +268,16 @@ def capture_task(task_list):
             task_date_added,
             task_due_date,
             task_completion,
+            parent_id=parent_id,
         )
 
+        # Append the new task data to the task.txt file, which also gives
+        # the task its Task ID.
+        append_task(new_task)
+
         # Append the new Task object to the task_list.
-        task_list.append(new_task)
+        add_task(task_list, new_task)
         print("Task has been successfully added.")
-
-        # Append the new task data to the task.txt file.
-        with open("tasks.txt", "a") as file:
-            file.write(
-                f"\nAssigned to: {username},\n"
-                f"Task Title: {task_title},\n"
-                f"Description: {task_description},\n"
-                f"Date of Assignment: {task_date_added},\n"
-                f"Task Due Date: {task_due_date},\n"
-                f"Task Completion: {task_completion}\n"
-            )
         print(
             "Task file has been successfully updated "
             "(added) to the "
@@ -109,17 +295,95 @@ def capture_task(task_list):
         )
 
 
-def view_all_tasks(task_list):
+@timed
+def get_task_page(task_list, page_number, page_size=TASKS_PER_PAGE):
+    """
+    Returns the tasks on one page of the task list, without touching the
+    tasks on any other page.
+
+    Args:
+        task_list (list): A list of Task objects.
+        page_number (int): The 1-based page number. Values outside the
+            valid range are clamped to the first / last page.
+        page_size (int, optional): The number of tasks per page.
+
+    Returns:
+        tuple: (page_number, total_pages, first_task_number, page_tasks),
+        where first_task_number is the 1-based number of the first task on
+        the page.
+    """
+    with reading(task_list):
+        total_pages = max(1, -(-len(task_list) // page_size))
+        page_number = min(max(page_number, 1), total_pages)
+        start = (page_number - 1) * page_size
+        return (
+            page_number,
+            total_pages,
+            start + 1,
+            task_list[start:start + page_size],
+        )
+
+
+@timed
+def print_task_page(page_tasks, first_task_number=1, show_task_ids=False):
     """
-    Displays all tasks in a tabular format using the `tabulate` module or
-    as plain text if the module is not installed.
+    Prints one page of tasks in a table with the fancy_grid look. Only the
+    tasks passed in are formatted, and long titles and descriptions are
+    truncated so every row stays on one line.
+
+    Args:
+        page_tasks (list): The Task objects on the page.
+        first_task_number (int, optional): The task number shown for the
+            first task, so numbering continues across pages.
+        show_task_ids (bool, optional): Show the Task ID of each task
+            instead of a task number, e.g. for tasks picked from anywhere
+            in the task list.
+    """
+    if show_task_ids:
+        task_numbers = [task.task_id for task in page_tasks]
+    else:
+        task_numbers = range(
+            first_task_number, first_task_number + len(page_tasks)
+        )
+    # Create a list of lists containing the details of each task.
+    header_line = [
+        "Task ID" if show_task_ids else "Task No.",
+        "Assigned to",
+        "Task Title",
+        "Description",
+        "Date of Assignment",
+        "Task Due Date",
+        "Task Completion",
+    ]
+    task_data = [
+        [
+            i,
+            task.username,
+            task.task_title,
+            task.task_description,
+            task.task_date_added,
+            task.task_due_date,
+            task.task_completion,
+        ]
+        for i, task in zip(task_numbers, page_tasks)
+    ]
+
+    # Print the table using the built-in table renderer.
+    render_table(
+        task_data,
+        header_line,
+        max_widths={2: TITLE_WIDTH, 3: DESCRIPTION_WIDTH},
+    )
+
 
-    This function will iterate over the task_list and
-    print the details of the tasks returned from the __str__
-    function. Optional: I have organised the data in a tabular format
-    by using Python’s tabulate module - chose fancy_grid tablefmt.
+def view_all_tasks(task_list, page_size=TASKS_PER_PAGE):
+    """
+    Displays all tasks one page at a time, in a tabular format with the
+    fancy_grid look, using the built-in table renderer.
 
-    Each task is displayed with a corresponding number for easy reference.
+    Only the tasks on the current page are formatted, so the time to show
+    the first page does not depend on how many tasks exist. Each task is
+    displayed with its number in the whole list for easy reference.
 
     Args:
         task_list (list): A list of task objects. Each task object is
@@ -132,62 +396,46 @@ def view_all_tasks(task_list):
             - task_due_date (str): The due date of the task.
             - task_completion (str): The completion status of the task. This
               indicates whether the task is completed or not.
+        page_size (int, optional): The number of tasks shown per page.
 
     Behaviour:
         - If the `task_list` is empty, a message is displayed indicating
           that there are no tasks to show.
-        - If the `tabulate` module is installed, tasks are displayed
-          in a tabular format with the "fancy_grid" style.
-        - If the `tabulate` module is not installed, tasks are displayed as
-          plain text with each task separated by a line.
-
-    Raises:
-        ImportError: If the `tabulate` module is not installed and the user
-        attempts to view tasks in a tabular format.
+        - If there is more than one page, the user is prompted to enter
+          'n' (next page), 'p' (previous page), a page number to jump to,
+          or any other key to return to the menu.
     """
     if not task_list:
         print("There are no tasks to display in the list.")
         return
 
-    try:
-        from tabulate import tabulate
-
-        # Create a list of lists containing the details of each task.
-        header_line = [
-            "Task No.",
-            "Assigned to",
-            "Task Title",
-            "Description",
-            "Date of Assignment",
-            "Task Due Date",
-            "Task Completion",
-        ]
-        task_data = [
-            [
-                i + 1,
-                task.username,
-                task.task_title,
-                task.task_description,
-                task.task_date_added,
-                task.task_due_date,
-                task.task_completion,
-            ]
-            for i, task in enumerate(task_list)
-        ]
-
-        # Print the table using the tabulate module.
-        print(tabulate(task_data, headers=header_line, tablefmt="fancy_grid"))
-
-    except ImportError:
-        print(
-            "Error: Please install the tabulate module to view the tasks in a "
-            "tabular format."
+    page_number = 1
+    while True:
+        page_number, total_pages, first_task_number, page_tasks = (
+            get_task_page(task_list, page_number, page_size)
         )
-        for i, task in enumerate(task_list, 1):
-            print(f"Task {i}:\n{task}\n")
-            print("-" * 80)
+        print_task_page(page_tasks, first_task_number)
+        if total_pages == 1:
+            return
+
+        print(f"Page {page_number} of {total_pages}")
+        choice = input(
+            "Enter 'n' for the next page, 'p' for the previous page, "
+            "a page number to jump to, or any other key to return: "
+        ).strip().lower()
+        if choice == "n" and page_number < total_pages:
+            page_number += 1
+        elif choice == "p" and page_number > 1:
+            page_number -= 1
+        elif choice.isdigit() and 1 <= int(choice) <= total_pages:
+            page_number = int(choice)
+        elif choice in ("n", "p") or choice.isdigit():
+            print("There is no such page.")
+        else:
+            return
 
 
+@timed
 def view_my_tasks(current_user, task_list):
     """
     Displays tasks assigned to the current user in an easy-to-read format.
@@ -203,7 +451,10 @@ def view_my_tasks(current_user, task_list):
     """
 
     # Filter the tasks assigned to the current user.
-    user_tasks = [task for task in task_list if task.username == current_user]
+    with reading(task_list):
+        user_tasks = [
+            task for task in task_list if task.username == current_user
+        ]
 
     if not user_tasks:
         print("There are no tasks assigned to you.")
@@ -221,6 +472,7 @@ def view_my_tasks(current_user, task_list):
         print("-" * 80)
 
 
+@timed
 def view_completed_tasks(task_list):
     """
     Displays a list of tasks that have been marked as completed.
@@ -243,9 +495,12 @@ def view_completed_tasks(task_list):
     Note:
         This function is intended to be used by the Administrator only.
     """
-    completed_tasks = [
-        task for task in task_list if task.task_completion.lower() == "yes"
-    ]
+    with reading(task_list):
+        completed_tasks = [
+            task
+            for task in task_list
+            if task.task_completion.lower() == "yes"
+        ]
 
     if not completed_tasks:
         print("There are no completed tasks.")
@@ -301,22 +556,13 @@ def delete_task(task_list):
         if task_num < 1 or task_num > len(task_list):
             print("Invalid task number.")
             return
-        deleted_task = task_list.pop(task_num - 1)
-        print(f"Task '{deleted_task.task_title}' deleted successfully.")
-
-        # Rewrite the task.txt file with the updated task list.
-        with open("tasks.txt", "w") as file:
-            for task in task_list:
-                file.write(
-                    f"Assigned to: {task.username},\n"
-                    f"Task Title: {task.task_title},\n"
-                    f"Description: {task.task_description},\n"
-                    f"Date of Assignment: {task.task_date_added},\n"
-                    f"Task Due Date: {task.task_due_date},\n"
-                    f"Task Completion: {task.task_completion}\n"
-                )
+        deleted_task = remove_task(task_list, task_num - 1)
     except ValueError:
         print("Invalid input. Please enter a valid task number.")
+        return
+    # Rewrite the task.txt file with the updated task list.
+    if save_changes(task_list):
+        print(f"Task '{deleted_task.task_title}' deleted successfully.")
 
 
 def modify_task(task_list, current_user):
@@ -363,11 +609,12 @@ def modify_task(task_list, current_user):
 
     # Filter tasks assigned to the current user with their original index.
     # Prompts the current user to choose a task (by number) to modify.
-    user_tasks = [
-        (i, task)
-        for i, task in enumerate(task_list)
-        if task.username == current_user
-    ]
+    with reading(task_list):
+        user_tasks = [
+            (i, task)
+            for i, task in enumerate(task_list)
+            if task.username == current_user
+        ]
     if not user_tasks:
         print("You have no tasks to modify.")
         return
@@ -406,9 +653,9 @@ def modify_task(task_list, current_user):
         if selected_task.task_completion.lower() == "yes":
             print("Task is already marked as complete.")
         else:
-            selected_task.task_completion = "Yes"
-            save_tasks(task_list)
-            print("Task marked as complete.")
+            update_task(task_list, selected_task, task_completion="Yes")
+            if save_changes(task_list):
+                print("Task marked as complete.")
     elif choice == "e":
         if selected_task.task_completion.lower() == "yes":
             print("Completed tasks cannot be edited.")
@@ -421,11 +668,13 @@ def modify_task(task_list, current_user):
                 f"Enter new due date (or press Enter to keep "
                 f"'{selected_task.task_due_date}'): "
             ).strip()
+            changes = {}
             if new_assigned:
-                selected_task.username = new_assigned
+                changes["username"] = new_assigned
             if new_due_date:
-                selected_task.task_due_date = new_due_date
-            save_tasks(task_list)
-            print("Task updated successfully.")
+                changes["task_due_date"] = new_due_date
+            update_task(task_list, selected_task, **changes)
+            if save_changes(task_list):
+                print("Task updated successfully.")
     else:
         print("No changes made.")
@@ -0,0 +1,307 @@
+import os
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+"""Purpose: Keep a compact daily history of task statistics for trends."""
+
+# The snapshot store is a flat file of fixed-width rows. Every day that
+# reports run, one row is written for the overview (scope "*") and one row
+# for every user with tasks. Rows are appended in date order, so a trend
+# query can binary search the file for the start of its date range and only
+# read the rows that fall inside it.
+SNAPSHOT_FILE = "task_history.dat"
+OVERVIEW_SCOPE = "*"
+
+DATE_WIDTH = 10
+SCOPE_WIDTH = 20
+COUNT_WIDTH = 10
+# date, scope, total, completed, overdue - separated by spaces - plus "\n".
+RECORD_SIZE = DATE_WIDTH + SCOPE_WIDTH + 3 * COUNT_WIDTH + 4 + 1
+
+Snapshot = namedtuple(
+    "Snapshot", ["day", "scope", "total", "completed", "overdue"]
+)
+
+
+# ===================== Recording Snapshots ===================== #
+def compute_counters(task_list, today=None):
+    """
+    Computes the total, completed and overdue task counters for the
+    overview and for every user, in a single pass over the task list.
+
+    Args:
+        task_list (list): A list of Task objects.
+        today (datetime.date, optional): The date used to decide if a task
+            is overdue. Defaults to the current date.
+
+    Returns:
+        dict: Maps the scope (OVERVIEW_SCOPE or a username) to a list of
+        [total, completed, overdue] counters.
+    """
+    today = today or date.today()
+    counters = {OVERVIEW_SCOPE: [0, 0, 0]}
+    for task in task_list:
+        user_counters = counters.setdefault(task.username, [0, 0, 0])
+        completed = task.task_completion.lower() == "yes"
+        overdue = False
+        if not completed:
+            try:
+                due_date = datetime.strptime(
+                    task.task_due_date, "%d %b %Y"
+                ).date()
+                overdue = due_date < today
+            except Exception:
+                pass
+        for scope_counters in (counters[OVERVIEW_SCOPE], user_counters):
+            scope_counters[0] += 1
+            scope_counters[1] += completed
+            scope_counters[2] += overdue
+    return counters
+
+
+def _fit_scope(scope):
+    """
+    Returns the scope as stored in the scope column: cut to the longest
+    start of it that is at most SCOPE_WIDTH bytes in UTF-8, without cutting
+    a character in half. Valid usernames are at most 20 characters long,
+    so only legacy entries and names with non-ASCII characters are cut.
+    """
+    encoded = scope.encode("utf-8")[:SCOPE_WIDTH]
+    return encoded.decode("utf-8", "ignore")
+
+
+def _format_record(day, scope, total, completed, overdue):
+    """
+    Formats one snapshot row with fixed-width columns. The columns are
+    padded in bytes, so every row is RECORD_SIZE bytes long whatever
+    characters the scope has.
+    """
+    scope_column = _fit_scope(scope).encode("utf-8").ljust(SCOPE_WIDTH)
+    return (
+        day.isoformat().encode("ascii")
+        + b" "
+        + scope_column
+        + (
+            f" {total:>{COUNT_WIDTH}} {completed:>{COUNT_WIDTH}} "
+            f"{overdue:>{COUNT_WIDTH}}\n"
+        ).encode("ascii")
+    )
+
+
+def _parse_record(record):
+    """
+    Parses one fixed-width snapshot row into a Snapshot tuple.
+    """
+    scope_start = DATE_WIDTH + 1
+    counts_start = scope_start + SCOPE_WIDTH + 1
+    total, completed, overdue = (int(v) for v in record[counts_start:].split())
+    return Snapshot(
+        date.fromisoformat(record[:DATE_WIDTH].decode("ascii")),
+        record[scope_start:scope_start + SCOPE_WIDTH].decode("utf-8").rstrip(),
+        total,
+        completed,
+        overdue,
+    )
+
+
+def _read_day(file, index):
+    """
+    Reads only the date column of the record at the given index.
+    """
+    file.seek(index * RECORD_SIZE)
+    return date.fromisoformat(file.read(DATE_WIDTH).decode("utf-8"))
+
+
+def _first_index_on_or_after(file, record_count, day):
+    """
+    Binary searches the (date ordered) snapshot file for the index of the
+    first record dated on or after the given day.
+    """
+    low, high = 0, record_count
+    while low < high:
+        middle = (low + high) // 2
+        if _read_day(file, middle) < day:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def record_snapshot(task_list, day=None, path=SNAPSHOT_FILE):
+    """
+    Appends today's overview and per-user counters to the snapshot store.
+
+    If a snapshot for the same day already exists, it is replaced so that
+    the store keeps exactly one set of rows per day. Snapshots must be
+    recorded in date order.
+
+    Args:
+        task_list (list): A list of Task objects.
+        day (datetime.date, optional): The day of the snapshot. Defaults
+            to the current date.
+        path (str, optional): The snapshot file. Defaults to SNAPSHOT_FILE.
+
+    Raises:
+        ValueError: If the day is older than the newest stored snapshot.
+    """
+    day = day or date.today()
+    record_counters(compute_counters(task_list, day), day, path)
+
+
+def record_counters(counters, day, path=SNAPSHOT_FILE):
+    """
+    Stores counters made by compute_counters() as the snapshot of a day,
+    like record_snapshot() does, for callers that computed them already.
+
+    Raises:
+        ValueError: If the day is older than the newest stored snapshot.
+    """
+    rows = [_format_record(day, OVERVIEW_SCOPE, *counters[OVERVIEW_SCOPE])]
+    for scope in sorted(s for s in counters if s != OVERVIEW_SCOPE):
+        rows.append(_format_record(day, scope, *counters[scope]))
+
+    mode = "r+b" if os.path.exists(path) else "w+b"
+    with open(path, mode) as file:
+        record_count = file.seek(0, os.SEEK_END) // RECORD_SIZE
+        offset = record_count * RECORD_SIZE
+        if record_count:
+            last_day = _read_day(file, record_count - 1)
+            if day < last_day:
+                raise ValueError(
+                    f"Cannot record a snapshot for {day} after {last_day}."
+                )
+            if day == last_day:
+                offset = (
+                    _first_index_on_or_after(file, record_count, day)
+                    * RECORD_SIZE
+                )
+        file.seek(offset)
+        file.truncate()
+        file.write(b"".join(rows))
+
+
+def record_snapshot_if_due(task_list, day=None, path=SNAPSHOT_FILE):
+    """
+    Records a snapshot only if none exists yet for the given day. This is
+    the scheduled entry point: it is cheap to call at every start-up since
+    it only reads the last record of the store.
+
+    Returns:
+        bool: True if a new snapshot was written, otherwise False.
+    """
+    day = day or date.today()
+    try:
+        with open(path, "rb") as file:
+            record_count = file.seek(0, os.SEEK_END) // RECORD_SIZE
+            if record_count and _read_day(file, record_count - 1) >= day:
+                return False
+    except FileNotFoundError:
+        pass
+    record_snapshot(task_list, day, path)
+    return True
+
+
+# ===================== Trend Queries ===================== #
+def iter_snapshots(start=None, end=None, scope=None, path=SNAPSHOT_FILE):
+    """
+    Yields the snapshots recorded between start and end (both inclusive),
+    optionally restricted to one scope. Only the records inside the date
+    range are read.
+
+    Args:
+        start (datetime.date, optional): The first day to include.
+        end (datetime.date, optional): The last day to include.
+        scope (str, optional): OVERVIEW_SCOPE or a username.
+        path (str, optional): The snapshot file. Defaults to SNAPSHOT_FILE.
+
+    Yields:
+        Snapshot: The matching snapshot rows in date order.
+    """
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with file:
+        record_count = file.seek(0, os.SEEK_END) // RECORD_SIZE
+        index = (
+            _first_index_on_or_after(file, record_count, start)
+            if start
+            else 0
+        )
+        file.seek(index * RECORD_SIZE)
+        while index < record_count:
+            snapshot = _parse_record(file.read(RECORD_SIZE))
+            index += 1
+            if end and snapshot.day > end:
+                break
+            if scope is None or snapshot.scope == _fit_scope(scope):
+                yield snapshot
+
+
+def _period_start(day, period):
+    """
+    Returns the first day of the day / week (Monday) / month containing the
+    given day.
+    """
+    if period == "day":
+        return day
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown period: {period}")
+
+
+def snapshot_metric(snapshot, metric):
+    """
+    Returns a counter or percentage from a snapshot. Supported metrics are
+    "total", "completed", "overdue", "completion_pct", "incomplete_pct" and
+    "overdue_pct".
+    """
+    if metric in ("total", "completed", "overdue"):
+        return getattr(snapshot, metric)
+    total = snapshot.total
+    if metric == "completion_pct":
+        return (snapshot.completed / total * 100) if total else 0
+    if metric == "incomplete_pct":
+        return ((total - snapshot.completed) / total * 100) if total else 0
+    if metric == "overdue_pct":
+        return (snapshot.overdue / total * 100) if total else 0
+    raise ValueError(f"Unknown metric: {metric}")
+
+
+def trend(
+    metric,
+    start=None,
+    end=None,
+    scope=OVERVIEW_SCOPE,
+    period="day",
+    path=SNAPSHOT_FILE,
+):
+    """
+    Answers trend queries such as "overdue % per week for the last year" or
+    "user X completion rate over time" from the snapshot store.
+
+    The counters are point-in-time values, so every period reports the
+    metric from the last snapshot recorded inside it.
+
+    Args:
+        metric (str): See snapshot_metric() for the supported metrics.
+        start (datetime.date, optional): The first day to include.
+        end (datetime.date, optional): The last day to include.
+        scope (str, optional): OVERVIEW_SCOPE (default) or a username.
+        period (str, optional): "day" (default), "week" or "month".
+        path (str, optional): The snapshot file. Defaults to SNAPSHOT_FILE.
+
+    Returns:
+        list: (period start date, metric value) pairs in date order.
+    """
+    points = []
+    for snapshot in iter_snapshots(start, end, scope, path):
+        period_start = _period_start(snapshot.day, period)
+        value = snapshot_metric(snapshot, metric)
+        if points and points[-1][0] == period_start:
+            points[-1] = (period_start, value)
+        else:
+            points.append((period_start, value))
+    return points
@@ -0,0 +1,324 @@
+from datetime import date
+
+from repository import (
+    derived_data_to_update,
+    drop_derived_data,
+    get_derived_data,
+    reading,
+)
+from services import add_task_listener, capture_task
+from table_renderer import render_table
+from utilities import parse_date
+
+"""Purpose: Keep the roll-up progress of tasks broken into subtasks."""
+
+# The name the tree of a task list is kept under (see repository.py).
+TREE_NAME = "task_tree"
+# The task attributes the status of a task (completed, overdue) depends on.
+STATUS_FIELDS = {"task_completion", "task_due_date"}
+TREE_HEADERS = [
+    "Task ID",
+    "Task Title",
+    "Assigned to",
+    "Completed",
+    "Subtasks",
+    "% Completed",
+    "Overdue",
+]
+
+
+def _task_status(task, today):
+    """
+    Returns (completed, overdue) of a task, each 1 or 0.
+    """
+    if task.task_completion.lower() == "yes":
+        return 1, 0
+    due_date = parse_date(task.task_due_date)
+    return 0, int(due_date is not None and due_date < today)
+
+
+class TaskTree:
+    """
+    This class keeps the subtasks of every task (the tasks whose parent_id
+    is its Task ID) and, for every task with subtasks, a roll-up of the
+    total, completed and overdue tasks among all of its subtasks, their
+    subtasks, and so on.
+
+    The roll-ups are built once from the task list, and after that they are
+    kept up to date by a task listener (see services.py): adding, changing
+    or removing a task adds or subtracts its counters (and those of its own
+    subtasks) from the roll-ups of its parent and the parent's ancestors
+    only. A change therefore costs O(depth of the task), and showing the
+    progress of a project costs O(1) however many subtasks it has.
+
+    A task whose parent is not in the task list (e.g. it was deleted)
+    counts as a top-level task. Whether a task is overdue depends on the
+    date, so the roll-ups are rebuilt on the first use on a new day. The
+    tree of a task list is kept on it (see get_task_tree()), and is built
+    again after the task list is reloaded or its tasks got new Task IDs.
+    """
+    def __init__(self, task_list):
+        self.task_list = task_list
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Builds the subtasks and roll-ups from the whole task list.
+        """
+        self.today = date.today()
+        with reading(self.task_list):
+            tasks = list(self.task_list)
+        self._tasks_by_id = {task.task_id: task for task in tasks}
+        # Task ID -> {id(subtask): subtask} of its direct subtasks.
+        self._subtasks = {}
+        # Task ID -> [total, completed, overdue] of all its subtasks.
+        self._rollups = {}
+        # id(task) -> its (completed, overdue) as counted in the roll-ups.
+        self._status = {}
+        for task in tasks:
+            status = self._status[id(task)] = _task_status(task, self.today)
+            self._link(task, task.parent_id)
+            # Each task counts for all of its ancestors (the subtasks of
+            # the task are counted when they are linked themselves).
+            self._add_to_ancestors(task, task.parent_id, (1, *status))
+
+    # ===================== Incremental Updates ===================== #
+    def _ancestor_ids(self, task, parent_id):
+        """
+        Yields the Task IDs of the ancestors of a task with the given
+        parent, up to the first one that is not in the task list.
+        """
+        seen = {task.task_id}
+        while parent_id is not None and parent_id not in seen:
+            seen.add(parent_id)
+            yield parent_id
+            parent = self._tasks_by_id.get(parent_id)
+            if parent is None:
+                return
+            parent_id = parent.parent_id
+
+    def _add_to_ancestors(self, task, parent_id, counters):
+        for ancestor_id in self._ancestor_ids(task, parent_id):
+            rollup = self._rollups.setdefault(ancestor_id, [0, 0, 0])
+            for i, count in enumerate(counters):
+                rollup[i] += count
+
+    def _subtree_counters(self, task, status, sign):
+        """
+        Returns the counters of a task and all its subtasks, negated if
+        sign is -1.
+        """
+        total, completed, overdue = self._rollups.get(
+            task.task_id, (0, 0, 0)
+        )
+        return (
+            sign * (1 + total),
+            sign * (status[0] + completed),
+            sign * (status[1] + overdue),
+        )
+
+    def _link(self, task, parent_id):
+        if parent_id is not None:
+            self._subtasks.setdefault(parent_id, {})[id(task)] = task
+
+    def _unlink(self, task, parent_id):
+        siblings = self._subtasks.get(parent_id)
+        if siblings is not None:
+            siblings.pop(id(task), None)
+            if not siblings:
+                del self._subtasks[parent_id]
+
+    def add(self, task):
+        """
+        Adds a task (with any of its subtasks already in the list).
+        """
+        status = self._status[id(task)] = _task_status(task, self.today)
+        self._tasks_by_id[task.task_id] = task
+        self._link(task, task.parent_id)
+        self._add_to_ancestors(
+            task, task.parent_id, self._subtree_counters(task, status, 1)
+        )
+
+    def remove(self, task):
+        """
+        Removes a task. Its subtasks stay, as top-level tasks.
+        """
+        status = self._status.pop(id(task), (0, 0))
+        self._add_to_ancestors(
+            task, task.parent_id, self._subtree_counters(task, status, -1)
+        )
+        self._unlink(task, task.parent_id)
+        if self._tasks_by_id.get(task.task_id) is task:
+            del self._tasks_by_id[task.task_id]
+
+    def update(self, task, changes):
+        """
+        Updates the roll-ups after a task was changed (changes maps the
+        changed attributes to their (old, new) values).
+        """
+        old_parent_id = changes.get("parent_id", (task.parent_id,))[0]
+        old_status = self._status.get(id(task), (0, 0))
+        status = _task_status(task, self.today)
+        if old_parent_id == task.parent_id and old_status == status:
+            return
+        self._add_to_ancestors(
+            task, old_parent_id, self._subtree_counters(task, old_status, -1)
+        )
+        self._unlink(task, old_parent_id)
+        self._status[id(task)] = status
+        self._link(task, task.parent_id)
+        self._add_to_ancestors(
+            task, task.parent_id, self._subtree_counters(task, status, 1)
+        )
+
+    # ===================== Queries ===================== #
+    def _check_day(self):
+        if date.today() != self.today:
+            self.rebuild()
+
+    def get_task(self, task_id):
+        """
+        Returns the task with the given Task ID, or None.
+        """
+        return self._tasks_by_id.get(task_id)
+
+    def rollup(self, task_id):
+        """
+        Returns (total, completed, overdue) of all the subtasks of a task.
+        """
+        self._check_day()
+        return tuple(self._rollups.get(task_id, (0, 0, 0)))
+
+    def subtasks(self, task_id):
+        """
+        Returns the direct subtasks of a task.
+        """
+        return list(self._subtasks.get(task_id, {}).values())
+
+    def projects(self):
+        """
+        Returns the top-level tasks that have subtasks, without looking at
+        the tasks that have none.
+        """
+        projects = []
+        for task_id in self._subtasks:
+            task = self._tasks_by_id.get(task_id)
+            if task is not None and (
+                task.parent_id is None
+                or task.parent_id not in self._tasks_by_id
+            ):
+                projects.append(task)
+        return projects
+
+
+def get_task_tree(task_list):
+    """
+    Returns the tree of a task list, building it on first use (or if the
+    list was changed without going through the services functions). The
+    tree of a TaskRepository is kept on it (see repository.py); a plain
+    list gets a new tree on every call.
+    """
+    return get_derived_data(task_list, TREE_NAME, TaskTree)
+
+
+def _on_task_change(task_list, action, task, changes):
+    """
+    Task listener that keeps existing trees in step with the task list.
+    """
+    if action == "reload":
+        drop_derived_data(task_list, TREE_NAME)
+        return
+    tree = derived_data_to_update(
+        task_list, TREE_NAME, action in ("add", "delete")
+    )
+    if tree is None:
+        return
+    if action == "add":
+        tree.add(task)
+    elif action == "delete":
+        tree.remove(task)
+    elif action == "update":
+        if STATUS_FIELDS & set(changes) or "parent_id" in changes:
+            tree.update(task, changes)
+
+
+add_task_listener(_on_task_change)
+
+
+# ===================== Subtask Menu Functions ===================== #
+def capture_subtask(task_list):
+    """
+    Prompts for the Task ID of the parent task, then captures a new task
+    as its subtask (see capture_task()).
+    """
+    try:
+        parent_id = int(input("Enter the Task ID of the parent task: "))
+    except ValueError:
+        print("Invalid Task ID.")
+        return
+    with reading(task_list):
+        parent = get_task_tree(task_list).get_task(parent_id)
+    if parent is None:
+        print(f"There is no task with Task ID {parent_id}.")
+        return
+    print(f"Adding a subtask to '{parent.task_title}'.")
+    capture_task(task_list, parent_id)
+
+
+def _tree_row(tree, task):
+    """
+    Returns the table row of a task with its roll-up progress.
+    """
+    total, completed, overdue = tree.rollup(task.task_id)
+    pct_completed = f"{completed / total * 100:.0f}%" if total else "-"
+    return [
+        task.task_id,
+        task.task_title,
+        task.username,
+        task.task_completion,
+        total,
+        pct_completed,
+        overdue,
+    ]
+
+
+def view_task_tree(task_list):
+    """
+    Shows the projects (top-level tasks with subtasks) with the progress of
+    all their subtasks, and lets the user open a task to see its direct
+    subtasks with their own progress, one level at a time. Only the tasks
+    shown are looked at, as the progress comes from the kept roll-ups.
+    """
+    with reading(task_list):
+        tree = get_task_tree(task_list)
+        rows = [_tree_row(tree, task) for task in tree.projects()]
+    if not rows:
+        print("There are no tasks with subtasks.")
+        return
+    print("\nProjects:")
+    render_table(rows, TREE_HEADERS, max_widths={1: 30})
+
+    while True:
+        answer = input(
+            "Enter a Task ID to view its subtasks, "
+            "or press Enter to return to the menu: "
+        ).strip()
+        if not answer:
+            return
+        try:
+            task_id = int(answer)
+        except ValueError:
+            print("Invalid Task ID.")
+            continue
+        with reading(task_list):
+            # The tree is built again if the task list was reloaded.
+            tree = get_task_tree(task_list)
+            task = tree.get_task(task_id)
+            rows = [_tree_row(tree, sub) for sub in tree.subtasks(task_id)]
+        if task is None:
+            print(f"There is no task with Task ID {task_id}.")
+        elif not rows:
+            print(f"'{task.task_title}' has no subtasks.")
+        else:
+            print(f"\nSubtasks of '{task.task_title}':")
+            render_table(rows, TREE_HEADERS, max_widths={1: 30})
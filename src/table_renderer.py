@@ -0,0 +1,118 @@
+import sys
+
+from instrumentation import timed
+
+"""Purpose: Render tables in the fancy_grid style without `tabulate`."""
+
+# Box drawing characters used by the fancy_grid table format:
+# (left, fill, column separator, right) for each kind of horizontal line.
+TOP_LINE = ("╒", "═", "╤", "╕")
+HEADER_LINE = ("╞", "═", "╪", "╡")
+ROW_LINE = ("├", "─", "┼", "┤")
+BOTTOM_LINE = ("╘", "═", "╧", "╛")
+ELLIPSIS = "…"
+
+
+def _cell_text(value):
+    """
+    Converts a cell value to a single line of text.
+    """
+    return str(value).replace("\r", " ").replace("\n", " ")
+
+
+def _is_number(value):
+    """
+    Checks if a cell value is a number, so it can be right-aligned.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _fit(text, width):
+    """
+    Truncates text to the column width, marking the cut with an ellipsis.
+    """
+    if len(text) <= width:
+        return text
+    return text[:width - 1] + ELLIPSIS if width > 1 else text[:width]
+
+
+def _horizontal_line(widths, line):
+    """
+    Builds a horizontal table line for the given column widths.
+    """
+    left, fill, separator, right = line
+    return (
+        left
+        + separator.join(fill * (width + 2) for width in widths)
+        + right
+        + "\n"
+    )
+
+
+def _row_line(cells, widths, numeric):
+    """
+    Builds one table row. Numeric cells are right-aligned, like tabulate
+    does, and all other cells are left-aligned.
+    """
+    parts = []
+    for text, width, is_number in zip(cells, widths, numeric):
+        text = _fit(text, width)
+        parts.append(text.rjust(width) if is_number else text.ljust(width))
+    return "│ " + " │ ".join(parts) + " │\n"
+
+
+@timed
+def render_table(rows, headers, widths=None, max_widths=None, out=None):
+    """
+    Writes a table in the fancy_grid style straight to the output stream,
+    one line at a time.
+
+    If `widths` is given, every column has that fixed width and the rows
+    are streamed without being measured first, so `rows` can be any
+    iterable (including a generator). Otherwise the column widths are
+    computed in a single pass that converts each cell to text only once.
+
+    Text longer than its column is truncated with an ellipsis, so
+    `max_widths` can be used to cap wide columns such as descriptions.
+
+    Args:
+        rows (iterable): The table rows, each a list of cell values.
+        headers (list): The column headers.
+        widths (list, optional): Fixed column widths.
+        max_widths (dict, optional): Maps column indexes to the maximum
+            width of that column when widths are measured.
+        out (file, optional): The output stream. Defaults to sys.stdout.
+    """
+    out = out or sys.stdout
+    if widths is None:
+        widths = [len(header) for header in headers]
+        measured_rows = []
+        for row in rows:
+            cells = [_cell_text(value) for value in row]
+            numeric = [_is_number(value) for value in row]
+            for i, text in enumerate(cells):
+                if len(text) > widths[i]:
+                    widths[i] = len(text)
+            measured_rows.append((cells, numeric))
+        for i, max_width in (max_widths or {}).items():
+            widths[i] = min(widths[i], max(max_width, len(headers[i])))
+        rows = measured_rows
+    else:
+        rows = (
+            (
+                [_cell_text(value) for value in row],
+                [_is_number(value) for value in row],
+            )
+            for row in rows
+        )
+
+    header_cells = [_cell_text(header) for header in headers]
+    out.write(_horizontal_line(widths, TOP_LINE))
+    out.write(_row_line(header_cells, widths, [False] * len(widths)))
+    separator = _horizontal_line(widths, HEADER_LINE)
+    row_separator = _horizontal_line(widths, ROW_LINE)
+    for cells, numeric in rows:
+        out.write(separator)
+        out.write(_row_line(cells, widths, numeric))
+        separator = row_separator
+    out.write(_horizontal_line(widths, BOTTOM_LINE))
@@ -0,0 +1,205 @@
+from collections import deque
+
+from repository import writing
+from services import (
+    add_task,
+    add_task_listener,
+    persist_tasks,
+    remove_task,
+    remove_task_listener,
+    update_task,
+)
+
+"""Purpose: Undo and redo task changes made in this session."""
+
+# The number of changes that can be undone; older changes are forgotten.
+UNDO_LIMIT = 100
+
+
+class UndoLog:
+    """
+    This class keeps the changes made to a task list, so they can be undone
+    and redone.
+
+    Rather than a copy of the task list, every change (adding, updating or
+    removing a task, reported by a task listener, see services.py) records
+    its own small inverse:
+      - adding a task is undone by removing that task;
+      - updating a task is undone by setting the changed attributes back to
+        their old values;
+      - removing a task is undone by inserting it back at its index.
+    Each step therefore costs the same small amount of memory and time
+    however many tasks there are, and at most `limit` steps are kept.
+    Undoing a change records the inverse of the undo as a redo step; any
+    new change clears the redo steps.
+
+    A task that is removed and then restored keeps its Task ID, also if
+    its removal was saved already (see data_access.TaskStore).
+    """
+    def __init__(self, task_list, limit=UNDO_LIMIT):
+        self.task_list = task_list
+        # Each step is (description, action, task, argument) where the
+        # action is the change that reverses the recorded one.
+        self._undo_steps = deque(maxlen=limit)
+        self._redo_steps = deque(maxlen=limit)
+        # "undo" or "redo" while a step is being replayed, and the
+        # description of that step.
+        self._replaying = None
+        self._replaying_description = None
+        add_task_listener(self._on_task_change)
+
+    def close(self):
+        """
+        Stops recording the changes of the task list.
+        """
+        remove_task_listener(self._on_task_change)
+
+    def _on_task_change(self, task_list, action, task, changes):
+        """
+        Task listener that records the inverse of every task change.
+        """
+        if task_list is not self.task_list:
+            return
+        if action == "add":
+            step = (f"add '{task.task_title}'", "remove", task, None)
+        elif action == "update":
+            old_values = {name: old for name, (old, _) in changes.items()}
+            step = (f"change '{task.task_title}'", "update", task, old_values)
+        elif action == "delete":
+            index = changes.get("index", (len(task_list), None))[0]
+            step = (f"delete '{task.task_title}'", "insert", task, index)
+        else:
+            # A reload keeps the same Task objects, so the steps stay valid.
+            return
+        if self._replaying is not None:
+            # Redoing an undone change is described as the change itself.
+            step = (self._replaying_description,) + step[1:]
+
+        if self._replaying == "undo":
+            self._redo_steps.append(step)
+        else:
+            self._undo_steps.append(step)
+            if self._replaying is None:
+                self._redo_steps.clear()
+
+    def can_undo(self):
+        """
+        Returns True if there is a change to undo.
+        """
+        return bool(self._undo_steps)
+
+    def can_redo(self):
+        """
+        Returns True if there is an undone change to redo.
+        """
+        return bool(self._redo_steps)
+
+    def _replay(self, steps, mode):
+        """
+        Applies the last step of the given steps and saves the task list.
+
+        Returns:
+            str: The description of the step, or None if there was none.
+
+        Raises:
+            OSError, ValueError: If the change could not be saved (see
+            persist_tasks()).
+        """
+        with writing(self.task_list):
+            if not steps:
+                return None
+            description, action, task, argument = steps.pop()
+            self._replaying = mode
+            self._replaying_description = description
+            try:
+                if action == "remove":
+                    _remove(self.task_list, task)
+                elif action == "update":
+                    update_task(self.task_list, task, **argument)
+                elif action == "insert":
+                    index = min(argument, len(self.task_list))
+                    add_task(self.task_list, task, index)
+            finally:
+                self._replaying = self._replaying_description = None
+        # Saved after releasing the write lock (see persist_tasks()).
+        persist_tasks(self.task_list)
+        return description
+
+    def undo(self):
+        """
+        Undoes the last change.
+
+        Returns:
+            str: The description of the undone change, or None if there
+            was nothing to undo.
+        """
+        return self._replay(self._undo_steps, "undo")
+
+    def redo(self):
+        """
+        Redoes the last undone change.
+
+        Returns:
+            str: The description of the redone change, or None if there
+            was nothing to redo.
+        """
+        return self._replay(self._redo_steps, "redo")
+
+
+def _remove(task_list, task):
+    """
+    Removes a task from the task list. The task is looked for from the end
+    of the list, where added tasks are, so this is usually immediate.
+    """
+    for index in range(len(task_list) - 1, -1, -1):
+        if task_list[index] is task:
+            remove_task(task_list, index)
+            return
+
+
+# The undo log of every task list: id(task_list) -> (list, UndoLog).
+# The list itself is kept so its id cannot be reused by another list.
+_undo_logs = {}
+
+
+def get_undo_log(task_list):
+    """
+    Returns the undo log of a task list, creating it on first use. It only
+    records the changes made after it was created.
+    """
+    cached = _undo_logs.get(id(task_list))
+    if cached is None:
+        cached = (task_list, UndoLog(task_list))
+        _undo_logs[id(task_list)] = cached
+    return cached[1]
+
+
+def undo_last_change(task_list):
+    """
+    Undoes the last change made to the task list and prints what was undone.
+    """
+    try:
+        description = get_undo_log(task_list).undo()
+    except (OSError, ValueError) as e:
+        print(f"Error saving tasks: {e}")
+        return
+    if description is None:
+        print("There is nothing to undo.")
+    else:
+        print(f"Undid: {description}.")
+
+
+def redo_last_change(task_list):
+    """
+    Redoes the last undone change to the task list and prints what was
+    redone.
+    """
+    try:
+        description = get_undo_log(task_list).redo()
+    except (OSError, ValueError) as e:
+        print(f"Error saving tasks: {e}")
+        return
+    if description is None:
+        print("There is nothing to redo.")
+    else:
+        print(f"Redid: {description}.")
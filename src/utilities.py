@@ -1,6 +1,10 @@
 """Purpose: Provide helper functions
 (e.g., date formatting, common validations)."""
 
+from datetime import datetime
+
+from instrumentation import timed
+
 
 def format_date(date_obj, format_str="%d %b %Y"):
     """
@@ -17,3 +21,46 @@ def format_date(date_obj, format_str="%d %b %Y"):
         str: The formatted date string.
     """
     return date_obj.strftime(format_str)
+
+
+@timed
+def parse_date(date_str, format_str="%d %b %Y"):
+    """
+    Parses a date string into a date object.
+
+    Args:
+        date_str (str): The date string to parse (e.g., "01 Jan 2023").
+        format_str (str, optional): The format of the date string. Defaults
+            to "%d %b %Y".
+
+    Returns:
+        datetime.date or None: The parsed date, or None if the string does
+        not match the format.
+    """
+    try:
+        return datetime.strptime(date_str.strip(), format_str).date()
+    except (AttributeError, ValueError):
+        return None
+
+
+def validate_single_line(value, field_name):
+    """
+    Checks that a text field of a task (e.g. its title) is a string that
+    fits on one line, since the tasks file stores every field on a line of
+    its own and a line break would start a new field.
+
+    Args:
+        value (str): The text to check.
+        field_name (str): The name of the field, for the error message.
+
+    Returns:
+        str: The value, unchanged.
+
+    Raises:
+        ValueError: If the value is not a string or contains a line break.
+    """
+    if not isinstance(value, str):
+        raise ValueError(f"The {field_name} must be text.")
+    if "\n" in value or "\r" in value:
+        raise ValueError(f"The {field_name} cannot contain line breaks.")
+    return value
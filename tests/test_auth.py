@@ -8,9 +8,11 @@ sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 )
 
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open
 from src.authentication import is_valid_username, is_valid_password, user_login
+from src.authentication import UserRegistry
 
 
 class TestAuth(unittest.TestCase):
@@ -34,6 +36,10 @@ class TestAuth(unittest.TestCase):
       validates passwords accurately.
     - `test_user_login_success`: Tests successful login with valid credentials.
     - `test_user_login_failure`: Tests login failure with invalid credentials.
+    - `test_user_registry_reloads_changed_file`: Tests that the user registry
+      only rereads the user file after it has changed.
+    - `test_user_registry_add_user`: Tests that registering updates the
+      registry and the user file together and rejects duplicates.
     Dependencies:
     - `unittest`: For creating and running the test cases.
     - `unittest.mock.patch`: For mocking file operations during login tests.
@@ -111,6 +117,46 @@ class TestAuth(unittest.TestCase):
         """
         self.assertFalse(user_login("AliceB", "WrongPassword"))
 
+    def test_user_registry_reloads_changed_file(self):
+        """
+        Test case for the `UserRegistry` reload behaviour.
+
+        The user file is read once, later lookups do not reopen it while it
+        is unchanged, and a change to the file is picked up by the next
+        lookup.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "user.txt")
+            with open(path, "w") as file:
+                file.write("AliceB, Passw0rd!\n")
+            registry = UserRegistry(path)
+            self.assertEqual(registry.get_password("AliceB"), "Passw0rd!")
+
+            with patch("src.authentication.open") as mock_file:
+                self.assertIn("AliceB", registry)
+                self.assertNotIn("BobCat", registry)
+                mock_file.assert_not_called()
+
+            with open(path, "a") as file:
+                file.write("BobCat, S3cret!!\n")
+            self.assertEqual(registry.usernames(), ["AliceB", "BobCat"])
+
+    def test_user_registry_add_user(self):
+        """
+        Test case for `UserRegistry.add_user`.
+
+        A new user is written to the user file and is immediately known to
+        the registry, while a duplicate username is rejected.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "user.txt")
+            registry = UserRegistry(path)
+            self.assertTrue(registry.add_user("AliceB", "Passw0rd!"))
+            self.assertFalse(registry.add_user("AliceB", "Other0ne!"))
+            self.assertIn("AliceB", registry)
+            with open(path) as file:
+                self.assertEqual(file.read(), "AliceB, Passw0rd!\n")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,63 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+    ),
+)
+
+import contextlib
+import io
+import unittest
+from unittest.mock import patch
+from bench_suite import BENCHMARKS, parse_scale, print_results, run_suite
+
+
+class TestBenchSuite(unittest.TestCase):
+    """
+    TestBenchSuite is a test suite for the benchmark suite.
+
+    Methods:
+        test_suite_runs_every_benchmark: Verifies that every benchmark runs
+            on a small generated dataset, and that the results can be
+            compared with an earlier run.
+    """
+
+    def test_suite_runs_every_benchmark(self):
+        """
+        Task counts such as 100k are parsed, every benchmark runs for the
+        given rounds in a temporary directory (the working directory is
+        restored), and a run compared with itself shows no change.
+        """
+        self.assertEqual(parse_scale("100k"), 100_000)
+        self.assertEqual(parse_scale("1M"), 1_000_000)
+        self.assertEqual(parse_scale("250"), 250)
+
+        cwd = os.getcwd()
+        with patch.dict(os.environ, {"TASK_MANAGER_KDF_COST": "1000"}):
+            results = run_suite([200], rounds=2, warmup=1)
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertEqual(
+            [result["benchmark"] for result in results], list(BENCHMARKS)
+        )
+        for result in results:
+            self.assertEqual(result["tasks"], 200)
+            self.assertEqual(len(result["rounds_ms"]), 2)
+            self.assertLessEqual(result["min_ms"], result["max_ms"])
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            print_results(results, {"results": results})
+        self.assertIn("+0.0%", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
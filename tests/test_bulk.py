@@ -0,0 +1,113 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.models import Task
+from src.authentication import UserRegistry
+
+# The bulk changes go through the services module and the query index of
+# the top-level modules, so they are imported from there too.
+from bulk import (
+    bulk_complete,
+    bulk_delete,
+    bulk_reassign,
+    bulk_shift_due_dates,
+    select_tasks,
+)
+from queries import query_tasks
+
+
+class TestBulk(unittest.TestCase):
+    """
+    TestBulk is a test suite for the bulk task changes.
+
+    Methods:
+        test_bulk_changes_persist_once: Verifies that each bulk change
+            applies to all selected tasks, skips the tasks it must not
+            change, reports the count and saves the task list only once.
+        test_bulk_delete_updates_queries: Verifies that bulk deleted tasks
+            disappear from the task list and from query results.
+        test_reassign_to_unknown_user: Verifies that tasks cannot be
+            reassigned to a user who is not registered.
+    """
+
+    def setUp(self):
+        self.tasks = [
+            Task("Alice", f"Task {i}", "", "01 Jan 2025",
+                 f"{10 + i} Jan 2025", "Yes" if i == 0 else "No",
+                 task_id=i + 1)
+            for i in range(5)
+        ]
+        self.tasks[4].task_due_date = "someday"
+        patcher = patch("bulk.persist_tasks")
+        self.persist_tasks = patcher.start()
+        self.addCleanup(patcher.stop)
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = os.path.join(temp_dir.name, "user.txt")
+        with open(path, "w") as file:
+            file.write("Alice, Passw0rd!\nBob, Passw0rd!\n")
+        patcher = patch(
+            "bulk.get_user_registry", return_value=UserRegistry(path)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bulk_changes_persist_once(self):
+        """
+        Moving due dates, reassigning and completing the selected tasks
+        skip completed tasks (and unreadable due dates), return how many
+        tasks they changed and save once, or not at all if nothing changed.
+        """
+        selected = select_tasks(self.tasks, task_ids=[1, 2, 3, 5])
+        self.assertEqual([t.task_id for t in selected], [1, 2, 3, 5])
+
+        self.assertEqual(bulk_shift_due_dates(self.tasks, selected, 7), 2)
+        self.assertEqual(self.tasks[1].task_due_date, "18 Jan 2025")
+        self.assertEqual(self.tasks[0].task_due_date, "10 Jan 2025")
+        self.assertEqual(self.persist_tasks.call_count, 1)
+
+        self.assertEqual(bulk_reassign(self.tasks, selected, "Bob"), 3)
+        self.assertEqual(bulk_complete(self.tasks, selected), 3)
+        self.assertEqual(self.persist_tasks.call_count, 3)
+
+        # Nothing left to change, so nothing is saved.
+        self.assertEqual(bulk_complete(self.tasks, selected), 0)
+        self.assertEqual(self.persist_tasks.call_count, 3)
+
+    def test_bulk_delete_updates_queries(self):
+        """
+        Deleting the tasks selected by filter removes them from the task
+        list and from the query index, and saves once.
+        """
+        self.assertEqual(len(query_tasks(self.tasks, completed=False)), 4)
+        selected = select_tasks(
+            self.tasks, completed=False, title_contains="2"
+        )
+        self.assertEqual(bulk_delete(self.tasks, selected), 1)
+        self.assertEqual(self.persist_tasks.call_count, 1)
+        self.assertEqual(len(self.tasks), 4)
+        self.assertEqual(len(query_tasks(self.tasks, completed=False)), 3)
+
+    def test_reassign_to_unknown_user(self):
+        """
+        Reassigning to a username that is not registered raises ValueError
+        before any task is changed or saved.
+        """
+        with self.assertRaises(ValueError):
+            bulk_reassign(self.tasks, self.tasks, "Mallory")
+        self.assertEqual({task.username for task in self.tasks}, {"Alice"})
+        self.persist_tasks.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
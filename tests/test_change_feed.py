@@ -0,0 +1,153 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import tempfile
+import unittest
+from src.models import Task
+
+# The feed follows the task changes saved through the top-level data_access
+# module, so the tasks are changed and saved through the modules imported
+# the same way.
+from change_feed import ChangeFeed
+from data_access import TaskStore
+from repository import TaskRepository
+from services import add_task, remove_task, update_task
+
+
+class TestChangeFeed(unittest.TestCase):
+    """
+    TestChangeFeed is a test suite for the change feed of task changes.
+
+    Methods:
+        test_saved_changes_are_published_in_sequence: Verifies that only
+            saved changes are published, as numbered events with the old
+            and new values, one per task and save.
+        test_merged_changes_are_not_published_again: Verifies that a change
+            saved by another session is published once, by that session.
+        test_readers_resume_from_their_position: Verifies that a reader
+            resumes after the last event it read, that an unfinished event
+            is not read, and that the next writer continues the sequence.
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "changes.jsonl")
+        self.tasks_path = os.path.join(temp_dir.name, "tasks.txt")
+        # The first task is saved before the feed starts.
+        TaskStore(self.tasks_path).append(
+            Task("Alice", "Report", "", "01 Jan 2030", "20 Jan 2030", "No")
+        )
+        self.feed = ChangeFeed(self.path)
+        self.feed.start()
+        self.addCleanup(self.feed.stop)
+        self.store = TaskStore(self.tasks_path)
+        self.tasks = TaskRepository(self.store.load())
+
+    def events(self, position=0):
+        """
+        Returns the events of the feed after a position.
+        """
+        return [event for event, _ in self.feed.read(position)]
+
+    def test_saved_changes_are_published_in_sequence(self):
+        """
+        Changes are published when the task list is saved, not when they
+        are made. Each save publishes one event per task it changed, with
+        the new task's fields, or the changed fields before and after.
+        """
+        add_task(
+            self.tasks,
+            Task("Bob", "Plan", "", "01 Jan 2030", "21 Jan 2030", "No"),
+        )
+        update_task(
+            self.tasks, self.tasks[0], username="Bob", task_completion="Yes"
+        )
+        self.assertEqual(self.events(), [])
+
+        self.store.save(self.tasks)
+        update_task(self.tasks, self.tasks[0], task_title="Draft")
+        update_task(self.tasks, self.tasks[0], task_title="Final")
+        remove_task(self.tasks, 1)
+        self.store.save(self.tasks)
+
+        events = self.events()
+        self.assertEqual([e["sequence"] for e in events], [1, 2, 3, 4])
+        self.assertEqual(
+            [(e["event"], e["task_id"]) for e in events],
+            [("updated", 1), ("created", 2), ("updated", 1), ("deleted", 2)],
+        )
+        self.assertEqual(
+            events[0]["old"], {"username": "Alice", "task_completion": "No"}
+        )
+        self.assertEqual(
+            events[0]["new"], {"username": "Bob", "task_completion": "Yes"}
+        )
+        self.assertIsNone(events[1]["old"])
+        self.assertEqual(events[1]["new"]["task_title"], "Plan")
+        self.assertEqual(events[1]["new"]["version"], 1)
+        self.assertEqual(events[2]["old"], {"task_title": "Report"})
+        self.assertEqual(events[2]["new"], {"task_title": "Final"})
+        self.assertEqual(events[3]["old"]["username"], "Bob")
+        self.assertIsNone(events[3]["new"])
+
+    def test_merged_changes_are_not_published_again(self):
+        """
+        When a save merges in a change saved by another session, only the
+        changes made in this session are published by it, so every change
+        is in the feed once.
+        """
+        other_store = TaskStore(self.tasks_path)
+        other_tasks = other_store.load()
+        other_tasks[0].task_due_date = "25 Jan 2030"
+        other_store.save(other_tasks)
+
+        add_task(
+            self.tasks,
+            Task("Bob", "Plan", "", "01 Jan 2030", "21 Jan 2030", "No"),
+        )
+        merged, _ = self.store.save(self.tasks)
+        self.assertTrue(merged)
+        self.assertEqual(
+            [(e["event"], e["task_id"]) for e in self.events()],
+            [("updated", 1), ("created", 2)],
+        )
+
+    def test_readers_resume_from_their_position(self):
+        """
+        A reader that passes the position after its last event only gets
+        the events written since, never an unfinished one, and a writer
+        that finds an unfinished event replaces it.
+        """
+        update_task(self.tasks, self.tasks[0], task_title="First")
+        self.store.save(self.tasks)
+        (_, position), = self.feed.read()
+        update_task(self.tasks, self.tasks[0], task_title="Second")
+        self.store.save(self.tasks)
+        with open(self.path, "ab") as file:
+            file.write(b'{"sequence": 3, "unfin')
+
+        events = list(self.feed.read(position))
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0][0]["new"], {"task_title": "Second"})
+        self.assertEqual(list(self.feed.read(events[0][1])), [])
+
+        # Another writer (e.g. another session) replaces the unfinished
+        # event and continues the sequence.
+        ChangeFeed(self.path).publish(
+            [("delete", 1, self.tasks[0].to_dict(), None)]
+        )
+        self.assertEqual(
+            [event["sequence"] for event in self.events(position)], [2, 3]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
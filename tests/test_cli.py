@@ -0,0 +1,304 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+# The CLI works on the task and user files of the current directory through
+# the top-level modules, so it is imported from there too.
+from cli import run
+from data_access import TaskStore, load_tasks
+from models import Task
+
+
+class TestCli(unittest.TestCase):
+    """
+    TestCli is a test suite for the non-interactive command line interface.
+
+    Methods:
+        test_commands: Verifies add, list, complete, reassign, delete and
+            export against task and user files in a temporary directory.
+        test_errors: Verifies that missing credentials, wrong passwords and
+            commands the user may not run fail with a JSON error.
+        test_token_login: Verifies that a command can log in with an
+            access token instead of a password.
+        test_save_errors: Verifies that a change that cannot be saved, or
+            that conflicts with another session, fails with a JSON error.
+        test_import_links_subtasks: Verifies that imported subtasks point
+            to the new Task ID of their imported parent.
+        test_import_errors: Verifies that an import file with an invalid
+            task, or an import that cannot be saved, imports nothing.
+        test_line_breaks_are_rejected: Verifies that added and imported
+            tasks with a line break in a text field are not saved.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.temp_dir.name)
+        with open("user.txt", "w") as file:
+            file.write("Administrator, Adm1n!!\nAliceB, Passw0rd!\n")
+        patcher = patch.dict(os.environ, {"TASK_MANAGER_KDF_COST": "1000"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_cli(self, username, password, *argv):
+        """
+        Runs one command as the given user and returns its exit code and
+        parsed JSON output.
+        """
+        environ = {
+            "TASK_MANAGER_USERNAME": username,
+            "TASK_MANAGER_PASSWORD": password,
+        }
+        output = io.StringIO()
+        with patch.dict(os.environ, environ), redirect_stdout(output):
+            exit_code = run(list(argv))
+        return exit_code, json.loads(output.getvalue())
+
+    def test_commands(self):
+        """
+        Runs every command as the user allowed to, checking the JSON result
+        of each and the tasks left in the file at the end.
+        """
+        admin = ("Administrator", "Adm1n!!")
+        alice = ("AliceB", "Passw0rd!")
+        for title, due_date in [
+            ("Write", "10 Jan 2025"),
+            ("Plan", "05 Jan 2025"),
+        ]:
+            exit_code, result = self.run_cli(
+                *admin, "add", "AliceB", title, due_date
+            )
+            self.assertEqual(exit_code, 0)
+        self.assertEqual(result["task"]["task_id"], 2)
+
+        _, result = self.run_cli(*alice, "list", "--mine", "--open")
+        titles = [task["task_title"] for task in result["tasks"]]
+        self.assertEqual(titles, ["Plan", "Write"])
+
+        _, result = self.run_cli(*alice, "complete", "1")
+        self.assertEqual(result["task"]["task_completion"], "Yes")
+        _, result = self.run_cli(
+            *alice, "reassign", "2", "Administrator", "--due-date",
+            "07 Jan 2025",
+        )
+        self.assertEqual(result["task"]["username"], "Administrator")
+        _, result = self.run_cli(*admin, "delete", "1")
+        self.assertTrue(result["ok"])
+
+        _, result = self.run_cli(*admin, "export")
+        self.assertEqual(
+            [(t["task_id"], t["task_due_date"]) for t in result["tasks"]],
+            [(2, "07 Jan 2025")],
+        )
+
+    def test_errors(self):
+        """
+        Commands without credentials, with a wrong password, by a user who
+        may not run them or with invalid arguments print ok: false and
+        exit with 1.
+        """
+        output = io.StringIO()
+        with patch.dict(os.environ, clear=True), redirect_stdout(output):
+            self.assertEqual(run(["list"]), 1)
+        self.assertFalse(json.loads(output.getvalue())["ok"])
+
+        exit_code, result = self.run_cli("AliceB", "wrong", "list")
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(result["error"], "Invalid username or password.")
+
+        _, result = self.run_cli("AliceB", "Passw0rd!", "delete", "1")
+        self.assertEqual(
+            result["error"], "Only the Administrator can do this."
+        )
+        _, result = self.run_cli(
+            "AliceB", "Passw0rd!", "add", "AliceB", "Task", "next week"
+        )
+        self.assertFalse(result["ok"])
+        exit_code, result = self.run_cli(
+            "Administrator", "Adm1n!!", "bulk", "reassign", "--to", "Nobody"
+        )
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(result["error"], "There is no user Nobody.")
+
+        # --mine and --assignee cannot be used together.
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            run(["list", "--mine", "--assignee", "AliceB"])
+
+    def test_token_login(self):
+        """
+        A token created by logging in with the password lets later commands
+        log in from a token file without checking the password, while a
+        wrong token is rejected and a token cannot create more tokens.
+        """
+        _, result = self.run_cli("AliceB", "Passw0rd!", "token")
+        with open("token.txt", "w") as file:
+            file.write(f"AliceB, {result['token']}\n")
+        with open("wrong_token.txt", "w") as file:
+            file.write("AliceB, not-the-token\n")
+
+        with patch("cli.check_credentials") as check_credentials:
+            _, result = self.run_cli("", "", "--token-file", "token.txt",
+                                     "list", "--mine")
+            check_credentials.assert_not_called()
+        self.assertEqual(result, {"ok": True, "count": 0, "tasks": []})
+
+        exit_code, result = self.run_cli(
+            "", "", "--token-file", "wrong_token.txt", "list"
+        )
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(result["error"], "Invalid username or token.")
+        _, result = self.run_cli("", "", "--token-file", "token.txt", "token")
+        self.assertFalse(result["ok"])
+
+    def test_save_errors(self):
+        """
+        A change that cannot be written to the tasks file, or that another
+        session's change to the same task rejected, prints ok: false and
+        exits with 1 instead of reporting the change as made.
+        """
+        alice = ("AliceB", "Passw0rd!")
+        self.run_cli(
+            "Administrator", "Adm1n!!", "add", "AliceB", "Write", "10 Jan 2025"
+        )
+        with patch(
+            "data_access.TaskStore._write_file",
+            side_effect=OSError("No space left on device"),
+        ):
+            exit_code, result = self.run_cli(*alice, "complete", "1")
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(result["error"], "No space left on device")
+
+        def load_then_edit_elsewhere():
+            tasks = load_tasks()
+            other_session = TaskStore("tasks.txt")
+            other_tasks = other_session.load()
+            other_tasks[0].task_due_date = "01 Feb 2025"
+            other_session.save(other_tasks)
+            return tasks
+
+        with patch("cli.load_tasks", load_then_edit_elsewhere):
+            exit_code, result = self.run_cli(*alice, "complete", "1")
+        self.assertEqual(exit_code, 1)
+        self.assertIn("changed by another session", result["error"])
+        _, result = self.run_cli(*alice, "export")
+        self.assertEqual(result["tasks"][0]["task_completion"], "No")
+
+    def test_import_links_subtasks(self):
+        """
+        Imported tasks get new Task IDs, their subtasks are linked to the
+        new Task ID of the parent, and a subtask whose parent was not
+        imported becomes a top-level task.
+        """
+        admin = ("Administrator", "Adm1n!!")
+        self.run_cli(*admin, "add", "AliceB", "Existing", "10 Jan 2025")
+        exported = [
+            Task(
+                "AliceB", title, "", "01 Jan 2025", "10 Jan 2025", "No",
+                task_id=task_id, parent_id=parent_id,
+            ).to_dict()
+            for title, task_id, parent_id in [
+                ("Project", 7, None),
+                ("Step", 8, 7),
+                ("Orphan", 9, 99),
+            ]
+        ]
+        with open("import.json", "w") as file:
+            json.dump(exported, file)
+        _, result = self.run_cli(*admin, "import", "import.json")
+        self.assertEqual(result["task_ids"], [2, 3, 4])
+
+        _, result = self.run_cli(*admin, "export")
+        self.assertEqual(
+            [(t["task_id"], t["parent_id"]) for t in result["tasks"]],
+            [(1, None), (2, None), (3, 2), (4, None)],
+        )
+
+    def test_import_errors(self):
+        """
+        An import file with an item that is not a task object fails with a
+        JSON error, and so does an import whose save fails, leaving no
+        imported task (or subtask link) behind.
+        """
+        admin = ("Administrator", "Adm1n!!")
+        self.run_cli(*admin, "add", "AliceB", "Existing", "10 Jan 2025")
+        project = Task("AliceB", "Project", "", "01 Jan 2025", "10 Jan 2025",
+                       "No", task_id=7)
+        step = Task("AliceB", "Step", "", "01 Jan 2025", "10 Jan 2025",
+                    "No", task_id=8, parent_id=7)
+        with open("import.json", "w") as file:
+            json.dump([project.to_dict(), "Step"], file)
+        exit_code, result = self.run_cli(*admin, "import", "import.json")
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(
+            result["error"], "Every imported task must be a JSON object."
+        )
+
+        with open("import.json", "w") as file:
+            json.dump([project.to_dict(), step.to_dict()], file)
+        with patch(
+            "data_access.TaskStore._write_file",
+            side_effect=OSError("No space left on device"),
+        ):
+            exit_code, result = self.run_cli(*admin, "import", "import.json")
+        self.assertEqual(exit_code, 1)
+        _, result = self.run_cli(*admin, "export")
+        self.assertEqual(
+            [t["task_title"] for t in result["tasks"]], ["Existing"]
+        )
+
+        # The next import links the subtask to the Task ID its parent gets.
+        _, result = self.run_cli(*admin, "import", "import.json")
+        self.assertEqual(result["task_ids"], [4, 5])
+        _, result = self.run_cli(*admin, "export")
+        self.assertEqual(
+            [(t["task_id"], t["parent_id"]) for t in result["tasks"]],
+            [(1, None), (4, None), (5, 4)],
+        )
+
+    def test_line_breaks_are_rejected(self):
+        """
+        A line break in a text field would start a new line of the tasks
+        file and shift the fields of the task, so adding or importing such
+        a task fails with a JSON error and leaves the tasks file unchanged.
+        """
+        admin = ("Administrator", "Adm1n!!")
+        exit_code, result = self.run_cli(
+            *admin, "add", "AliceB", "a\nTask Title: x", "10 Jan 2025"
+        )
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(
+            result["error"], "The title cannot contain line breaks."
+        )
+        _, result = self.run_cli(
+            *admin, "add", "AliceB", "Write", "10 Jan 2025\r"
+        )
+        self.assertFalse(result["ok"])
+
+        task = Task("AliceB", "Plan", "a\nb", "01 Jan 2025", "10 Jan 2025",
+                    "No")
+        with open("import.json", "w") as file:
+            json.dump([task.to_dict()], file)
+        _, result = self.run_cli(*admin, "import", "import.json")
+        self.assertEqual(
+            result["error"], "The task_description cannot contain line breaks."
+        )
+        _, result = self.run_cli(*admin, "export")
+        self.assertEqual(result["tasks"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
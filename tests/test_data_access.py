@@ -9,9 +9,36 @@ sys.path.insert(
 )
 
 
+import io
+import tempfile
+import threading
 import unittest
 from unittest.mock import patch
-from src.data_access import load_tasks
+from src.data_access import TaskStore, load_tasks
+from src.models import Task
+
+# The data_access module imports the repository module by its plain name,
+# so the task list and its changes must come from the modules imported the
+# same way.
+from repository import TaskRepository
+from services import update_task
+
+LEGACY_TASKS = (
+    "Assigned to: Alice,\n"
+    "Task Title: First,\n"
+    "Description: One,\n"
+    "Date of Assignment: 01 Jan 2025,\n"
+    "Task Due Date: 10 Jan 2025,\n"
+    "Task Completion: No\n"
+    "Assigned to: Bob,\n"
+    "Task Title: Broken,\n"
+    "Assigned to: Bob,\n"
+    "Task Title: Second,\n"
+    "Description: Two,\n"
+    "Date of Assignment: 02 Jan 2025,\n"
+    "Task Due Date: 12 Jan 2025,\n"
+    "Task Completion: No\n"
+)
 
 
 class TestDataAccess(unittest.TestCase):
@@ -23,6 +50,18 @@ class TestDataAccess(unittest.TestCase):
         - test_load_tasks_file_not_found: Verifies that the `load_tasks`
           function correctly handles the scenario where the file it attempts
           to open does not exist, returning an empty list in such cases.
+        - test_load_legacy_file: Verifies that files without Task IDs are
+          loaded with IDs in file order and that broken records are skipped.
+        - test_concurrent_edits_are_merged: Verifies that edits to different
+          tasks by two sessions are both kept.
+        - test_conflicting_edit_is_rejected: Verifies that the second of two
+          edits to the same task is rejected instead of overwriting the first.
+        - test_append_is_kept_by_other_session_save: Verifies that a task
+          appended by one session survives a save by another session.
+        - test_save_writes_without_write_lock: Verifies that readers of the
+          task list are not held up while the tasks file is written.
+        - test_reserved_ids_are_kept: Verifies that new tasks keep the Task
+          IDs reserved for them, which no other session hands out.
     """
     def test_load_tasks_file_not_found(self):
         """
@@ -47,6 +86,164 @@ class TestDataAccess(unittest.TestCase):
             tasks = load_tasks()
             self.assertEqual(tasks, [])
 
+    def setUp(self):
+        """
+        Creates a temporary tasks file in the legacy (six line) format.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "tasks.txt")
+        with open(self.path, "w") as file:
+            file.write(LEGACY_TASKS)
+
+    def tearDown(self):
+        """
+        Removes the temporary tasks file.
+        """
+        self.temp_dir.cleanup()
+
+    def load(self):
+        """
+        Loads the temporary tasks file with a new store (i.e. session).
+        """
+        store = TaskStore(self.path)
+        with patch("sys.stdout", new_callable=io.StringIO):
+            return store, store.load()
+
+    def test_load_legacy_file(self):
+        """
+        Legacy tasks get Task IDs in file order, the incomplete record is
+        skipped, and saving writes the header and IDs to the file.
+        """
+        with patch("sys.stdout", new_callable=io.StringIO) as output:
+            store = TaskStore(self.path)
+            tasks = store.load()
+        self.assertIn(
+            "Error loading task from lines 7 to 8", output.getvalue()
+        )
+        self.assertEqual([t.task_title for t in tasks], ["First", "Second"])
+        self.assertEqual([t.task_id for t in tasks], [1, 2])
+
+        store.save(tasks)
+        _, reloaded = self.load()
+        self.assertEqual([t.task_id for t in reloaded], [1, 2])
+        self.assertEqual([t.version for t in reloaded], [0, 0])
+
+    def test_concurrent_edits_are_merged(self):
+        """
+        Two sessions editing different tasks both keep their change.
+        """
+        store_a, tasks_a = self.load()
+        store_b, tasks_b = self.load()
+        tasks_a[0].task_completion = "Yes"
+        self.assertEqual(store_a.save(tasks_a), (False, []))
+        tasks_b[1].username = "Carol"
+        merged, conflicts = store_b.save(tasks_b)
+        self.assertTrue(merged)
+        self.assertEqual(conflicts, [])
+        # Session B's list now includes session A's change too.
+        self.assertEqual(tasks_b[0].task_completion, "Yes")
+
+        _, reloaded = self.load()
+        self.assertEqual(reloaded[0].task_completion, "Yes")
+        self.assertEqual(reloaded[1].username, "Carol")
+        self.assertEqual([t.version for t in reloaded], [1, 1])
+
+    def test_conflicting_edit_is_rejected(self):
+        """
+        When two sessions edit the same task, the first saved edit wins and
+        the second session is told about the conflict.
+        """
+        store_a, tasks_a = self.load()
+        store_b, tasks_b = self.load()
+        tasks_a[0].task_due_date = "20 Jan 2025"
+        store_a.save(tasks_a)
+        tasks_b[0].task_due_date = "30 Jan 2025"
+        _, conflicts = store_b.save(tasks_b)
+        self.assertEqual(conflicts, [tasks_b[0]])
+        self.assertEqual(tasks_b[0].task_due_date, "20 Jan 2025")
+
+        _, reloaded = self.load()
+        self.assertEqual(reloaded[0].task_due_date, "20 Jan 2025")
+
+    def test_append_is_kept_by_other_session_save(self):
+        """
+        A task appended by one session is neither lost nor duplicated when
+        another session saves its (older) task list.
+        """
+        store_a, tasks_a = self.load()
+        store_b, tasks_b = self.load()
+        store_a.save(tasks_a)
+        new_task = Task(
+            "Alice", "Third", "Three", "03 Jan 2025", "15 Jan 2025", "No"
+        )
+        store_a.append(new_task)
+        self.assertEqual(new_task.task_id, 3)
+
+        del tasks_b[0]
+        store_b.save(tasks_b)
+        _, reloaded = self.load()
+        self.assertEqual(
+            [(t.task_id, t.task_title) for t in reloaded],
+            [(2, "Second"), (3, "Third")],
+        )
+
+    def test_reserved_ids_are_kept(self):
+        """
+        Task IDs reserved by one session are skipped by the tasks another
+        session appends, and new tasks given them keep them when saved.
+        """
+        store_a, tasks_a = self.load()
+        self.assertEqual(store_a.reserve_ids(2), 3)
+        store_b, _ = self.load()
+        appended = Task(
+            "Bob", "Appended", "", "03 Jan 2025", "15 Jan 2025", "No"
+        )
+        store_b.append(appended)
+        self.assertEqual(appended.task_id, 5)
+        self.assertEqual(store_b.reserve_ids(1), 6)
+
+        reserved = Task(
+            "Alice", "Reserved", "", "03 Jan 2025", "15 Jan 2025", "No",
+            task_id=4,
+        )
+        tasks_a.append(reserved)
+        store_a.save(tasks_a)
+        self.assertEqual((reserved.task_id, reserved.version), (4, 1))
+        _, reloaded = self.load()
+        self.assertEqual(
+            sorted(t.task_id for t in reloaded), [1, 2, 4, 5]
+        )
+
+    def test_save_writes_without_write_lock(self):
+        """
+        The tasks file is written from a snapshot after the write lock of
+        the task list is released, so another thread can read the tasks
+        while it is written, and the file holds the tasks as they were
+        when saving took the snapshot.
+        """
+        store, tasks = self.load()
+        task_list = TaskRepository(tasks)
+        write_file = store._write_file
+        read_while_writing = []
+
+        def read_tasks():
+            with task_list.lock.read_locked():
+                read_while_writing.append(len(task_list))
+
+        def slow_write_file(*args):
+            reader = threading.Thread(target=read_tasks)
+            reader.start()
+            reader.join(timeout=5)
+            # Changed while the file is written: saved next time.
+            update_task(task_list, task_list[0], task_completion="Yes")
+            write_file(*args)
+
+        with patch.object(store, "_write_file", slow_write_file):
+            store.save(task_list)
+        self.assertEqual(read_while_writing, [2])
+        _, reloaded = self.load()
+        self.assertEqual(reloaded[0].task_completion, "No")
+
 
 if __name__ == "__main__":
     unittest.main()
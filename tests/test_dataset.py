@@ -0,0 +1,102 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+    ),
+)
+
+import contextlib
+import io
+import tempfile
+import unittest
+from datetime import date
+from generate_dataset import generate_dataset, user_task_counts
+from src.data_access import parse_tasks
+from src.utilities import parse_date
+
+
+class TestDataset(unittest.TestCase):
+    """
+    TestDataset is a test suite for the synthetic dataset generator.
+
+    Methods:
+        test_dataset_is_deterministic_and_loadable: Verifies that the same
+            seed gives the same files, and that every well-formed record is
+            loaded with the expected completion and due date mix.
+        test_legacy_format_and_skew: Verifies that the legacy format loads
+            and that the skew gives the first users the most tasks.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.today = date(2026, 1, 1)
+
+    def _generate(self, name, **options):
+        output_dir = os.path.join(self.temp_dir.name, name)
+        os.mkdir(output_dir)
+        summary = generate_dataset(
+            output_dir, seed=3, today=self.today, **options
+        )
+        with open(os.path.join(output_dir, "tasks.txt")) as file:
+            contents = file.read()
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, _, tasks = parse_tasks(contents.splitlines(keepends=True))
+        return summary, contents, tasks
+
+    def test_dataset_is_deterministic_and_loadable(self):
+        """
+        Two datasets made with the same seed are identical, every record
+        that was not made malformed on purpose is loaded, and the loaded
+        tasks include completed and overdue tasks within the counts of the
+        summary.
+        """
+        options = dict(users=20, tasks_per_user=10, malformed_rate=0.1)
+        summary, contents, tasks = self._generate("a", **options)
+        _, same_contents, _ = self._generate("b", **options)
+        self.assertEqual(contents, same_contents)
+
+        self.assertEqual(summary["tasks"], 200)
+        self.assertGreater(summary["malformed"], 0)
+        self.assertEqual(len(tasks), summary["tasks"] - summary["malformed"])
+        completed = [t for t in tasks if t.task_completion == "Yes"]
+        overdue = [
+            t for t in tasks
+            if t.task_completion == "No"
+            and parse_date(t.task_due_date) < self.today
+        ]
+        self.assertLessEqual(len(completed), summary["completed"])
+        self.assertLessEqual(len(overdue), summary["overdue"])
+        self.assertGreater(len(overdue), 0)
+
+    def test_legacy_format_and_skew(self):
+        """
+        The legacy format has no Task IDs, so the tasks are numbered in
+        file order when loaded. Without skew every user gets the same
+        number of tasks; with skew the total stays the same and earlier
+        users get more.
+        """
+        summary, contents, tasks = self._generate(
+            "legacy", users=5, tasks_per_user=4, file_format="legacy"
+        )
+        self.assertNotIn("Task ID", contents)
+        self.assertEqual(len(tasks), 20)
+        self.assertEqual([t.task_id for t in tasks], list(range(1, 21)))
+
+        self.assertEqual(user_task_counts(4, 10, 0), [10, 10, 10, 10])
+        counts = user_task_counts(4, 10, 1.5)
+        self.assertEqual(sum(counts), 40)
+        self.assertEqual(counts, sorted(counts, reverse=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
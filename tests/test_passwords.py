@@ -0,0 +1,99 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import io
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.authentication import UserRegistry, user_login
+from src.passwords import (
+    COST_ENV_VAR,
+    KDF_ENV_VAR,
+    hash_password,
+    needs_rehash,
+    verify_password,
+)
+
+
+@patch.dict(os.environ, {KDF_ENV_VAR: "pbkdf2_sha256", COST_ENV_VAR: "1000"})
+class TestPasswords(unittest.TestCase):
+    """
+    TestPasswords is a test suite for the password hashing functions and
+    the migration of plaintext passwords on login.
+
+    Methods:
+        test_hash_and_verify: Verifies that hashes are salted and only
+            match the original password.
+        test_needs_rehash: Verifies that plaintext passwords and hashes with
+            an outdated cost need to be hashed again, and that nothing is
+            hashed again while the configured KDF is not supported.
+        test_login_migrates_plaintext_password: Verifies that a successful
+            login replaces a plaintext password with a hash.
+    """
+    def test_hash_and_verify(self):
+        """
+        Two hashes of the same password differ (random salt), both verify,
+        and a wrong password does not.
+        """
+        first = hash_password("Passw0rd!")
+        second = hash_password("Passw0rd!")
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.startswith("pbkdf2_sha256$1000$"))
+        self.assertTrue(verify_password("Passw0rd!", first))
+        self.assertTrue(verify_password("Passw0rd!", second))
+        self.assertFalse(verify_password("WrongPassword", first))
+        scrypt_hash = hash_password("Passw0rd!", "scrypt", 10)
+        self.assertTrue(verify_password("Passw0rd!", scrypt_hash))
+
+    def test_needs_rehash(self):
+        """
+        Only hashes made with the configured KDF and cost are up to date.
+        """
+        self.assertTrue(needs_rehash("Passw0rd!"))
+        self.assertFalse(needs_rehash(hash_password("Passw0rd!")))
+        self.assertTrue(
+            needs_rehash(hash_password("Passw0rd!", "pbkdf2_sha256", 2000))
+        )
+        with patch.dict(os.environ, {KDF_ENV_VAR: "md5"}):
+            self.assertFalse(needs_rehash("Passw0rd!"))
+
+    def test_login_migrates_plaintext_password(self):
+        """
+        A plaintext password still logs in, and is then stored as a hash
+        that keeps working for the next login. Rewriting the user file
+        keeps the users added by other sessions and leaves no temporary
+        files behind.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "user.txt")
+            with open(path, "w") as file:
+                file.write("AliceB, Passw0rd!\nBobCat, S3cret!!\n")
+            registry = UserRegistry(path)
+            with patch("sys.stdout", new_callable=io.StringIO):
+                self.assertTrue(user_login("AliceB", "Passw0rd!", registry))
+                with open(path) as file:
+                    lines = file.read().splitlines()
+                self.assertTrue(lines[0].startswith("AliceB, pbkdf2_sha256$"))
+                self.assertEqual(lines[1], "BobCat, S3cret!!")
+                self.assertTrue(user_login("AliceB", "Passw0rd!", registry))
+                self.assertFalse(user_login("AliceB", "Passw0rd", registry))
+
+                UserRegistry(path).add_user("CarolD", "Carol!23")
+                self.assertTrue(user_login("BobCat", "S3cret!!", registry))
+            self.assertEqual(
+                registry.usernames(), ["AliceB", "BobCat", "CarolD"]
+            )
+            self.assertEqual(
+                sorted(os.listdir(temp_dir)), ["user.txt", "user.txt.lock"]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
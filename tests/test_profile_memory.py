@@ -0,0 +1,75 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+    ),
+)
+
+import tempfile
+import tracemalloc
+import unittest
+from generate_dataset import generate_dataset
+from profile_memory import profile_memory
+
+
+class TestProfileMemory(unittest.TestCase):
+    """
+    TestProfileMemory is a test suite for the memory profiling mode.
+
+    Methods:
+        test_profile_reports_every_operation: Verifies that every operation
+            is profiled, that the loaded tasks show up as net allocation
+            with their allocation sites, and that tracing stops afterwards.
+    """
+
+    def test_profile_reports_every_operation(self):
+        """
+        Profiling a small generated dataset reports every operation with
+        its peak and net allocation, the loaded tasks are attributed to
+        data_access.py, and tracemalloc is stopped at the end.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        generate_dataset(temp_dir.name, users=4, tasks_per_user=50)
+        os.chdir(temp_dir.name)
+
+        profile = profile_memory(top=3)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(profile["tasks"], 200)
+        operations = {
+            entry["operation"]: entry for entry in profile["operations"]
+        }
+        self.assertEqual(
+            list(operations),
+            [
+                "Task objects",
+                "load_tasks",
+                "generate_reports",
+                "compute_statistics",
+                "view_all_tasks",
+                "view_my_tasks",
+                "view_completed_tasks",
+            ],
+        )
+        self.assertGreater(profile["bytes_per_task"], 100)
+        self.assertGreaterEqual(
+            profile["load_bytes_per_task"], profile["bytes_per_task"]
+        )
+        load = operations["load_tasks"]
+        self.assertGreaterEqual(load["peak_bytes"], load["net_bytes"])
+        self.assertLessEqual(len(load["top_sites"]), 3)
+        self.assertIn("data_access.py", load["top_sites"][0]["site"])
+
+
+if __name__ == "__main__":
+    unittest.main()
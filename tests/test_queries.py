@@ -0,0 +1,192 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import io
+import unittest
+from datetime import date
+from unittest.mock import patch
+from src.models import Task
+from src.queries import query_task_page, query_tasks, query_tasks_menu
+
+# The queries module listens to the task changes made through the services
+# module it imports itself, so the changes below must use that same module.
+from repository import TaskRepository, before_list_change
+from services import add_task, remove_task, update_task
+
+
+class TestQueries(unittest.TestCase):
+    """
+    TestQueries is a test suite for the task query API.
+
+    Methods:
+        test_query_filters_and_sorting: Verifies the assignee, completion,
+            due date and title filters, the sort orders and limit/offset.
+        test_index_follows_task_changes: Verifies that query results follow
+            tasks added, updated and removed through the services module.
+        test_repository_index_detects_missed_changes: Verifies that the
+            index kept on a TaskRepository is rebuilt after the tasks were
+            replaced without the task listeners being told.
+        test_query_task_page_counts_matches: Verifies that a page of
+            results comes with the number of all matching tasks.
+        test_query_menu_shows_task_ids: Verifies that the query menu shows
+            the Task IDs of the matching tasks.
+    """
+    def setUp(self):
+        """
+        Creates a task list with tasks for two users.
+        """
+        self.tasks = [
+            Task(
+                "Alice", "Write doc", "D", "03 Jan 2025", "20 Jan 2025", "No"
+            ),
+            Task(
+                "Alice", "Review code", "D", "01 Jan 2025", "10 Jan 2025", "No"
+            ),
+            Task(
+                "Alice", "Plan", "D", "02 Jan 2025", "15 Jan 2025", "Yes"
+            ),
+            Task(
+                "Bob", "Write tests", "D", "04 Jan 2025", "12 Jan 2025", "No"
+            ),
+            Task("Bob", "Fix bug", "D", "05 Jan 2025", "not a date", "No"),
+        ]
+
+    def titles(self, tasks):
+        """
+        Returns the titles of the given tasks.
+        """
+        return [task.task_title for task in tasks]
+
+    def test_query_filters_and_sorting(self):
+        """
+        Filters combine, results are sorted by the chosen date (unreadable
+        dates last), and limit/offset page through the results.
+        """
+        self.assertEqual(
+            self.titles(
+                query_tasks(self.tasks, assignee="Alice", completed=False)
+            ),
+            ["Review code", "Write doc"],
+        )
+        self.assertEqual(
+            self.titles(query_tasks(self.tasks)),
+            [
+                "Review code",
+                "Write tests",
+                "Plan",
+                "Write doc",
+                "Fix bug",
+            ],
+        )
+        self.assertEqual(
+            self.titles(
+                query_tasks(
+                    self.tasks,
+                    due_from=date(2025, 1, 11),
+                    due_to=date(2025, 1, 20),
+                    title_contains="write",
+                )
+            ),
+            ["Write tests", "Write doc"],
+        )
+        self.assertEqual(
+            self.titles(
+                query_tasks(
+                    self.tasks,
+                    sort_by="date_added",
+                    descending=True,
+                    limit=2,
+                    offset=1,
+                )
+            ),
+            ["Write tests", "Write doc"],
+        )
+        # Unreadable dates also come last when sorting from the latest.
+        self.assertEqual(
+            self.titles(query_tasks(self.tasks, descending=True)),
+            [
+                "Write doc",
+                "Plan",
+                "Write tests",
+                "Review code",
+                "Fix bug",
+            ],
+        )
+
+    def test_query_task_page_counts_matches(self):
+        """
+        The total is the number of tasks matching the filters, whatever
+        page is asked for, including a page past the last match.
+        """
+        page, total = query_task_page(self.tasks, 1, 1, assignee="Alice")
+        self.assertEqual(self.titles(page), ["Plan"])
+        self.assertEqual(total, 3)
+        page, total = query_task_page(self.tasks, 2, 10, title_contains="w")
+        self.assertEqual((page, total), ([], 3))
+
+    def test_query_menu_shows_task_ids(self):
+        """
+        The matching tasks can be anywhere in the task list, so the menu
+        shows their Task IDs instead of their positions in the list.
+        """
+        for task_id, task in enumerate(self.tasks, 11):
+            task.task_id = task_id
+        # Bob's tasks, with the defaults for every other prompt.
+        answers = ["Bob"] + [""] * 8
+        with patch("builtins.input", side_effect=answers), patch(
+            "sys.stdout", new_callable=io.StringIO
+        ) as stdout:
+            query_tasks_menu(self.tasks)
+        rows = stdout.getvalue().splitlines()
+        self.assertIn("Task ID", rows[1])
+        self.assertEqual(
+            [row.split()[1] for row in rows if "Bob" in row], ["14", "15"]
+        )
+
+    def test_index_follows_task_changes(self):
+        """
+        Changes made through add_task, update_task and remove_task are
+        reflected by the next query without rebuilding the index.
+        """
+        self.assertEqual(len(query_tasks(self.tasks, assignee="Bob")), 2)
+        update_task(self.tasks, self.tasks[1], task_completion="Yes")
+        add_task(
+            self.tasks,
+            Task("Alice", "New", "D", "06 Jan 2025", "01 Jan 2025", "No"),
+        )
+        remove_task(self.tasks, 0)
+        self.assertEqual(
+            self.titles(
+                query_tasks(self.tasks, assignee="Alice", completed=False)
+            ),
+            ["New"],
+        )
+
+    def test_repository_index_detects_missed_changes(self):
+        """
+        The index kept on a TaskRepository is rebuilt when its tasks were
+        replaced without the task listeners being told (as a save merging
+        changes from other sessions does), even if the number of tasks
+        stayed the same.
+        """
+        tasks = TaskRepository(self.tasks)
+        self.assertEqual(len(query_tasks(tasks, assignee="Bob")), 2)
+        before_list_change(tasks)
+        tasks[0] = Task(
+            "Bob", "Merged", "D", "06 Jan 2025", "08 Jan 2025", "No"
+        )
+        self.assertEqual(
+            self.titles(query_tasks(tasks, assignee="Bob")),
+            ["Merged", "Write tests", "Fix bug"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
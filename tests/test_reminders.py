@@ -0,0 +1,147 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from src.models import Task
+
+# The scheduler follows the task changes made through the top-level
+# services module.
+from reminders import SENT_FILE, ReminderScheduler
+from repository import TaskRepository
+from services import add_task, remove_task, update_task
+
+
+class TestReminders(unittest.TestCase):
+    """
+    TestReminders is a test suite for the due-date reminder scheduler.
+
+    Methods:
+        test_reminders_are_sent_in_order_once: Verifies that due and
+            overdue reminders are written to the users' outboxes in due
+            date order, and that no reminder is sent twice.
+        test_task_changes_reschedule_reminders: Verifies that adding,
+            editing, completing and deleting tasks updates the schedule,
+            and that the background thread sends a reminder when due.
+        test_concurrent_sessions_send_once: Verifies that a reminder sent
+            by one session is not sent again by another session that was
+            already running.
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.outbox = os.path.join(temp_dir.name, "outbox")
+        self.tasks = TaskRepository(
+            [
+                Task("Alice", "Later", "", "01 Jan 2030", "20 Jan 2030",
+                     "No", task_id=1),
+                Task("Alice", "Missed", "", "01 Jan 2030", "05 Jan 2030",
+                     "No", task_id=2),
+                Task("Bob", "Soon", "", "01 Jan 2030", "11 Jan 2030", "No",
+                     task_id=3),
+                Task("Bob", "Done", "", "01 Jan 2030", "02 Jan 2030", "Yes",
+                     task_id=4),
+            ]
+        )
+        self.now = datetime(2030, 1, 10, 9, 0)
+
+    def make_scheduler(self):
+        scheduler = ReminderScheduler(
+            self.tasks, timedelta(days=1), self.outbox
+        )
+        self.addCleanup(scheduler.stop)
+        return scheduler
+
+    def read_outbox(self, username):
+        with open(os.path.join(self.outbox, f"{username}.txt")) as file:
+            return file.read()
+
+    def test_reminders_are_sent_in_order_once(self):
+        """
+        The first reminder is scheduled a day before the earliest open due
+        date. Sending the due reminders writes them to the outbox of each
+        user, earliest first, and they are not sent again, also not by a
+        new scheduler that reads the record of sent reminders.
+        """
+        scheduler = self.make_scheduler()
+        self.assertEqual(
+            scheduler.next_reminder_time(), datetime(2030, 1, 4)
+        )
+        sent = scheduler.send_due(self.now)
+        self.assertEqual([r.task_title for r in sent], ["Missed", "Soon"])
+        self.assertIn("'Missed' (Task ID 2) was due on 05 Jan 2030",
+                      self.read_outbox("Alice"))
+        self.assertIn("'Soon' (Task ID 3) is due on 11 Jan 2030",
+                      self.read_outbox("Bob"))
+        self.assertEqual(scheduler.send_due(self.now), [])
+
+        # A new session does not send the same reminders again.
+        scheduler.stop()
+        scheduler = self.make_scheduler()
+        self.assertEqual(
+            scheduler.next_reminder_time(), datetime(2030, 1, 19)
+        )
+
+    def test_concurrent_sessions_send_once(self):
+        """
+        Two sessions that both scheduled the same reminders send each of
+        them once: the second one finds them in the record of sent
+        reminders, which is read again before sending.
+        """
+        first = self.make_scheduler()
+        second = self.make_scheduler()
+        self.assertEqual(len(first.send_due(self.now)), 2)
+        self.assertEqual(second.send_due(self.now), [])
+        self.assertEqual(self.read_outbox("Alice").count("'Missed'"), 1)
+
+        later = self.now + timedelta(days=10)
+        self.assertEqual(
+            [r.task_title for r in second.send_due(later)], ["Later"]
+        )
+        self.assertEqual(first.send_due(later), [])
+        with open(os.path.join(self.outbox, SENT_FILE)) as file:
+            self.assertEqual(len(file.readlines()), 3)
+
+    def test_task_changes_reschedule_reminders(self):
+        """
+        Changing a due date, completing, deleting and adding tasks move,
+        drop and add their reminders without a rescan, and once started,
+        the background thread sends a reminder that is due at once.
+        """
+        scheduler = self.make_scheduler()
+        update_task(self.tasks, self.tasks[0], task_due_date="10 Jan 2030")
+        update_task(self.tasks, self.tasks[1], task_completion="Yes")
+        remove_task(self.tasks, 2)
+        add_task(self.tasks, Task("Carol", "New", "", "01 Jan 2030",
+                                  "30 Jan 2030", "No", task_id=5))
+        self.assertEqual(
+            [r.task_title for r in scheduler.pop_due(self.now)], ["Later"]
+        )
+        self.assertEqual(
+            scheduler.next_reminder_time(), datetime(2030, 1, 29)
+        )
+
+        # The background thread sends a reminder as soon as it is due.
+        scheduler.start()
+        add_task(self.tasks, Task("Carol", "Now", "", "01 Jan 2030",
+                                  datetime.now().strftime("%d %b %Y"), "No",
+                                  task_id=6))
+        for _ in range(100):
+            if os.path.exists(os.path.join(self.outbox, SENT_FILE)):
+                break
+            time.sleep(0.02)
+        self.assertIn("'Now' (Task ID 6)", self.read_outbox("Carol"))
+
+
+if __name__ == "__main__":
+    unittest.main()
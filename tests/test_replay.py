@@ -0,0 +1,83 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# The replay drives main.py, which uses the top-level modules.
+from data_access import load_tasks
+from replay import ReplayError, parse_script, percentile, run_replay
+
+
+class TestReplay(unittest.TestCase):
+    """
+    TestReplay is a test suite for the replay mode of the menu flow.
+
+    Methods:
+        test_replay_runs_operations: Verifies that a script is parsed and
+            replayed through main(), with one latency per operation.
+        test_replay_detects_mismatched_script: Verifies that an operation
+            with too few answers stops the replay with an error.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.temp_dir.name)
+        with open("user.txt", "w") as file:
+            file.write("Administrator, Adm1n!!\nAliceB, Passw0rd!\n")
+        patcher = patch.dict(os.environ, {"TASK_MANAGER_KDF_COST": "1000"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_replay_runs_operations(self):
+        """
+        A script with comments and blank lines is parsed into operations,
+        which are replayed through the menu the given number of times with
+        one latency recorded per run, and the tasks they add and complete
+        are saved.
+        """
+        operations = parse_script(
+            [
+                "# Add a task and complete it.\n",
+                "a | AliceB | Write report | Monthly | 31 Dec 2030\n",
+                "\n",
+                "mt | 1 | c\n",
+                "vm\n",
+            ]
+        )
+        self.assertEqual(operations[1], ["mt", "1", "c"])
+
+        latencies = run_replay(operations, "AliceB", "Passw0rd!", repeat=3)
+        self.assertEqual(
+            {option: len(values) for option, values in latencies.items()},
+            {"login": 1, "a": 3, "mt": 3, "vm": 3},
+        )
+        tasks = load_tasks()
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual(tasks[0].task_completion, "Yes")
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+
+    def test_replay_detects_mismatched_script(self):
+        """
+        An operation with fewer answers than its prompts ask for, or with
+        answers left over, stops the replay with a ReplayError.
+        """
+        with self.assertRaises(ReplayError):
+            run_replay([["a", "AliceB", "Write report"]], "AliceB",
+                       "Passw0rd!")
+        with self.assertRaises(ReplayError):
+            run_replay([["vm", "unexpected"]], "AliceB", "Passw0rd!")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,7 +11,7 @@ sys.path.insert(
 import unittest
 import os
 from src.models import Task
-from src.reports import generate_reports
+from src.reports import ReportJob, generate_reports
 
 
 class TestReports(unittest.TestCase):
@@ -79,6 +79,23 @@ class TestReports(unittest.TestCase):
         self.assertTrue(os.path.exists("task_overview.txt"))
         self.assertTrue(os.path.exists("user_overview.txt"))
 
+    def test_report_job_runs_in_background(self):
+        """
+        Test case for the `ReportJob` class.
+
+        The job works on a copy of the tasks taken when it starts, so a
+        later change is not included, and it reports its completion and
+        progress once the files are written.
+        """
+        job = ReportJob(self.tasks)
+        self.tasks[1].task_completion = "No"
+        self.assertTrue(job.wait(10))
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.steps_done, job.total_steps)
+        self.assertIn("Reports generated successfully", job.describe())
+        with open("task_overview.txt") as file:
+            self.assertIn("Total number of completed tasks: 1", file.read())
+
     def tearDown(self):
         """
         Clean up method that runs after each test case.
@@ -92,6 +109,8 @@ class TestReports(unittest.TestCase):
             os.remove("task_overview.txt")
         if os.path.exists("user_overview.txt"):
             os.remove("user_overview.txt")
+        if os.path.exists("task_history.dat"):
+            os.remove("task_history.dat")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import threading
+import unittest
+from src.models import Task
+
+# The services functions lock the task list through the top-level
+# repository module, so the task list must come from that same module.
+from repository import ReadWriteLock, TaskRepository, take_snapshot
+from services import add_task, get_task_page, remove_task
+
+
+class TestRepository(unittest.TestCase):
+    """
+    TestRepository is a test suite for the thread-safe task repository.
+
+    Methods:
+        test_readers_share_and_writers_exclude: Verifies that readers hold
+            the lock together while a writer waits for them, and that
+            readers wait for a writer.
+        test_concurrent_changes_and_reads: Verifies that tasks added and
+            removed from several threads while others read are all applied.
+    """
+
+    def test_readers_share_and_writers_exclude(self):
+        """
+        Two readers hold the lock at the same time, a reader cannot upgrade
+        to a write, and a writer waits until the readers release the lock.
+        """
+        lock = ReadWriteLock()
+        # Both readers must hold the lock at once to pass the barrier.
+        both_reading = threading.Barrier(2, timeout=5)
+        write_done = threading.Event()
+
+        def reader():
+            with lock.read_locked():
+                both_reading.wait()
+
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in readers:
+            thread.start()
+        for thread in readers:
+            thread.join()
+        self.assertFalse(both_reading.broken)
+
+        def writer():
+            with lock.write_locked():
+                write_done.set()
+
+        with lock.read_locked():
+            # Reentrant reads are fine, upgrading to a write is not.
+            with lock.read_locked():
+                self.assertRaises(RuntimeError, lock.acquire_write)
+            thread = threading.Thread(target=writer)
+            thread.start()
+            self.assertFalse(write_done.wait(0.1))
+        thread.join(5)
+        self.assertTrue(write_done.is_set())
+
+    def test_concurrent_changes_and_reads(self):
+        """
+        Tasks added and removed by several threads, while other threads
+        page through and snapshot the list, all end up in the task list.
+        """
+        task_list = TaskRepository()
+
+        def add_tasks(username):
+            for i in range(200):
+                add_task(
+                    task_list,
+                    Task(username, f"Task {i}", "", "01 Jan 2025",
+                         "10 Jan 2025", "No"),
+                )
+            for _ in range(50):
+                with task_list.lock.write_locked():
+                    index = next(
+                        i for i, task in enumerate(task_list)
+                        if task.username == username
+                    )
+                    remove_task(task_list, index)
+
+        def read_tasks():
+            for _ in range(200):
+                get_task_page(task_list, 2, 10)
+                with take_snapshot(task_list) as snapshot:
+                    list(snapshot)
+
+        threads = [
+            threading.Thread(target=add_tasks, args=(f"User{i}",))
+            for i in range(4)
+        ] + [threading.Thread(target=read_tasks) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(task_list), 4 * 150)
+        for i in range(4):
+            owned = [t for t in task_list if t.username == f"User{i}"]
+            self.assertEqual(len(owned), 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
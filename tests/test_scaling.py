@@ -0,0 +1,142 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+    ),
+)
+
+import contextlib
+import io
+import tempfile
+import time
+import unittest
+from datetime import date
+from generate_dataset import generate_dataset
+
+# The reports and queries use the task list through the top-level modules.
+from data_access import load_tasks, save_tasks
+from queries import invalidate_task_index, query_tasks
+from reports import compute_statistics, generate_reports
+
+# The scaling tests take a while, so they only run when asked to, e.g.:
+#     TASK_MANAGER_SCALING_TESTS=1 python -m pytest tests/test_scaling.py
+SCALING_TESTS_ENV_VAR = "TASK_MANAGER_SCALING_TESTS"
+# Every operation is timed with SMALL_TASKS and with SCALE times as many
+# tasks (and users). A linear operation takes about SCALE times as long;
+# the test fails if it takes more than SCALE * SLACK times as long, which
+# leaves room for noise but not for quadratic growth (SCALE ** 2).
+SMALL_TASKS = 2_500
+SCALE = 8
+SLACK = float(os.environ.get("TASK_MANAGER_SCALING_SLACK", 2))
+TASKS_PER_USER = 10
+REPEAT = 3
+
+
+@unittest.skipUnless(
+    os.environ.get(SCALING_TESTS_ENV_VAR),
+    f"set {SCALING_TESTS_ENV_VAR}=1 to run the scaling tests",
+)
+class TestScaling(unittest.TestCase):
+    """
+    TestScaling is a test suite that catches operations whose time grows
+    faster than linearly with the number of tasks and users.
+
+    Methods:
+        test_load_and_save_scale_linearly: Verifies the growth of loading
+            and saving the tasks file.
+        test_reports_scale_linearly: Verifies the growth of generating the
+            reports and computing the statistics.
+        test_queries_scale_linearly: Verifies the growth of building the
+            query index and running a query.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.original_dir = os.getcwd()
+        cls.data_dirs = {}
+        for tasks in (SMALL_TASKS, SMALL_TASKS * SCALE):
+            data_dir = os.path.join(cls.temp_dir.name, str(tasks))
+            os.mkdir(data_dir)
+            generate_dataset(
+                data_dir,
+                users=tasks // TASKS_PER_USER,
+                tasks_per_user=TASKS_PER_USER,
+                today=date(2026, 1, 1),
+            )
+            cls.data_dirs[tasks] = data_dir
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls.original_dir)
+        cls.temp_dir.cleanup()
+
+    def best_time(self, tasks, operation):
+        """
+        Returns the shortest of REPEAT runs of operation(task_list) on the
+        generated data with the given number of tasks.
+        """
+        os.chdir(self.data_dirs[tasks])
+        with contextlib.redirect_stdout(io.StringIO()):
+            task_list = load_tasks()
+            times = []
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                operation(task_list)
+                times.append(time.perf_counter() - start)
+        return min(times)
+
+    def assert_scales_linearly(self, operation):
+        small = self.best_time(SMALL_TASKS, operation)
+        large = self.best_time(SMALL_TASKS * SCALE, operation)
+        self.assertLess(
+            large / small,
+            SCALE * SLACK,
+            f"{SCALE}x the tasks took {large / small:.1f}x as long "
+            f"({small * 1000:.1f} ms -> {large * 1000:.1f} ms)",
+        )
+
+    def test_load_and_save_scale_linearly(self):
+        """
+        Loading and saving the tasks file take time in proportion to the
+        number of tasks.
+        """
+        self.assert_scales_linearly(lambda task_list: load_tasks())
+        self.assert_scales_linearly(save_tasks)
+
+    def test_reports_scale_linearly(self):
+        """
+        Generating the reports and computing the statistics take time in
+        proportion to the number of tasks and users.
+        """
+        self.assert_scales_linearly(generate_reports)
+        self.assert_scales_linearly(compute_statistics)
+
+    def test_queries_scale_linearly(self):
+        """
+        Rebuilding the query index and running a filtered query take time
+        in proportion to the number of tasks.
+        """
+        def query(task_list):
+            invalidate_task_index(task_list)
+            query_tasks(
+                task_list,
+                completed=False,
+                due_from=date(2025, 6, 1),
+                due_to=date(2026, 6, 1),
+            )
+
+        self.assert_scales_linearly(query)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from src.models import Task
+from src.authentication import UserRegistry
+
+# The server follows the task changes made through the services module it
+# imports itself, so it is imported from the same (top-level) modules.
+from repository import TaskRepository
+from server import TaskServer, start_server
+from client import TaskClient
+
+
+class TestServer(unittest.TestCase):
+    """
+    TestServer is a test suite for the shared task server and its client.
+
+    Methods:
+        test_client_session: Verifies login, adding, listing, completing and
+            statistics over a real connection to a running server.
+        test_requests_are_checked: Verifies that requests are rejected
+            before login, for other users' tasks and for non-admin users.
+        test_clients_are_served_while_a_query_waits: Verifies that a query
+            waiting for the lock of the task list does not hold up the
+            requests of other clients.
+        test_line_breaks_are_rejected: Verifies that text fields with a
+            line break are rejected instead of being saved.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.temp_dir.name, "user.txt")
+        with open(path, "w") as file:
+            file.write("Administrator, Adm1n!!\nAliceB, Passw0rd!\n")
+        self.task_list = TaskRepository(
+            [
+                Task(
+                    "AliceB", "Write report", "Monthly report",
+                    "01 Jan 2025", "10 Jan 2025", "No", task_id=1,
+                ),
+            ]
+        )
+        patches = [
+            patch.dict(os.environ, {"TASK_MANAGER_KDF_COST": "1000"}),
+            patch("server.append_task"),
+            patch("server.persist_tasks"),
+        ]
+        for active_patch in patches:
+            active_patch.start()
+            self.addCleanup(active_patch.stop)
+
+        self.task_server = TaskServer(self.task_list, UserRegistry(path))
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            start_server(self.task_server, port=0)
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.server.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+        self.task_server.close()
+        self.temp_dir.cleanup()
+
+    def test_client_session(self):
+        """
+        A logged in user can add a task, list tasks a page at a time with
+        the number of all matching tasks, complete a task and get the
+        statistics.
+        """
+        client = TaskClient(port=self.port)
+        try:
+            response = client.request(
+                "login", username="AliceB", password="Passw0rd!"
+            )
+            self.assertTrue(response["ok"])
+
+            response = client.request(
+                "add",
+                assigned_to="AliceB",
+                title="Plan sprint",
+                description="Next sprint",
+                due_date="05 Jan 2025",
+            )
+            self.assertTrue(response["ok"])
+            self.assertEqual(len(self.task_list), 2)
+
+            response = client.request("list", assignee="AliceB")
+            titles = [task["task_title"] for task in response["tasks"]]
+            self.assertEqual(titles, ["Plan sprint", "Write report"])
+            response = client.request(
+                "list", assignee="AliceB", limit=1, offset=1
+            )
+            self.assertEqual(len(response["tasks"]), 1)
+            self.assertEqual(response["total"], 2)
+            response = client.request("list", title_contains="report")
+            self.assertEqual(response["total"], 1)
+
+            response = client.request("complete", task_id=1)
+            self.assertTrue(response["ok"])
+            self.assertEqual(self.task_list[0].task_completion, "Yes")
+
+            response = client.request("statistics")
+            self.assertIn(["Total Tasks", 2], response["task_overview"])
+            self.assertIn(["Completed Tasks", 1], response["task_overview"])
+        finally:
+            client.close()
+
+    def test_requests_are_checked(self):
+        """
+        Requests before login, changes to another user's task or to a task
+        that does not exist, and deletes by other users than the
+        Administrator are rejected with an error.
+        """
+        client = TaskClient(port=self.port)
+        try:
+            response = client.request("list")
+            self.assertFalse(response["ok"])
+
+            client.request("login", username="Administrator",
+                           password="Adm1n!!")
+            response = client.request("complete", task_id=1)
+            self.assertEqual(response["error"], "Task does not belong to you.")
+            response = client.request("complete", task_id=99)
+            self.assertFalse(response["ok"])
+        finally:
+            client.close()
+
+        client = TaskClient(port=self.port)
+        try:
+            client.request("login", username="AliceB", password="Passw0rd!")
+            response = client.request("delete", task_id=1)
+            self.assertFalse(response["ok"])
+            self.assertEqual(len(self.task_list), 1)
+        finally:
+            client.close()
+
+    def test_line_breaks_are_rejected(self):
+        """
+        A line break in a text field would start a new line of the tasks
+        file and shift the fields of the task, so adding or editing a task
+        with one fails and leaves the task list unchanged.
+        """
+        client = TaskClient(port=self.port)
+        try:
+            client.request("login", username="AliceB", password="Passw0rd!")
+            response = client.request(
+                "add",
+                assigned_to="AliceB",
+                title="a\nTask Title: x",
+                description="",
+                due_date="05 Jan 2025",
+            )
+            self.assertFalse(response["ok"])
+            self.assertEqual(
+                response["error"], "The title cannot contain line breaks."
+            )
+            self.assertEqual(len(self.task_list), 1)
+
+            response = client.request(
+                "edit", task_id=1, due_date="05 Jan 2025\r\nTask ID: 9"
+            )
+            self.assertFalse(response["ok"])
+            self.assertEqual(self.task_list[0].task_due_date, "10 Jan 2025")
+        finally:
+            client.close()
+
+    def test_clients_are_served_while_a_query_waits(self):
+        """
+        While a writer holds the lock of the task list, a query waits for
+        it in the thread pool, so the event loop goes on answering other
+        clients, and the query is answered once the lock is released.
+        """
+        lister = TaskClient(port=self.port)
+        other = TaskClient(port=self.port)
+        try:
+            lister.request("login", username="AliceB", password="Passw0rd!")
+            responses = []
+            query = threading.Thread(
+                target=lambda: responses.append(lister.request("list"))
+            )
+            with self.task_list.lock.write_locked():
+                query.start()
+                response = other.request(
+                    "login", username="AliceB", password="Passw0rd!"
+                )
+                self.assertTrue(response["ok"])
+                self.assertEqual(responses, [])
+            query.join(timeout=5)
+            self.assertEqual(responses[0]["total"], 1)
+        finally:
+            lister.close()
+            other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,9 +9,11 @@ sys.path.insert(
 )
 
 
+import io
 import unittest
-from unittest.mock import patch, mock_open
-from src.services import capture_task
+from unittest.mock import patch
+from src.models import Task
+from src.services import capture_task, get_task_page, view_all_tasks
 
 
 class TestServices(unittest.TestCase):
@@ -29,13 +31,13 @@ class TestServices(unittest.TestCase):
     - `test_capture_task`:
         - Simulates user input for capturing a task using the
           `@patch` decorator.
-        - Mocks file operations using `mock_open`.
+        - Mocks the file append using `patch`.
         - Asserts that the task list contains exactly one task after the
           function is called.
         - Validates that the attributes of the captured task (username,
           task title, task description, task due date, and task completion
           status) match the expected values.
-    - `mock_file`: Mock object for file operations.
+    - `mock_append`: Mock object for the file append.
     - The task list contains exactly one task.
     - The attributes of the captured task match the following expected values:
         - `username`: "Bob"
@@ -54,8 +56,8 @@ class TestServices(unittest.TestCase):
             "No",
         ],
     )
-    @patch("src.services.open", new_callable=mock_open)
-    def test_capture_task(self, mock_file, mock_input):
+    @patch("src.services.append_task")
+    def test_capture_task(self, mock_append, mock_input):
         """
         Test case for the `capture_task` function.
 
@@ -69,7 +71,7 @@ class TestServices(unittest.TestCase):
           match the expected values.
 
         Mocks:
-        - `mock_file`: Mock object for file operations (if applicable).
+        - `mock_append`: Mock object for appending the task to the file.
         - `mock_input`: Mock object for simulating user input.
 
         Assertions:
@@ -90,6 +92,53 @@ class TestServices(unittest.TestCase):
         self.assertEqual(task.task_description, "Task Description")
         self.assertEqual(task.task_due_date, "10 Oct 2025")
         self.assertEqual(task.task_completion, "No")
+        mock_append.assert_called_once_with(task)
+
+    def test_get_task_page(self):
+        """
+        Test case for the `get_task_page` function.
+
+        Verifies that only the tasks on the requested page are returned,
+        that task numbering continues across pages, and that out of range
+        page numbers are clamped to the last page.
+        """
+        task_list = [
+            Task(
+                "Bob", f"Task {i}", "Desc", "01 Jan 2025", "10 Oct 2025", "No"
+            )
+            for i in range(1, 46)
+        ]
+        page, total_pages, first_number, tasks = get_task_page(
+            task_list, 2, 20
+        )
+        self.assertEqual((page, total_pages, first_number), (2, 3, 21))
+        self.assertEqual(len(tasks), 20)
+        self.assertEqual(tasks[0].task_title, "Task 21")
+
+        page, _, first_number, tasks = get_task_page(task_list, 9, 20)
+        self.assertEqual((page, first_number, len(tasks)), (3, 41, 5))
+
+    @patch("builtins.input", side_effect=["n", "1", "q"])
+    def test_view_all_tasks_paginates(self, mock_input):
+        """
+        Test case for the paginated `view_all_tasks` function.
+
+        Verifies that the user can move to the next page and jump back to
+        the first page, and that tasks from other pages are not printed.
+        """
+        task_list = [
+            Task(
+                "Bob", f"Task {i}", "Desc", "01 Jan 2025", "10 Oct 2025", "No"
+            )
+            for i in range(1, 6)
+        ]
+        with patch("sys.stdout", new_callable=io.StringIO) as output:
+            view_all_tasks(task_list, page_size=2)
+        printed = output.getvalue()
+        self.assertEqual(mock_input.call_count, 3)
+        self.assertEqual(printed.count("Page 1 of 3"), 2)
+        self.assertEqual(printed.count("Page 2 of 3"), 1)
+        self.assertNotIn("Task 5", printed)
 
 
 if __name__ == "__main__":
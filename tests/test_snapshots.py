@@ -0,0 +1,135 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import unittest
+import tempfile
+from datetime import date
+from src.models import Task
+from src.snapshots import (
+    OVERVIEW_SCOPE,
+    RECORD_SIZE,
+    iter_snapshots,
+    record_snapshot,
+    record_snapshot_if_due,
+    trend,
+)
+
+
+class TestSnapshots(unittest.TestCase):
+    """
+    TestSnapshots is a test suite for the statistics snapshot store.
+
+    Methods:
+        test_record_snapshot_replaces_same_day: Verifies that recording a
+            snapshot twice on the same day keeps one set of rows.
+        test_iter_snapshots_date_range: Verifies that only the rows inside
+            the requested date range and scope are returned.
+        test_trend_per_week: Verifies that trend queries report the last
+            snapshot of each week.
+        test_non_ascii_scope_keeps_record_size: Verifies that usernames
+            with non-ASCII characters keep every row the same size.
+    """
+    def setUp(self):
+        """
+        Creates a temporary snapshot file path and sample tasks.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "history.dat")
+        self.tasks = [
+            Task("Alice", "T1", "D1", "01 Jan 2025", "05 Jan 2025", "No"),
+            Task("Alice", "T2", "D2", "01 Jan 2025", "05 Jan 2025", "Yes"),
+            Task("Bob", "T3", "D3", "01 Jan 2025", "20 Jan 2025", "No"),
+        ]
+
+    def tearDown(self):
+        """
+        Removes the temporary snapshot file.
+        """
+        self.temp_dir.cleanup()
+
+    def test_record_snapshot_replaces_same_day(self):
+        """
+        Recording a second snapshot on the same day replaces the first one,
+        and record_snapshot_if_due() does nothing once the day is recorded.
+        """
+        day = date(2025, 1, 10)
+        record_snapshot(self.tasks, day, self.path)
+        self.tasks[0].task_completion = "Yes"
+        record_snapshot(self.tasks, day, self.path)
+        self.assertFalse(record_snapshot_if_due(self.tasks, day, self.path))
+
+        rows = list(iter_snapshots(path=self.path))
+        self.assertEqual([row.scope for row in rows], ["*", "Alice", "Bob"])
+        self.assertEqual(rows[0].total, 3)
+        self.assertEqual(rows[0].completed, 2)
+        self.assertEqual(rows[0].overdue, 0)
+
+    def test_iter_snapshots_date_range(self):
+        """
+        Only snapshots inside the date range and scope are returned.
+        """
+        for day in range(1, 11):
+            record_snapshot(self.tasks, date(2025, 1, day), self.path)
+        rows = list(
+            iter_snapshots(
+                date(2025, 1, 4), date(2025, 1, 6), "Alice", self.path
+            )
+        )
+        self.assertEqual(
+            [row.day for row in rows],
+            [date(2025, 1, 4), date(2025, 1, 5), date(2025, 1, 6)],
+        )
+        # Alice's first task became overdue on the 6th of January.
+        self.assertEqual([row.overdue for row in rows], [0, 0, 1])
+
+    def test_trend_per_week(self):
+        """
+        A weekly trend reports the last snapshot recorded in each week.
+        """
+        for day in range(1, 15):
+            record_snapshot(self.tasks, date(2025, 1, day), self.path)
+        points = trend(
+            "overdue_pct", scope=OVERVIEW_SCOPE, period="week", path=self.path
+        )
+        self.assertEqual(
+            [point[0] for point in points],
+            [date(2024, 12, 30), date(2025, 1, 6), date(2025, 1, 13)],
+        )
+        self.assertEqual(points[0][1], 0)
+        self.assertAlmostEqual(points[1][1], 100 / 3)
+
+    def test_non_ascii_scope_keeps_record_size(self):
+        """
+        Rows of users with non-ASCII (multi-byte) names are as long as any
+        other row, so the store can still be searched and appended to, and
+        too long names are cut without splitting a character.
+        """
+        long_name = "Zo\u00eb" + "\u00e9" * 20
+        self.tasks.append(
+            Task("Jos\u00e9", "T4", "D4", "01 Jan 2025", "20 Jan 2025", "No")
+        )
+        self.tasks.append(
+            Task(long_name, "T5", "D5", "01 Jan 2025", "20 Jan 2025", "No")
+        )
+        for day in range(1, 4):
+            record_snapshot(self.tasks, date(2025, 1, day), self.path)
+        self.assertEqual(os.path.getsize(self.path) % RECORD_SIZE, 0)
+
+        rows = list(iter_snapshots(date(2025, 1, 2), scope="Jos\u00e9",
+                                   path=self.path))
+        self.assertEqual([(row.day, row.total) for row in rows],
+                         [(date(2025, 1, 2), 1), (date(2025, 1, 3), 1)])
+        rows = list(iter_snapshots(scope=long_name, path=self.path))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0].scope, "Zo\u00eb" + "\u00e9" * 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
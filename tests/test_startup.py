@@ -0,0 +1,80 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+    ),
+)
+
+import statistics
+import unittest
+from bench_startup import import_times
+
+# Wall-clock timings depend on the machine and its load, so the start-up
+# time is only checked together with the scaling tests, e.g.:
+#     TASK_MANAGER_SCALING_TESTS=1 python -m pytest tests/test_startup.py
+TIMING_TESTS_ENV_VAR = "TASK_MANAGER_SCALING_TESTS"
+# The start-up budget for importing main.py, in milliseconds. It is several
+# times the usual import time (see benchmarks/bench_startup.py), so only a
+# real regression fails the test; slow machines can raise it with the
+# environment variable.
+STARTUP_BUDGET_MS = float(
+    os.environ.get("TASK_MANAGER_STARTUP_BUDGET_MS", 100)
+)
+# Modules that main.py must only import when a menu option needs them.
+DEFERRED_MODULES = [
+    "argparse",
+    "asyncio",
+    "queries",
+    "reports",
+    "server",
+    "snapshots",
+    "tempfile",
+]
+
+
+class TestStartup(unittest.TestCase):
+    """
+    TestStartup is a test suite for the start-up cost of the application.
+
+    Methods:
+        test_startup_defers_modules: Verifies that importing main.py does
+            not import the modules that are only needed later.
+        test_startup_time_budget: Verifies that importing main.py stays
+            within STARTUP_BUDGET_MS (only with TIMING_TESTS_ENV_VAR set).
+    """
+
+    def test_startup_defers_modules(self):
+        """
+        Importing main.py in a fresh interpreter does not import any of the
+        DEFERRED_MODULES, which the menu options import when chosen.
+        """
+        imported = import_times("main")
+        for module in DEFERRED_MODULES:
+            self.assertNotIn(module, imported)
+
+    @unittest.skipUnless(
+        os.environ.get(TIMING_TESTS_ENV_VAR),
+        f"set {TIMING_TESTS_ENV_VAR}=1 to run the timing tests",
+    )
+    def test_startup_time_budget(self):
+        """
+        The median of three timed imports of main.py in fresh interpreters
+        is below the budget.
+        """
+        import_ms = statistics.median(
+            import_times("main")["main"][1] / 1000 for _ in range(3)
+        )
+        self.assertLess(import_ms, STARTUP_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
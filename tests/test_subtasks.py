@@ -0,0 +1,154 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.models import Task
+
+# The trees follow the task changes made through the top-level services
+# module.
+from data_access import TaskStore, format_task, parse_tasks
+from repository import TaskRepository
+from services import add_task, persist_tasks, remove_task, update_task
+from subtasks import TaskTree, get_task_tree
+from undo import get_undo_log
+
+
+def make_task(task_id, parent_id=None, completion="No", due="01 Jan 2099"):
+    return Task("Alice", f"Task {task_id}", "", "01 Jan 2025", due,
+                completion, task_id=task_id, parent_id=parent_id)
+
+
+class TestSubtasks(unittest.TestCase):
+    """
+    TestSubtasks is a test suite for subtasks and their roll-up progress.
+
+    Methods:
+        test_rollups_follow_task_changes: Verifies that the roll-ups of all
+            ancestors follow subtasks being added, completed, moved and
+            deleted, and match roll-ups built from scratch.
+        test_parent_is_saved_and_loaded: Verifies that the parent Task ID
+            is written to and read from the tasks file, and that records
+            without one load as top-level tasks.
+        test_tree_follows_saved_task_ids: Verifies that the tree follows
+            the Task IDs given when the task list is saved, and that a
+            deleted task restored after its deletion was saved keeps its
+            Task ID.
+    """
+
+    def test_rollups_follow_task_changes(self):
+        """
+        Adding, completing, moving and deleting tasks updates the roll-ups
+        of their ancestors, which end up the same as the roll-ups of a tree
+        built from the changed task list.
+        """
+        # 1 -> 2 -> (3, 4 overdue); 5 -> 6 (complete)
+        task_list = TaskRepository(
+            [
+                make_task(1),
+                make_task(2, 1),
+                make_task(3, 2),
+                make_task(4, 2, due="01 Jan 2000"),
+                make_task(5),
+                make_task(6, 5, completion="Yes"),
+            ]
+        )
+        tree = get_task_tree(task_list)
+        self.assertEqual(tree.rollup(1), (3, 0, 1))
+        self.assertEqual(tree.rollup(2), (2, 0, 1))
+        self.assertEqual(tree.rollup(5), (1, 1, 0))
+        self.assertEqual(
+            [task.task_id for task in tree.projects()], [1, 5]
+        )
+
+        add_task(task_list, make_task(7, 3))
+        update_task(task_list, task_list[3], task_completion="Yes")
+        self.assertEqual(tree.rollup(1), (4, 1, 0))
+        self.assertEqual(tree.rollup(3), (1, 0, 0))
+
+        # Moving a task moves its subtasks' counters along with it.
+        update_task(task_list, task_list[2], parent_id=5)
+        self.assertEqual(tree.rollup(1), (2, 1, 0))
+        self.assertEqual(tree.rollup(5), (3, 1, 0))
+        self.assertEqual(
+            [task.task_id for task in tree.subtasks(5)], [6, 3]
+        )
+
+        # Deleting a task leaves its subtasks as a project of their own.
+        remove_task(task_list, 0)
+        self.assertEqual(
+            sorted(task.task_id for task in tree.projects()), [2, 5]
+        )
+        self.assertEqual(tree.rollup(2), (1, 1, 0))
+
+        fresh = TaskTree(task_list)
+        for task in task_list:
+            self.assertEqual(
+                tree.rollup(task.task_id), fresh.rollup(task.task_id)
+            )
+
+    def test_parent_is_saved_and_loaded(self):
+        """
+        Only subtasks have a "Parent Task ID" line in the tasks file, and
+        tasks are loaded with the parent it names, or none.
+        """
+        lines = (
+            "File Version: 0000000001, Next Task ID: 0000000003\n"
+            + format_task(make_task(1))
+            + format_task(make_task(2, 1))
+        ).splitlines(keepends=True)
+        self.assertIn("Parent Task ID: 1\n", lines)
+        self.assertEqual(
+            sum(line.startswith("Parent") for line in lines), 1
+        )
+        _, _, tasks = parse_tasks(lines)
+        self.assertEqual(
+            [(task.task_id, task.parent_id) for task in tasks],
+            [(1, None), (2, 1)],
+        )
+
+    def test_tree_follows_saved_task_ids(self):
+        """
+        A subtask added without a Task ID is found by the ID it gets when
+        the task list is saved, and a subtask whose deletion was saved
+        keeps its Task ID when the deletion is undone.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        store = TaskStore(os.path.join(temp_dir.name, "tasks.txt"))
+        store.append(make_task(None))
+        store.append(make_task(None, 1))
+        task_list = TaskRepository(store.load())
+        undo_log = get_undo_log(task_list)
+        self.assertEqual(get_task_tree(task_list).rollup(1), (1, 0, 0))
+
+        with patch("data_access._task_store", store):
+            add_task(task_list, make_task(None, 1))
+            persist_tasks(task_list)
+            tree = get_task_tree(task_list)
+            self.assertEqual(tree.get_task(3), task_list[2])
+            self.assertEqual(tree.rollup(1), (2, 0, 0))
+
+            remove_task(task_list, 1)
+            persist_tasks(task_list)
+            self.assertEqual(get_task_tree(task_list).rollup(1), (1, 0, 0))
+            undo_log.undo()
+
+        self.assertEqual([task.task_id for task in task_list], [1, 2, 3])
+        self.assertEqual(get_task_tree(task_list).rollup(1), (2, 0, 0))
+        self.assertEqual(
+            [task.task_id for task in TaskStore(store.path).load()],
+            [1, 2, 3],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
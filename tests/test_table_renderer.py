@@ -0,0 +1,70 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import io
+import unittest
+from src.table_renderer import render_table
+
+
+class TestTableRenderer(unittest.TestCase):
+    """
+    TestTableRenderer is a test suite for the built-in table renderer.
+
+    Methods:
+        test_render_table_fancy_grid: Verifies the fancy_grid layout and the
+            alignment of text and numeric cells.
+        test_render_table_truncates: Verifies that fixed and maximum column
+            widths truncate long cells with an ellipsis.
+    """
+    def test_render_table_fancy_grid(self):
+        """
+        Text cells are left-aligned, numeric cells are right-aligned and
+        rows are separated by grid lines.
+        """
+        out = io.StringIO()
+        render_table(
+            [["Total Tasks", 5], ["% Overdue", "40.00%"]],
+            ["Metric", "Value"],
+            out=out,
+        )
+        expected = (
+            "╒═════════════╤════════╕\n"
+            "│ Metric      │ Value  │\n"
+            "╞═════════════╪════════╡\n"
+            "│ Total Tasks │      5 │\n"
+            "├─────────────┼────────┤\n"
+            "│ % Overdue   │ 40.00% │\n"
+            "╘═════════════╧════════╛\n"
+        )
+        self.assertEqual(out.getvalue(), expected)
+
+    def test_render_table_truncates(self):
+        """
+        Long cells are cut to the column width, both when the widths are
+        measured with a maximum and when fixed widths are streamed.
+        """
+        out = io.StringIO()
+        render_table(
+            [["A very long description"]],
+            ["Description"],
+            max_widths={0: 12},
+            out=out,
+        )
+        self.assertIn("│ A very long… │", out.getvalue())
+
+        out = io.StringIO()
+        render_table(
+            (row for row in [["abcdef", 1]]), ["Text", "N"], [4, 3], out=out
+        )
+        self.assertIn("│ abc… │   1 │", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import threading
+import unittest
+from src.models import Task
+
+# The snapshots are told about the changes made through the top-level
+# services module, which uses the top-level repository module.
+from repository import TaskRepository, view_task
+from services import add_task, remove_task, update_task
+
+
+class TestTaskSnapshots(unittest.TestCase):
+    """
+    TestTaskSnapshots is a test suite for the copy-on-write snapshots of
+    the task repository.
+
+    Methods:
+        test_snapshot_keeps_point_in_time_view: Verifies that a snapshot
+            shows the tasks as they were when it was taken, while tasks are
+            changed, added and removed during its iteration without
+            waiting for it.
+        test_snapshot_views_are_consistent_under_writes: Verifies that a
+            task changed by another thread while a snapshot is read shows
+            up either entirely before or entirely after the change.
+    """
+
+    def make_tasks(self, count):
+        return TaskRepository(
+            Task(f"User{i}", f"Task {i}", "", "01 Jan 2025", "10 Jan 2025",
+                 "No", task_id=i)
+            for i in range(count)
+        )
+
+    def test_snapshot_keeps_point_in_time_view(self):
+        """
+        A snapshot keeps showing the tasks as they were when it was taken,
+        while a writer changes, removes and adds tasks without waiting for
+        it, and a closed snapshot no longer keeps copies of changed tasks.
+        """
+        task_list = self.make_tasks(3000)
+        expected = [view_task(task) for task in task_list]
+
+        with task_list.snapshot() as snapshot:
+            views = iter(snapshot)
+            seen = [next(views)]
+
+            def write():
+                update_task(task_list, task_list[0], task_completion="Yes")
+                update_task(task_list, task_list[2500], username="Other")
+                remove_task(task_list, 1)
+                add_task(task_list, Task("New", "New", "", "01 Jan 2025",
+                                         "10 Jan 2025", "No"), 0)
+
+            # The writer does not wait for the snapshot to be read.
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join(5)
+            self.assertFalse(writer.is_alive())
+            seen.extend(views)
+            self.assertEqual(seen, expected)
+            self.assertEqual(list(snapshot), expected)
+
+        self.assertEqual(task_list[0].username, "New")
+        self.assertEqual(task_list[1].task_completion, "Yes")
+        self.assertEqual(task_list[2500].username, "Other")
+        # A closed snapshot costs the writers nothing.
+        update_task(task_list, task_list[5], task_completion="Yes")
+        self.assertEqual(len(snapshot._originals), 2)
+
+    def test_snapshot_views_are_consistent_under_writes(self):
+        """
+        Every snapshot taken while a writer keeps changing tasks reads the
+        same views twice, and never shows a task with only some of the
+        fields of one change applied.
+        """
+        task_list = self.make_tasks(2000)
+        stop = threading.Event()
+
+        def write():
+            n = 0
+            while not stop.is_set():
+                n += 1
+                for task in task_list[::97]:
+                    update_task(task_list, task, username=f"U{n}",
+                                task_title=f"T{n}")
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for _ in range(20):
+                with task_list.snapshot() as snapshot:
+                    first = list(snapshot)
+                    second = list(snapshot)
+                self.assertEqual(first, second)
+                for view in first:
+                    if not view.username.startswith("User"):
+                        self.assertEqual(
+                            view.task_title, "T" + view.username[1:]
+                        )
+        finally:
+            stop.set()
+            writer.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Add the project root to the Python module search path (so that the imports
+# from src/ work correctly) and uses the correct attribute names and
+# import targets based on your provided source files.
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+import unittest
+from unittest.mock import patch
+from src.models import Task
+
+# The undo log follows the task changes made through the top-level
+# services module.
+from repository import TaskRepository
+from services import add_task, remove_task, remove_tasks, update_task
+from undo import UndoLog
+
+
+class TestUndo(unittest.TestCase):
+    """
+    TestUndo is a test suite for undoing and redoing task changes.
+
+    Methods:
+        test_undo_and_redo_changes: Verifies that adding, updating and
+            deleting tasks can be undone in reverse order and redone, and
+            that a new change clears the redo steps.
+        test_undo_is_bounded: Verifies that only the last `limit` changes
+            are kept.
+    """
+
+    def setUp(self):
+        self.tasks = TaskRepository(
+            [
+                Task("Alice", f"Task {n}", "", "01 Jan 2030", "20 Jan 2030",
+                     "No", task_id=n)
+                for n in range(1, 5)
+            ]
+        )
+        # Saving is not under test here.
+        patcher = patch("undo.persist_tasks")
+        self.persist_tasks = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_log(self, limit=10):
+        log = UndoLog(self.tasks, limit)
+        self.addCleanup(log.close)
+        return log
+
+    def titles(self):
+        return [task.task_title for task in self.tasks]
+
+    def test_undo_and_redo_changes(self):
+        """
+        Added, updated and deleted tasks are undone in reverse order, each
+        undo is saved, undone changes can be redone, and a new change
+        clears the steps that could be redone.
+        """
+        log = self.make_log()
+        original = self.titles()
+        new_task = Task("Bob", "New", "", "01 Jan 2030", "20 Jan 2030", "No")
+        add_task(self.tasks, new_task)
+        update_task(self.tasks, self.tasks[0], username="Bob",
+                    task_completion="Yes")
+        remove_task(self.tasks, 1)
+        remove_tasks(self.tasks, [self.tasks[1], self.tasks[2]])
+        self.assertEqual(self.titles(), ["Task 1", "New"])
+
+        self.assertEqual(log.undo(), "delete 'Task 4'")
+        self.assertEqual(log.undo(), "delete 'Task 3'")
+        self.assertEqual(log.undo(), "delete 'Task 2'")
+        self.assertEqual(log.undo(), "change 'Task 1'")
+        self.assertEqual(log.undo(), "add 'New'")
+        self.assertIsNone(log.undo())
+        self.assertEqual(self.titles(), original)
+        self.assertEqual(
+            (self.tasks[0].username, self.tasks[0].task_completion),
+            ("Alice", "No"),
+        )
+        self.assertEqual(self.persist_tasks.call_count, 5)
+
+        self.assertEqual(log.redo(), "add 'New'")
+        self.assertEqual(log.redo(), "change 'Task 1'")
+        self.assertEqual(self.titles(), original + ["New"])
+        self.assertEqual(self.tasks[0].username, "Bob")
+
+        # A new change cannot be followed by the redo of an older one.
+        update_task(self.tasks, new_task, task_title="Newer")
+        self.assertFalse(log.can_redo())
+        self.assertIsNone(log.redo())
+        self.assertEqual(log.undo(), "change 'Newer'")
+        self.assertEqual(new_task.task_title, "New")
+
+    def test_undo_is_bounded(self):
+        """
+        With a limit of two, only the last two changes can be undone and
+        the oldest change stays applied.
+        """
+        log = self.make_log(limit=2)
+        for title in ("A", "B", "C"):
+            update_task(self.tasks, self.tasks[0], task_title=title)
+        self.assertEqual(log.undo(), "change 'C'")
+        self.assertEqual(log.undo(), "change 'B'")
+        self.assertFalse(log.can_undo())
+        self.assertEqual(self.tasks[0].task_title, "A")
+
+
+if __name__ == "__main__":
+    unittest.main()